@@ -292,9 +292,10 @@ def getsitepackages():
         if sys.platform in ('os2emx', 'riscos'):
             sitepackages.append(os.path.join(prefix, "Lib", "site-packages"))
         elif is_pypy:
-            from distutils.sysconfig import get_python_lib
-            sitedir = get_python_lib(standard_lib=False, prefix=prefix)
-            sitepackages.append(sitedir)
+            # PyPy: this is what distutils.sysconfig.get_python_lib()
+            # returns, but importing distutils.sysconfig at every startup
+            # also imports 're' and compiles a few regexps.
+            sitepackages.append(os.path.join(prefix, 'site-packages'))
         elif os.sep == '/':
             sitepackages.append(os.path.join(prefix, "lib",
                                         "python" + sys.version[:3],
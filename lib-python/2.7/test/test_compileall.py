@@ -71,6 +71,28 @@ class CompileallTests(unittest.TestCase):
         os.unlink(self.bc_path)
         os.unlink(self.bc_path2)
 
+    def test_compile_dir_workers(self):
+        # PyPy extension: compile in parallel, including subdirectories
+        subdir = os.path.join(self.directory, 'sub')
+        os.mkdir(subdir)
+        source_path3 = os.path.join(subdir, '_test3.py')
+        shutil.copyfile(self.source_path, source_path3)
+        bc_path3 = source_path3 + ('c' if __debug__ else 'o')
+        self.assertTrue(compileall.compile_dir(self.directory, quiet=True,
+                                               workers=2))
+        for fn in (self.bc_path, self.bc_path2, bc_path3):
+            self.assertTrue(os.path.isfile(fn))
+        self.assertRaises(ValueError, compileall.compile_dir,
+                          self.directory, workers=-1)
+
+    def test_compile_dir_workers_failure(self):
+        with open(self.source_path2, 'w') as file:
+            file.write('x = \n')
+        with test_support.captured_stdout():
+            self.assertFalse(compileall.compile_dir(self.directory,
+                                                    quiet=True, workers=2))
+        self.assertTrue(os.path.isfile(self.bc_path))
+
 def test_main():
     test_support.run_unittest(CompileallTests)
 
@@ -195,6 +195,9 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
         BoolOption("withsmalllong", "use a version of 'long' in a C long long",
                    default=False),
 
+        BoolOption("withstrbuf", "use strings optimized for addition",
+                   default=False),
+
         BoolOption("withspecialisedtuple",
                    "use specialised tuples",
                    default=False),
@@ -18,6 +18,19 @@ is_absolute_jump = misc.dict_to_switch(
     default=False)
 
 
+# Jumps that can be retargeted to the destination of an unconditional
+# jump found at their target.
+is_threadable_jump = misc.dict_to_switch(
+    {opcode: True
+        for opcode in [ops.JUMP_ABSOLUTE, ops.JUMP_FORWARD,
+                       ops.POP_JUMP_IF_FALSE, ops.POP_JUMP_IF_TRUE,
+                       ops.JUMP_IF_FALSE_OR_POP, ops.JUMP_IF_TRUE_OR_POP]},
+    default=False)
+
+# Bound on the length of the jump chains that are followed.
+MAX_JUMP_THREADING = 10
+
+
 class StackDepthComputationError(Exception):
     pass
 
@@ -312,17 +325,12 @@ class PythonCodeMaker(ast.ASTVisitor):
                 for instr in block.instructions:
                     offset += instr.size()
                     if instr.jump is not None:
-                        target = instr.jump
+                        target = self._thread_jump(instr, offset)
                         op = instr.opcode
-                        # Optimize an unconditional jump going to another
-                        # unconditional jump.
                         if op == ops.JUMP_ABSOLUTE or op == ops.JUMP_FORWARD:
                             if target.instructions:
                                 target_op = target.instructions[0].opcode
-                                if target_op == ops.JUMP_ABSOLUTE:
-                                    target = target.instructions[0].jump
-                                    instr.opcode = ops.JUMP_ABSOLUTE
-                                elif target_op == ops.RETURN_VALUE:
+                                if target_op == ops.RETURN_VALUE:
                                     # Replace JUMP_* to a RETURN into
                                     # just a RETURN
                                     instr.opcode = ops.RETURN_VALUE
@@ -346,6 +354,53 @@ class PythonCodeMaker(ast.ASTVisitor):
             else:
                 last_extended_arg_count = extended_arg_count
 
+    def _thread_jump(self, instr, offset):
+        """Retarget a jump whose target block starts with another jump
+        that is known to be taken, and return the new target.  'offset'
+        is the position just after 'instr'."""
+        target = instr.jump
+        for i in range(MAX_JUMP_THREADING):
+            if not target.instructions:
+                break
+            op = instr.opcode
+            target_instr = target.instructions[0]
+            target_op = target_instr.opcode
+            if (op != ops.JUMP_ABSOLUTE and op != ops.JUMP_FORWARD and
+                    target_instr.jump is not None and
+                    target_instr.jump.offset < offset):
+                # Conditional jumps stay forward: only JUMP_ABSOLUTE
+                # goes back to a loop header, and that's where the JIT
+                # enters loops and where the periodic actions run.
+                break
+            if target_op == ops.JUMP_ABSOLUTE or target_op == ops.JUMP_FORWARD:
+                # Any jump that ends up on an unconditional jump.
+                if not is_threadable_jump(op):
+                    break
+                if op == ops.JUMP_FORWARD:
+                    instr.opcode = ops.JUMP_ABSOLUTE
+            elif ((op == ops.JUMP_IF_FALSE_OR_POP and
+                      target_op == ops.JUMP_IF_FALSE_OR_POP) or
+                  (op == ops.JUMP_IF_TRUE_OR_POP and
+                      target_op == ops.JUMP_IF_TRUE_OR_POP)):
+                # The value that is left on the stack is tested again
+                # with the same result, e.g. in "a and b and c".
+                pass
+            elif op == ops.JUMP_IF_FALSE_OR_POP and \
+                    target_op == ops.POP_JUMP_IF_FALSE:
+                # The value is tested again and then popped, e.g. in
+                # "if a and b:".
+                instr.opcode = ops.POP_JUMP_IF_FALSE
+            elif op == ops.JUMP_IF_TRUE_OR_POP and \
+                    target_op == ops.POP_JUMP_IF_TRUE:
+                instr.opcode = ops.POP_JUMP_IF_TRUE
+            else:
+                break
+            if target_instr.jump is target:
+                break     # an infinite loop, e.g. "while 1: pass"
+            target = target_instr.jump
+        instr.jump = target
+        return target
+
     def _get_code_flags(self):
         """Get an extra flags that should be attached to the code object."""
         raise NotImplementedError
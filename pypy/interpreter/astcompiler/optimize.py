@@ -72,6 +72,17 @@ class __extend__(ast.Slice):
         # constants, but we don't have a space here.
         return None
 
+class __extend__(ast.Name):
+
+    def accept_jump_if(self, gen, condition, target):
+        if self.id == "__debug__" and not condition:
+            # "if __debug__:" is a single opcode that doesn't need to look
+            # up the name, like the check done by "assert"
+            gen.emit_jump(ops.JUMP_IF_NOT_DEBUG, target)
+        else:
+            ast.expr.accept_jump_if(self, gen, condition, target)
+
+
 class __extend__(ast.UnaryOp):
 
     def accept_jump_if(self, gen, condition, target):
@@ -122,6 +133,12 @@ def _fold_pow(space, w_left, w_right):
 def _fold_not(space, operand):
     return space.newbool(not space.is_true(operand))
 
+def _fold_in(space, w_left, w_right):
+    return space.newbool(space.contains_w(w_right, w_left))
+
+def _fold_not_in(space, w_left, w_right):
+    return space.newbool(not space.contains_w(w_right, w_left))
+
 
 binary_folders = {
     ast.Add : _binary_fold("add"),
@@ -147,7 +164,20 @@ unary_folders = {
 }
 unrolling_unary_folders = unrolling_iterable(unary_folders.items())
 
-for folder in binary_folders.values() + unary_folders.values():
+compare_folders = {
+    ast.Eq : _binary_fold("eq"),
+    ast.NotEq : _binary_fold("ne"),
+    ast.Lt : _binary_fold("lt"),
+    ast.LtE : _binary_fold("le"),
+    ast.Gt : _binary_fold("gt"),
+    ast.GtE : _binary_fold("ge"),
+    ast.In : _fold_in,
+    ast.NotIn : _fold_not_in,
+}
+unrolling_compare_folders = unrolling_iterable(compare_folders.items())
+
+for folder in (binary_folders.values() + unary_folders.values() +
+               compare_folders.values()):
     folder._always_inline_ = 'try'
 del folder
 
@@ -255,6 +285,58 @@ class OptimizingVisitor(ast.ASTVisitor):
             return values[0]
         return bop
 
+    def visit_Compare(self, comp):
+        # Only fold comparisons between numbers and byte strings: they
+        # have no side effects and cannot emit warnings.  "is" and "is not"
+        # depend on the identity of the constants and are never folded.
+        w_left = self._comparable_constant(comp.left)
+        if w_left is None:
+            return comp
+        consts_w = [None] * len(comp.comparators)
+        for i in range(len(comp.comparators)):
+            w_const = self._comparable_constant(comp.comparators[i])
+            if w_const is None:
+                return comp
+            consts_w[i] = w_const
+        w_result = None
+        for i in range(len(comp.ops)):
+            op = comp.ops[i]
+            w_right = consts_w[i]
+            try:
+                for op_kind, folder in unrolling_compare_folders:
+                    if op_kind == op:
+                        w_result = folder(self.space, w_left, w_right)
+                        break
+                else:
+                    return comp
+            except OperationError:
+                # Let all errors be found at runtime.
+                return comp
+            if not self.space.is_true(w_result):
+                break
+            w_left = w_right
+        assert w_result is not None
+        return ast.Const(w_result, comp.lineno, comp.col_offset)
+
+    def _comparable_constant(self, node):
+        w_const = node.as_constant()
+        if w_const is not None:
+            space = self.space
+            if (space.isinstance_w(w_const, space.w_int) or
+                    space.isinstance_w(w_const, space.w_long) or
+                    space.isinstance_w(w_const, space.w_float) or
+                    space.isinstance_w(w_const, space.w_bytes)):
+                return w_const
+        return None
+
+    def visit_IfExp(self, ifexp):
+        truth = ifexp.test.as_constant_truth(self.space)
+        if truth == CONST_TRUE:
+            return ifexp.body
+        elif truth == CONST_FALSE:
+            return ifexp.orelse
+        return ifexp
+
     def visit_Repr(self, rep):
         w_const = rep.value.as_constant()
         if w_const is not None:
@@ -968,6 +968,44 @@ class TestCompiler(BaseTestCompiler):
         yield (self.st, "x=(lambda: (-0.0, 0.0), lambda: (0.0, -0.0))[1]()",
                         'repr(x)', '(0.0, -0.0)')
 
+    def test_jump_threading(self):
+        source = """if 1:
+        def f(a, b, c):
+            res = []
+            while a:
+                a -= 1
+                if a & b:
+                    res.append(a)
+            return res, (a or b) or c, (a and b) and c, a or b and c
+        x = f(10, 5, 3)
+        y = f(0, 0, 3)
+        z = f(2, 0, 0)
+        """
+        self.simple_test(source, 'x', ([9, 7, 6, 5, 4, 3, 1], 5, 0, 3))
+        self.simple_test(source, 'y', ([], 3, 0, 0))
+        self.simple_test(source, 'z', ([], 0, 0, 0))
+
+    def test_if_debug(self):
+        source = """if 1:
+        def f(x):
+            if __debug__:
+                return x
+            return -x
+        def g(x):
+            if not __debug__:
+                return x
+            return -x
+        x = f(5), g(5), 5 if __debug__ else 6
+        """
+        self.simple_test(source, 'x', (5, -5, 5))
+
+    def test_fold_constant_compare(self):
+        source = """if 1:
+        x = 1 < 2, 2 < 1, 1 < 2 < 3, 3 > 2 < 1, "a" in "ab", 1.0 == 1
+        """
+        self.simple_test(source, 'x', (True, False, True, False, True, True))
+
+
 class TestCompilerRevDB(BaseTestCompiler):
     spaceconfig = {"translation.reverse_debugger": True}
 
@@ -1239,6 +1277,95 @@ class TestOptimizations:
         counts = self.count_instructions(source)
         assert ops.BUILD_TUPLE not in counts
 
+    def test_fold_constant_compare(self):
+        for source in (
+            "return 1 < 2",
+            "return 1 < 2 < 3",
+            "return 3 < 2 < 1",
+            "return 1.5 == 2",
+            "return 'b' in 'abc'",
+            ):
+            source = 'def f(): %s' % source
+            counts = self.count_instructions(source)
+            assert counts == {ops.LOAD_CONST: 1, ops.RETURN_VALUE: 1}
+
+        for source in (
+            "return a < 2",
+            "return 1 < a < 2",
+            "return 1 is 1",
+            "return 'a' == u'a'",
+            "return 1 in 2",
+            ):
+            source = 'def f(): %s' % source
+            counts = self.count_instructions(source)
+            assert ops.COMPARE_OP in counts
+
+    def test_fold_constant_if(self):
+        source = """def f(a, b):
+            if 1 > 2:
+                return a
+            return b if 2 > 1 else a
+        """
+        counts = self.count_instructions(source)
+        assert counts == {ops.LOAD_FAST: 1, ops.RETURN_VALUE: 1}
+
+    def test_if_debug(self):
+        source = """def f(x):
+            if __debug__:
+                x()
+        """
+        counts = self.count_instructions(source)
+        assert counts[ops.JUMP_IF_NOT_DEBUG] == 1
+        assert ops.LOAD_GLOBAL not in counts
+        assert ops.POP_JUMP_IF_FALSE not in counts
+
+    def test_jump_threading(self):
+        source = """def f(a, b, c):
+            if a:
+                if b:
+                    c()
+            else:
+                b()
+            return (a or b) or c
+        """
+        generator, blocks = generate_function_code(source, self.space)
+        seen = {}
+        for block in blocks:
+            for instr in block.instructions:
+                if instr.jump is not None:
+                    seen[instr.opcode] = None
+                    target = instr.jump.instructions[0]
+                    if instr.opcode == ops.POP_JUMP_IF_FALSE:
+                        assert target.opcode != ops.JUMP_FORWARD
+                        assert target.opcode != ops.JUMP_ABSOLUTE
+                    if instr.opcode == ops.JUMP_IF_TRUE_OR_POP:
+                        assert target.opcode != ops.JUMP_IF_TRUE_OR_POP
+        assert ops.POP_JUMP_IF_FALSE in seen
+        assert ops.JUMP_IF_TRUE_OR_POP in seen
+
+    def test_jump_threading_not_backward(self):
+        # a conditional jump must not be threaded to the loop header:
+        # the JIT only enters loops from JUMP_ABSOLUTE
+        source = """def f(a, b, c):
+            while a:
+                if b:
+                    c()
+            for x in a:
+                if x and b:
+                    c()
+        """
+        generator, blocks = generate_function_code(source, self.space)
+        seen = 0
+        for block in blocks:
+            for instr in block.instructions:
+                if instr.jump is not None and instr.opcode in (
+                        ops.POP_JUMP_IF_FALSE, ops.POP_JUMP_IF_TRUE,
+                        ops.JUMP_IF_FALSE_OR_POP, ops.JUMP_IF_TRUE_OR_POP):
+                    assert instr.jump.offset > block.offset
+                    if instr.jump.instructions[0].opcode == ops.JUMP_ABSOLUTE:
+                        seen += 1
+        assert seen == 3
+
 
 class TestHugeStackDepths:
     def run_and_check_stacksize(self, source):
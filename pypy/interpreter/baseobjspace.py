@@ -1253,8 +1253,9 @@ class ObjSpace(object):
         return self.call_function(w_meth, *arg_w)
 
     def raise_key_error(self, w_key):
-        e = self.call_function(self.w_KeyError, w_key)
-        raise OperationError(self.w_KeyError, e)
+        # the KeyError instance is only built if it is needed, see
+        # OperationError.normalize_exception()
+        raise OperationError(self.w_KeyError, self.newtuple([w_key]))
 
     def lookup(self, w_obj, name):
         w_type = self.type(w_obj)
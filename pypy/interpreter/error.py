@@ -29,6 +29,11 @@ class OperationError(Exception):
 
     _w_value = None
     _application_traceback = None
+    # the most recent traceback entry, for which no PyTraceback was built
+    # yet: see record_traceback()
+    _tb_frame = None
+    _tb_lasti = -1
+    _normalize_later = False
 
     def __init__(self, w_type, w_value, tb=None):
         self.setup(w_type)
@@ -119,7 +124,7 @@ class OperationError(Exception):
 
     @not_rpython
     def print_app_tb_only(self, file):
-        tb = self._application_traceback
+        tb = self.get_traceback()
         if tb:
             import linecache
             print >> file, "Traceback (application-level):"
@@ -231,6 +236,33 @@ class OperationError(Exception):
         self.w_type = w_type
         self._w_value = w_value
 
+    def defer_normalization(self, space):
+        """Called when the exception is caught by a handler that does not
+        look at the exception value.  If normalize_exception() would only
+        call a built-in exception class, without changing w_type, it is
+        delayed until normalize_deferred() is called.  Returns False if
+        the exception must be normalized now.
+        """
+        from pypy.objspace.std.typeobject import W_TypeObject
+        w_type = self.w_type
+        if not isinstance(w_type, W_TypeObject) or w_type.is_heaptype():
+            return False
+        w_value = self._w_value
+        if w_value is not None and space.isinstance_w(w_value,
+                                                      space.w_BaseException):
+            return False     # normalizing may change w_type
+        self._normalize_later = True
+        return True
+
+    def normalize_deferred(self, space):
+        """Normalize the exception if defer_normalization() was called.
+        Must be called by everything that gives the value of a caught
+        exception to app-level, like sys.exc_info().
+        """
+        if self._normalize_later:
+            self._normalize_later = False
+            self.normalize_exception(space)
+
     def _exception_getclass(self, space, w_inst):
         w_type = space.exception_getclass(w_inst)
         if not space.exception_is_valid_class_w(w_type):
@@ -300,6 +332,11 @@ class OperationError(Exception):
         """
         from pypy.interpreter.pytraceback import PyTraceback
         tb = self._application_traceback
+        frame = self._tb_frame
+        if frame is not None:
+            tb = PyTraceback(frame.space, frame, self._tb_lasti, tb)
+            self._application_traceback = tb
+            self._tb_frame = None
         if tb is not None and isinstance(tb, PyTraceback):
             tb.frame.mark_as_escaped()
         return tb
@@ -312,11 +349,22 @@ class OperationError(Exception):
         return tb
 
     def got_any_traceback(self):
-        return self._application_traceback is not None
+        return (self._application_traceback is not None or
+                self._tb_frame is not None)
 
     def set_traceback(self, traceback):
         """Set the current traceback."""
         self._application_traceback = traceback
+        self._tb_frame = None
+
+    def record_traceback(self, frame, last_instruction):
+        """Add a traceback entry for 'frame'.  The PyTraceback is only
+        built by get_traceback(), which is never called for an exception
+        that is caught in the frame that raised it and not inspected.
+        """
+        self.get_traceback()     # builds the entry of the previous frame
+        self._tb_frame = frame
+        self._tb_lasti = last_instruction
 
 
 class ClearedOpErr:
@@ -196,6 +196,42 @@ class Function(W_Root):
             i += 1
         return new_frame.run()
 
+    @jit.unroll_safe
+    def funccall_valuestack_keywords(self, nargs, nkwds, frame): # speed hack
+        """Call with 'nargs' positional arguments followed by 'nkwds'
+        (name, value) pairs on the valuestack of 'frame', without building
+        an Arguments.  The keywords are stored directly into the locals of
+        the new frame.  Returns None if the call needs the general path,
+        which is also the one that reports all errors."""
+        from pypy.interpreter.pycode import PyCode
+
+        code = self.getcode() # hook for the jit
+        if not code.fast_natural_arity & Code.FLATPYCALL:
+            return None
+        assert isinstance(code, PyCode)
+        argcount = code.co_argcount
+        if nargs > argcount:
+            return None
+        new_frame = self.space.createframe(code, self.w_func_globals, self)
+        scope_w = new_frame.locals_cells_stack_w
+        for i in xrange(nargs):
+            scope_w[i] = frame.peekvalue(2 * nkwds + nargs - 1 - i)
+        signature = code.signature()
+        for i in xrange(nkwds):
+            w_key = frame.peekvalue(2 * (nkwds - i) - 1)
+            j = signature.find_argname(self.space.text_w(w_key))
+            if j < nargs or scope_w[j] is not None:
+                # unknown or repeated keyword (j == -1 is also < nargs)
+                return None
+            scope_w[j] = frame.peekvalue(2 * (nkwds - i) - 2)
+        def_first = argcount - len(self.defs_w)
+        for i in xrange(nargs, argcount):
+            if scope_w[i] is None:
+                if i < def_first:
+                    return None     # missing argument
+                scope_w[i] = self.defs_w[i - def_first]
+        return new_frame.run()
+
     def getdict(self, space):
         if self.w_func_dict is None:
             self.w_func_dict = space.newdict(instance=True)
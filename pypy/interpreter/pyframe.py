@@ -466,6 +466,7 @@ class PyFrame(W_Root):
             w_exc_value = space.w_None
             w_tb = space.w_None
         else:
+            self.last_exception.normalize_deferred(space)
             w_exc_value = self.last_exception.get_w_value(space)
             w_tb = self.last_exception.get_w_traceback(space)
 
@@ -903,6 +904,7 @@ class PyFrame(W_Root):
             while f is not None and f.last_exception is None:
                 f = f.f_backref()
             if f is not None:
+                f.last_exception.normalize_deferred(space)
                 return f.last_exception.get_w_value(space)
         return space.w_None
 
@@ -933,6 +935,7 @@ class PyFrame(W_Root):
                 if last is get_cleared_operation_error(self.space):
                     break
                 if for_hidden or not frame.hide():
+                    last.normalize_deferred(space)
                     return last
             frame = frame.f_backref()
         return None
@@ -275,7 +275,11 @@ class __extend__(pyframe.PyFrame):
             elif opcode == opcodedesc.CALL_METHOD.index:
                 self.CALL_METHOD(oparg, next_instr)
             elif opcode == opcodedesc.COMPARE_OP.index:
-                self.COMPARE_OP(oparg, next_instr)
+                if jit.we_are_jitted():
+                    self.COMPARE_OP(oparg, next_instr)
+                else:
+                    next_instr = self.COMPARE_OP_and_jump(oparg, next_instr,
+                                                          co_code, ec)
             elif opcode == opcodedesc.DELETE_ATTR.index:
                 self.DELETE_ATTR(oparg, next_instr)
             elif opcode == opcodedesc.DELETE_FAST.index:
@@ -994,6 +998,34 @@ class __extend__(pyframe.PyFrame):
         return space.newbool(space.exception_match(w_1, w_2))
 
     def COMPARE_OP(self, testnum, next_instr):
+        self.pushvalue(self._compare_op(testnum))
+
+    def COMPARE_OP_and_jump(self, testnum, next_instr, co_code, ec):
+        """Superinstruction COMPARE_OP + POP_JUMP_IF_FALSE/TRUE, used by the
+        interpreter only: the JIT always sees the two separate opcodes.
+        Skipping the dispatch of the jump is not done while a trace
+        function is set, because the jump must then be reported to it."""
+        w_result = self._compare_op(testnum)
+        opcode = ord(co_code[next_instr])
+        if ((opcode != opcodedesc.POP_JUMP_IF_FALSE.index and
+             opcode != opcodedesc.POP_JUMP_IF_TRUE.index) or
+                self.space.reverse_debugging or ec.gettrace() is not None):
+            self.pushvalue(w_result)
+            return next_instr
+        self.last_instr = intmask(next_instr)
+        lo = ord(co_code[next_instr + 1])
+        hi = ord(co_code[next_instr + 2])
+        next_instr += 3
+        target = (hi * 256) | lo
+        if self.space.is_true(w_result):
+            if opcode == opcodedesc.POP_JUMP_IF_TRUE.index:
+                return target
+        else:
+            if opcode == opcodedesc.POP_JUMP_IF_FALSE.index:
+                return target
+        return next_instr
+
+    def _compare_op(self, testnum):
         w_2 = self.popvalue()
         w_1 = self.popvalue()
         if testnum == 0:
@@ -1020,7 +1052,7 @@ class __extend__(pyframe.PyFrame):
             w_result = self.cmp_exc_match(w_1, w_2)
         else:
             raise BytecodeCorruption("bad COMPARE_OP oparg")
-        self.pushvalue(w_result)
+        return w_result
 
     def IMPORT_NAME(self, nameindex, next_instr):
         space = self.space
@@ -1237,6 +1269,16 @@ class __extend__(pyframe.PyFrame):
             self.pushvalue(w_result)
         # XXX end of hack for performance
         else:
+            nargs = oparg & 0xff
+            nkwds = (oparg >> 8) & 0xff
+            w_function = self.peekvalue(nargs + 2 * nkwds)
+            if isinstance(w_function, function.Function):
+                w_result = w_function.funccall_valuestack_keywords(
+                    nargs, nkwds, self)
+                if w_result is not None:
+                    self.dropvalues(nargs + 2 * nkwds + 1)
+                    self.pushvalue(w_result)
+                    return
             # general case
             self.call_function(oparg)
 
@@ -1499,17 +1541,70 @@ class ExceptBlock(FrameBlock):
         # exception handler (the code after the except:)
         self.cleanupstack(frame)
         assert isinstance(unroller, SApplicationException)
+        space = frame.space
         operationerr = unroller.operr
-        operationerr.normalize_exception(frame.space)
+        if (handler_discards_value(frame.getcode().co_code,
+                                   self.handlerposition) and
+                operationerr.defer_normalization(space)):
+            # only 'except Class:' clauses: don't build the exception
+            # instance unless sys.exc_info() or a bare 'raise' needs it
+            w_value = space.w_None
+        else:
+            operationerr.normalize_exception(space)
+            w_value = operationerr.get_w_value(space)
         # the stack setup is slightly different than in CPython:
         # instead of the traceback, we store the unroller object,
         # wrapped.
         frame.pushvalue(unroller)
-        frame.pushvalue(operationerr.get_w_value(frame.space))
+        frame.pushvalue(w_value)
         frame.pushvalue(operationerr.w_type)
         frame.last_exception = operationerr
         return r_uint(self.handlerposition)   # jump to the handler
 
+@jit.elidable
+def handler_discards_value(co_code, pos):
+    """Check that the 'except' clauses starting at 'pos' never look at the
+    exception value, i.e. that they are all 'except Class:' or a final
+    'except:', without 'as'.  See visit_TryExcept() in codegen.py for the
+    bytecode produced for them.
+    """
+    end = len(co_code) - 2
+    while pos < end:
+        op = ord(co_code[pos])
+        if op == opcodedesc.END_FINALLY.index:
+            return True    # no clause matched, the exception is re-raised
+        next_clause = -1
+        if op == opcodedesc.DUP_TOP.index:
+            # skip the expression giving the class, up to the match
+            pos += 1
+            while pos < end:
+                op = ord(co_code[pos])
+                if op < HAVE_ARGUMENT:
+                    pos += 1
+                    continue
+                pos += 3
+                if (op == opcodedesc.COMPARE_OP.index and
+                        ord(co_code[pos - 2]) == 10 and
+                        ord(co_code[pos - 1]) == 0):    # 'exception match'
+                    break
+            if (pos >= end or
+                    ord(co_code[pos]) != opcodedesc.POP_JUMP_IF_FALSE.index):
+                return False
+            next_clause = ord(co_code[pos + 1]) | (ord(co_code[pos + 2]) << 8)
+            pos += 3
+        # the three values are popped at the start of the clause
+        if (pos >= end or
+                ord(co_code[pos]) != opcodedesc.POP_TOP.index or
+                ord(co_code[pos + 1]) != opcodedesc.POP_TOP.index or
+                ord(co_code[pos + 2]) != opcodedesc.POP_TOP.index):
+            return False
+        if next_clause < 0:
+            return True    # bare 'except:', always the last clause
+        if next_clause <= pos:
+            return False
+        pos = next_clause
+    return False
+
 
 class FinallyBlock(FrameBlock):
     """A try:finally: block.  Stores the position of the exception handler."""
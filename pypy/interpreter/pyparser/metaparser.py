@@ -152,6 +152,8 @@ class ParserGenerator(object):
             gram.dfas.append(dfa)
             assert len(gram.dfas) - 1 == symbol_id - 256
         gram.start = gram.symbol_ids[self.start_symbol]
+        for dfa in gram.dfas:
+            dfa.compute_transitions()
         return gram
 
     def make_label(self, gram, label):
@@ -62,12 +62,39 @@ class DFA(object):
         self.symbol_id = symbol_id
         self.states = states
         self.first = self._first_to_string(first)
+        # for each state, a dict {label_index: (sym_id << 16) | next_state},
+        # where sym_id is 0 to shift the token or the id of the symbol to
+        # push; filled by compute_transitions()
+        self.transitions = None
 
     def could_match_token(self, label_index):
         pos = label_index >> 3
         bit = 1 << (label_index & 0b111)
         return bool(ord(self.first[label_index >> 3]) & bit)
 
+    @not_rpython
+    def compute_transitions(self):
+        """Precompute, for every state, which arc each possible label
+        follows, so that the parser doesn't have to search the arcs."""
+        grammar = self.grammar
+        self.transitions = []
+        for arcs, is_accepting in self.states:
+            transitions = {}
+            for label_index in range(len(grammar.labels)):
+                for i, next_state in arcs:
+                    assert next_state < (1 << 16)
+                    sym_id = grammar.labels[i]
+                    if label_index == i:
+                        transitions[label_index] = next_state
+                        break
+                    elif sym_id >= 256:
+                        sub_node_dfa = grammar.dfas[sym_id - 256]
+                        if sub_node_dfa.could_match_token(label_index):
+                            transitions[label_index] = (
+                                (sym_id << 16) | next_state)
+                            break
+            self.transitions.append(transitions)
+
     @staticmethod
     @not_rpython
     def _first_to_string(first):
@@ -298,7 +325,10 @@ class StackEntry(object):
         self.next = next
         self.dfa = dfa
         self.state = state
-        self.node = None
+        # the first child, and the list of all children once there are
+        # several; the node itself is only built by make_node()
+        self.child = None
+        self.children = None
 
     def push(self, dfa, state):
         return StackEntry(self, dfa, state)
@@ -307,15 +337,19 @@ class StackEntry(object):
         return self.next
 
     def node_append_child(self, child):
-        node = self.node
-        if node is None:
-            self.node = Nonterminal1(self.dfa.grammar, self.dfa.symbol_id, child)
-        elif isinstance(node, Nonterminal1):
-            newnode = self.node = Nonterminal(
-                    self.dfa.grammar, 
-                    self.dfa.symbol_id, [node._child, child])
+        if self.children is not None:
+            self.children.append(child)
+        elif self.child is None:
+            self.child = child
         else:
-            self.node.append_child(child)
+            self.children = [self.child, child]
+
+    def make_node(self):
+        if self.children is not None:
+            return Nonterminal(self.dfa.grammar, self.dfa.symbol_id,
+                               self.children)
+        assert self.child is not None
+        return Nonterminal1(self.dfa.grammar, self.dfa.symbol_id, self.child)
 
     def view(self):
         from dotviewer import graphclient
@@ -332,9 +366,10 @@ class StackEntry(object):
         if self.next:
             result.append('%s -> %s [label="next"]' % (id(self), id(self.next)))
             self.next._dot(result)
-        if self.node:
-            result.append('%s -> %s [label="node"]' % (id(self), id(self.node)))
-            self.node._dot(result)
+        if self.child:
+            node = self.make_node()
+            result.append('%s -> %s [label="node"]' % (id(self), id(node)))
+            node._dot(result)
 
 
 class Parser(object):
@@ -355,15 +390,15 @@ class Parser(object):
 
     def add_token(self, token):
         label_index = self.grammar.classify(token)
-        sym_id = 0 # for the annotator
         while True:
             dfa = self.stack.dfa
             state_index = self.stack.state
             states = dfa.states
-            arcs, is_accepting = states[state_index]
-            for i, next_state in arcs:
-                sym_id = self.grammar.labels[i]
-                if label_index == i:
+            transition = dfa.transitions[state_index].get(label_index, -1)
+            if transition >= 0:
+                next_state = transition & 0xffff
+                sym_id = transition >> 16
+                if sym_id == 0:
                     # We matched a non-terminal.
                     self.shift(next_state, token)
                     state = states[next_state]
@@ -378,15 +413,14 @@ class Parser(object):
                         state_index = self.stack.state
                         state = dfa.states[state_index]
                     return False
-                elif sym_id >= 256:
+                else:
+                    # This token can start a child node.
                     sub_node_dfa = self.grammar.dfas[sym_id - 256]
-                    # Check if this token can start a child node.
-                    if sub_node_dfa.could_match_token(label_index):
-                        self.push(sub_node_dfa, next_state, sym_id)
-                        break
+                    self.push(sub_node_dfa, next_state, sym_id)
             else:
                 # We failed to find any arcs to another state, so unless this
                 # state is accepting, it's invalid input.
+                arcs, is_accepting = states[state_index]
                 if is_accepting:
                     self.pop()
                     if self.stack is None:
@@ -395,7 +429,7 @@ class Parser(object):
                     # If only one possible input would satisfy, attach it to the
                     # error.
                     if len(arcs) == 1:
-                        expected = sym_id
+                        expected = self.grammar.labels[arcs[0][0]]
                         expected_str = self.grammar.token_to_error_string.get(
                                 arcs[0][0], None)
                     else:
@@ -419,8 +453,7 @@ class Parser(object):
         """Pop an entry off the stack and make its node a child of the last."""
         top = self.stack
         self.stack = top.pop()
-        node = top.node
-        assert node is not None
+        node = top.make_node()
         if self.stack:
             self.stack.node_append_child(node)
         else:
@@ -340,3 +340,21 @@ baz: NUMBER
         assert tree.get_child(0).line == input + "\n"
         assert tree.get_line() == input + "\n"
 
+
+    def test_transitions(self):
+        p, gram = self.parser_for(
+            "foo: bar | NAME '+' bar\nbar: NUMBER [bar] | STRING"
+        )
+        foo = gram.dfas[gram.symbol_ids['foo'] - 256]
+        bar_id = gram.symbol_ids['bar']
+        number = gram.token_ids[gram.TOKENS['NUMBER']]
+        string = gram.token_ids[gram.TOKENS['STRING']]
+        name = gram.token_ids[gram.TOKENS['NAME']]
+        transitions = foo.transitions[0]
+        # NUMBER and STRING start a 'bar', NAME is shifted directly
+        assert transitions[number] >> 16 == bar_id
+        assert transitions[string] >> 16 == bar_id
+        assert transitions[name] >> 16 == 0
+        assert gram.token_ids[gram.TOKENS['NEWLINE']] not in transitions
+        tree = p.parse("x + 1 2 'a'")
+        assert tree.get_child(0).value == "x"
@@ -256,6 +256,49 @@ def test_kwargs_confusing_name():
     res = func(self=6)
     assert res == 42
 
+def test_keywords_fill_slots():
+    def func(a, b, c=3, d=4):
+        return a, b, c, d
+    assert func(1, b=2) == (1, 2, 3, 4)
+    assert func(b=2, a=1, d=5) == (1, 2, 3, 5)
+    assert func(1, 2, d=6, c=5) == (1, 2, 5, 6)
+    with raises(TypeError):
+        func(1, a=2)
+    with raises(TypeError):
+        func(1, c=2)
+    with raises(TypeError):
+        func(1, 2, e=5)
+    with raises(TypeError):
+        func(1, 2, 3, 4, 5, d=6)
+
+def test_keywords_method_call():
+    class A(object):
+        def m(self, a, b=2):
+            return self, a, b
+    a = A()
+    assert a.m(b=3, a=1) == (a, 1, 3)
+    assert A.m(a, a=1) == (a, 1, 2)
+    with raises(TypeError):
+        a.m(self=a, a=1)
+    with raises(TypeError):
+        a.m(b=1)
+
+def test_keywords_closure_and_generator():
+    def outer(x):
+        def func(a, b=0):
+            return x + a + b
+        return func
+    assert outer(100)(b=1, a=2) == 103
+    def gen(a, b):
+        yield a
+        yield b
+    assert list(gen(b=2, a=1)) == [1, 2]
+    def cellarg(a, b):
+        def inner():
+            return a
+        return inner() + b
+    assert cellarg(b=1, a=2) == 3
+
 def test_get():
     def func(self): return self
     obj = object()
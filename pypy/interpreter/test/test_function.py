@@ -221,6 +221,33 @@ def f%s:
 
         assert space.eq_w(w_res, space.wrap(44))
 
+    def test_flatcall_keywords(self):
+        space = self.space
+
+        def f(self, a, b, c=5):
+            return int(self) + 10 * a + 100 * b + 1000 * c
+        code = PyCode._from_code(self.space, f.func_code)
+        fn = Function(self.space, code, self.space.newdict(),
+                      defs_w=[space.newint(5)])
+
+        def bomb(*args):
+            assert False, "shortcutting should have avoided this"
+
+        code.funcrun = bomb
+        code.funcrun_obj = bomb
+
+        w_res = space.appexec([fn], """(f):
+        class A(object):
+            m = f
+            def __int__(self):
+                return 1
+        def g(x):
+            return f(x, b=3, a=2)
+        return [g(1), f(2, 3, 4, c=1), f(1, b=3, a=2, c=4),
+                A().m(2, b=3), A.__dict__['m'](1, a=2, b=3)]
+        """)
+        assert space.unwrap(w_res) == [5321, 1432, 4321, 5321, 5321]
+
 
 class TestFunction:
 
@@ -241,6 +241,28 @@ class TestInterpreter:
         assert self.codetest(code, 'f', []) == os.name
 
 
+    def test_handler_discards_value(self):
+        from pypy.interpreter.pycode import PyCode
+        from pypy.interpreter.pyopcode import handler_discards_value
+        from pypy.tool import stdlib_opcode
+        space = self.space
+        def check(handlers):
+            source = "try:\n    x\n" + handlers
+            w_code = space.builtin.call('compile', space.wrap(source),
+                                        space.wrap('<string>'),
+                                        space.wrap('exec'))
+            co_code = space.interp_w(PyCode, w_code).co_code
+            assert ord(co_code[0]) == stdlib_opcode.SETUP_EXCEPT
+            handler = 3 + (ord(co_code[1]) | (ord(co_code[2]) << 8))
+            return handler_discards_value(co_code, handler)
+        assert check("except KeyError:\n    pass\n")
+        assert check("except (KeyError, IndexError):\n    pass\n"
+                     "except:\n    raise\n")
+        assert check("except (A if x else B):\n    pass\n")
+        assert not check("except KeyError as e:\n    pass\n")
+        assert not check("except KeyError:\n    pass\n"
+                         "except IndexError, e:\n    pass\n")
+
 class AppTestInterpreter: 
     def test_trivial(self):
         x = 42
@@ -405,3 +427,89 @@ class AppTestInterpreter:
                 sys.exc_clear()
                 raise
         raises(TypeError, f)
+
+    def test_caught_exception_not_bound(self):
+        import sys
+        class MyKeyError(KeyError):
+            pass
+        def f(d, key):
+            try:
+                d[key]
+            except KeyError:
+                return sys.exc_info()
+        tp, value, tb = f({}, 'x')
+        assert tp is KeyError
+        assert type(value) is KeyError and value.args == ('x',)
+        assert tb.tb_frame.f_code is f.__code__ and tb.tb_next is None
+        key = MyKeyError()
+        def g(d):
+            try:
+                d[key]
+            except MyKeyError:
+                return 1
+            except KeyError:
+                return 2
+        assert g({}) == 2    # the key is not the exception
+        tp, value, tb = f({}, (1, 2))
+        assert value.args == ((1, 2),)
+        def h(d, key):
+            try:
+                f(None, key)
+            except TypeError:
+                try:
+                    raise
+                except TypeError as e:
+                    return e, sys.exc_info()[2]
+        e, tb = h(None, 'x')
+        assert type(e) is TypeError
+        assert tb.tb_frame.f_code is h.__code__
+        assert tb.tb_next.tb_frame.f_code is f.__code__
+        assert tb.tb_next.tb_next is None
+
+    def test_compare_and_jump(self):
+        # COMPARE_OP followed by POP_JUMP_IF_FALSE/TRUE runs as one
+        # superinstruction in the interpreter
+        def f(a, b):
+            res = []
+            if a < b:
+                res.append('lt')
+            if not a == b:
+                res.append('ne')
+            if a in (b, 5):
+                res.append('in')
+            while a < b:
+                a += 1
+            res.append(a)
+            return res
+        assert f(1, 3) == ['lt', 'ne', 3]
+        assert f(5, 5) == ['in', 5]
+        assert f(7, 5) == ['ne', 7]
+
+        class Bad(object):
+            def __lt__(self, other):
+                return self
+            def __nonzero__(self):
+                raise ValueError
+        def g():
+            if Bad() < 1:
+                return 1
+        raises(ValueError, g)
+
+    def test_compare_and_jump_trace(self):
+        import sys
+        def f(a):
+            if a < 1:
+                a = 5
+            return a
+        lines = []
+        def trace(frame, event, arg):
+            if frame.f_code is f.__code__ and event == 'line':
+                lines.append(frame.f_lineno - f.__code__.co_firstlineno)
+            return trace
+        sys.settrace(trace)
+        try:
+            f(0)
+            f(2)
+        finally:
+            sys.settrace(None)
+        assert lines == [1, 2, 3, 1, 3]
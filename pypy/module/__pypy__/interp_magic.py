@@ -51,6 +51,56 @@ def mapdict_cache_counter(space, name):
     return space.newtuple2(space.newint(cache.hits.get(name, 0)),
                            space.newint(cache.misses.get(name, 0)))
 
+def _cache_stats(space, cache):
+    return space.newtuple([space.newint(1 << cache.size_exp),
+                           space.newint(cache.num_hits),
+                           space.newint(cache.num_misses),
+                           space.newint(cache.num_collisions)])
+
+def method_cache_stats(space):
+    """Return a tuple (size, hits, misses, collisions) for the global cache
+    of method lookups on types.  'collisions' counts the misses that
+    evicted another entry.  Hits in JIT-compiled code are not counted;
+    the JIT usually constant-folds these lookups anyway."""
+    return _cache_stats(space, space.fromcache(MethodCache))
+
+def mapdict_cache_stats(space):
+    """Return a tuple (size, hits, misses, collisions) for the global cache
+    of attribute lookups in instance maps.  As for method_cache_stats(),
+    hits in JIT-compiled code are not counted."""
+    return _cache_stats(space, space.fromcache(MapAttrCache))
+
+def reset_method_cache_stats(space):
+    """Reset the counters returned by method_cache_stats() and
+    mapdict_cache_stats() to zero."""
+    space.fromcache(MethodCache).reset_stats()
+    space.fromcache(MapAttrCache).reset_stats()
+
+@unwrap_spec(size_exp=int)
+def set_method_cache_size(space, size_exp):
+    """Resize the global method and attribute caches to 2 ** size_exp
+    entries each.  The caches are emptied."""
+    from pypy.objspace.std.typeobject import MAX_CACHE_SIZE_EXP
+    if not 0 < size_exp <= MAX_CACHE_SIZE_EXP:
+        raise oefmt(space.w_ValueError,
+                    "size_exp must be between 1 and %d", MAX_CACHE_SIZE_EXP)
+    space.fromcache(MethodCache).resize(size_exp)
+    space.fromcache(MapAttrCache).resize(size_exp)
+
+def import_cache_stats(space):
+    """Return a tuple (directories listed, stat calls saved) for the cache
+    of sys.path directory listings used by the import machinery."""
+    from pypy.module.imp.importing import DirectoryListingCache
+    cache = space.fromcache(DirectoryListingCache)
+    return space.newtuple2(space.newint(cache.num_listings),
+                           space.newint(cache.num_syscalls_saved))
+
+def clear_import_cache(space):
+    """Forget the cached sys.path directory listings.  Only needed if files
+    are added with an explicitly preserved directory mtime."""
+    from pypy.module.imp.importing import DirectoryListingCache
+    space.fromcache(DirectoryListingCache).clear()
+
 def builtinify(space, w_func):
     """To implement at app-level modules that are, in CPython,
     implemented in C: this decorator protects a function from being ever
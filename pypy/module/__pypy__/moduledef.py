@@ -122,6 +122,12 @@ class Module(MixedModule):
         'newmemoryview'             : 'interp_buffer.newmemoryview',
         'utf8content'               : 'interp_magic.utf8content',
         'list_get_physical_size'    : 'interp_magic.list_get_physical_size',
+        'method_cache_stats'        : 'interp_magic.method_cache_stats',
+        'mapdict_cache_stats'       : 'interp_magic.mapdict_cache_stats',
+        'reset_method_cache_stats'  : 'interp_magic.reset_method_cache_stats',
+        'set_method_cache_size'     : 'interp_magic.set_method_cache_size',
+        'import_cache_stats'        : 'interp_magic.import_cache_stats',
+        'clear_import_cache'        : 'interp_magic.clear_import_cache',
     }
     if sys.platform == 'win32':
         interpleveldefs['get_console_cp'] = 'interp_magic.get_console_cp'
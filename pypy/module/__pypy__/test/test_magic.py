@@ -84,3 +84,16 @@ def f():
         l = [1, 2]
         l.append(3)
         assert list_get_physical_size(l) >= 3 # should be 6, but untranslated 3
+
+    def test_import_cache_stats(self):
+        from __pypy__ import import_cache_stats, clear_import_cache
+        import sys
+        listed, saved = import_cache_stats()
+        assert listed >= 0 and saved >= 0
+        try:
+            import __this_module_does_not_exist
+        except ImportError:
+            pass
+        listed2, saved2 = import_cache_stats()
+        assert listed2 >= listed and saved2 >= saved
+        clear_import_cache()
@@ -22,6 +22,16 @@ class W_Reader(W_Root):
         self.dialect = dialect
         self.w_iter = w_iter
         self.line_num = 0
+        # the characters that make a line go through the state machine
+        # of next_w(), if they appear anywhere but in the final newline
+        special = '\0\n\r'
+        if dialect.quoting != QUOTE_NONE:
+            special += dialect.quotechar
+        if dialect.escapechar != '\0':
+            special += dialect.escapechar
+        if dialect.skipinitialspace:
+            special += ' '
+        self.special_characters = special
 
     def iter_w(self):
         return self
@@ -40,8 +50,10 @@ class W_Reader(W_Root):
         field_builder.append(c)
 
     def save_field(self, field_builder):
+        self.save_field_text(field_builder.build())
+
+    def save_field_text(self, field):
         space = self.space
-        field = field_builder.build()
         if self.numeric_field:
             from rpython.rlib.rstring import ParseStringError
             from rpython.rlib.rfloat import string_to_float
@@ -80,6 +92,8 @@ class W_Reader(W_Root):
                 raise
             self.line_num += 1
             line = space.text_w(w_line)
+            if state == START_RECORD and self.split_simple_line(line):
+                break
             for c in line:
                 if c == '\0':
                     raise self.error("line contains NULL byte")
@@ -213,6 +227,35 @@ class W_Reader(W_Root):
         self.fields_w = None
         return w_result
 
+    def split_simple_line(self, line):
+        """Fast path for the common case of a record on a single line, with
+        no quote, escape or other special character: the fields are found
+        with str.find() and sliced out of the line directly.  Returns False
+        if the line must go through the state machine instead."""
+        end = len(line)
+        while end > 0 and (line[end - 1] == '\n' or line[end - 1] == '\r'):
+            end -= 1
+        for c in self.special_characters:
+            if line.find(c, 0, end) >= 0:
+                return False
+        if end == 0:
+            return True     # an empty record
+        dialect = self.dialect
+        numeric = dialect.quoting == QUOTE_NONNUMERIC
+        start = 0
+        while True:
+            stop = line.find(dialect.delimiter, start, end)
+            if stop < 0:
+                stop = end
+            if stop - start > field_limit.limit:
+                raise self.error("field larger than field limit")
+            # empty fields are never numeric
+            self.numeric_field = numeric and stop > start
+            self.save_field_text(line[start:stop])
+            if stop == end:
+                return True
+            start = stop + 1
+
 
 def csv_reader(space, w_iterator, w_dialect=None,
                   w_delimiter        = None,
@@ -10,6 +10,8 @@ from pypy.module._csv.interp_csv import (QUOTE_MINIMAL, QUOTE_ALL,
 
 
 class W_Writer(W_Root):
+    WRITEROWS_BUFFER_SIZE = 64 * 1024
+
     def __init__(self, space, dialect, w_fileobj):
         self.space = space
         self.dialect = dialect
@@ -32,10 +34,16 @@ class W_Writer(W_Root):
     def writerow(self, w_fields):
         """Construct and write a CSV record from a sequence of fields.
         Non-string elements will be converted to string."""
+        rec = StringBuilder(80)
+        self.build_record(rec, w_fields)
+        line = rec.build()
+        return self.space.call_function(self.w_filewrite,
+                                        self.space.newtext(line))
+
+    def build_record(self, rec, w_fields):
         space = self.space
         fields_w = space.listview(w_fields)
         dialect = self.dialect
-        rec = StringBuilder(80)
         #
         for field_index in range(len(fields_w)):
             w_field = fields_w[field_index]
@@ -46,6 +54,13 @@ class W_Writer(W_Root):
             else:
                 field = space.text_w(space.str(w_field))
             #
+            special_characters = self.special_characters
+            has_special = False
+            for c in special_characters:
+                if field.find(c) >= 0:
+                    has_special = True
+                    break
+            #
             if dialect.quoting == QUOTE_NONNUMERIC:
                 try:
                     space.float_w(w_field)    # is it an int/long/float?
@@ -58,14 +73,13 @@ class W_Writer(W_Root):
                 quoted = True
             elif dialect.quoting == QUOTE_MINIMAL:
                 # Find out if we really quoting
-                special_characters = self.special_characters
-                for c in field:
-                    if c in special_characters:
-                        if c != dialect.quotechar or dialect.doublequote:
-                            quoted = True
-                            break
-                else:
-                    quoted = False
+                quoted = False
+                if has_special:
+                    for c in field:
+                        if c in special_characters:
+                            if c != dialect.quotechar or dialect.doublequote:
+                                quoted = True
+                                break
             else:
                 quoted = False
 
@@ -85,27 +99,10 @@ class W_Writer(W_Root):
                 rec.append(dialect.quotechar)
 
             # Copy field data
-            special_characters = self.special_characters
-            for c in field:
-                if c in special_characters:
-                    if dialect.quoting == QUOTE_NONE:
-                        want_escape = True
-                    else:
-                        want_escape = False
-                        if c == dialect.quotechar:
-                            if dialect.doublequote:
-                                rec.append(dialect.quotechar)
-                            else:
-                                want_escape = True
-                    if want_escape:
-                        if dialect.escapechar == '\0':
-                            raise self.error("need to escape, "
-                                             "but no escapechar set")
-                        rec.append(dialect.escapechar)
-                    else:
-                        assert quoted
-                # Copy field character into record buffer
-                rec.append(c)
+            if not has_special:
+                rec.append(field)
+            else:
+                self._copy_escaped(rec, field, quoted)
 
             # Handle final quote
             if quoted:
@@ -114,22 +111,63 @@ class W_Writer(W_Root):
         # Add line terminator
         rec.append(dialect.lineterminator)
 
-        line = rec.build()
-        return space.call_function(self.w_filewrite, space.newtext(line))
+    def _copy_escaped(self, rec, field, quoted):
+        dialect = self.dialect
+        special_characters = self.special_characters
+        for c in field:
+            if c in special_characters:
+                if dialect.quoting == QUOTE_NONE:
+                    want_escape = True
+                else:
+                    want_escape = False
+                    if c == dialect.quotechar:
+                        if dialect.doublequote:
+                            rec.append(dialect.quotechar)
+                        else:
+                            want_escape = True
+                if want_escape:
+                    if dialect.escapechar == '\0':
+                        raise self.error("need to escape, "
+                                         "but no escapechar set")
+                    rec.append(dialect.escapechar)
+                else:
+                    assert quoted
+            # Copy field character into record buffer
+            rec.append(c)
 
     def writerows(self, w_seqseq):
         """Construct and write a series of sequences to a csv file.
         Non-string elements will be converted to string."""
         space = self.space
         w_iter = space.iter(w_seqseq)
-        while True:
-            try:
-                w_seq = space.next(w_iter)
-            except OperationError as e:
-                if e.match(space, space.w_StopIteration):
-                    break
-                raise
-            self.writerow(w_seq)
+        # the records are collected and written in big pieces instead of
+        # one write() call per record
+        pending = StringBuilder(self.WRITEROWS_BUFFER_SIZE)
+        try:
+            while True:
+                try:
+                    w_seq = space.next(w_iter)
+                except OperationError as e:
+                    if e.match(space, space.w_StopIteration):
+                        break
+                    raise
+                rec = StringBuilder(80)
+                self.build_record(rec, w_seq)
+                pending.append(rec.build())
+                if pending.getlength() >= self.WRITEROWS_BUFFER_SIZE:
+                    data = pending.build()
+                    pending = StringBuilder(self.WRITEROWS_BUFFER_SIZE)
+                    self.write_data(data)
+        except OperationError:
+            # the records before the failing one are still written
+            self.write_data(pending.build())
+            raise
+        self.write_data(pending.build())
+
+    def write_data(self, data):
+        if data:
+            space = self.space
+            space.call_function(self.w_filewrite, space.newtext(data))
 
 
 def csv_writer(space, w_fileobj, w_dialect=None,
@@ -38,6 +38,29 @@ class AppTestReader(object):
         self._read_test(['a,b\nc,d'], 'Error')
         self._read_test(['a,b\r\nc,d'], 'Error')
 
+    def test_read_simple_lines(self):
+        import _csv as csv
+        self._read_test(['a,b,,c\r\n', '\n', ',\n', 'd\te'],
+                        [['a', 'b', '', 'c'], [], ['', ''], ['d\te']])
+        self._read_test(['a\tb\t\n'], [['a', 'b', '']], delimiter='\t')
+        self._read_test(['1,,2.5\n'], [[1.0, '', 2.5]],
+                        quoting=csv.QUOTE_NONNUMERIC)
+        raises(ValueError, self._read_test, ['1,x\n'], [],
+               quoting=csv.QUOTE_NONNUMERIC)
+        self._read_test(['a, b\n'], [['a', 'b']], skipinitialspace=True)
+        self._read_test(['a,b\n\n'], [['a', 'b']])
+        self._read_test(['a,b\n\nc'], 'Error')
+
+    def test_read_simple_lines_field_limit(self):
+        import _csv
+        limit = _csv.field_size_limit(3)
+        try:
+            self._read_test(['abc,d\n'], [['abc', 'd']])
+            self._read_test(['abcd,e\n'], 'Error')
+            self._read_test(['a,bcde'], 'Error')
+        finally:
+            _csv.field_size_limit(limit)
+
     def test_read_escape(self):
         self._read_test(['a,\\b,c'], [['a', 'b', 'c']], escapechar='\\')
         self._read_test(['a,b\\,c'], [['a', 'b,c']], escapechar='\\')
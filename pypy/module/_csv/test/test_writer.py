@@ -85,3 +85,27 @@ class AppTestWriter(object):
 
     def test_writerows(self):
         self._write_test([['a'],['b','c']], 'a\r\nb,c')
+
+    def test_writerows_batched(self):
+        import _csv
+        class Writes(object):
+            def __init__(self):
+                self.parts = []
+            def write(self, data):
+                self.parts.append(data)
+        f = Writes()
+        writer = _csv.writer(f)
+        writer.writerows([['a', 1], ['b,c', None], [2.5]])
+        assert f.parts == ['a,1\r\n"b,c",\r\n2.5\r\n']
+        class Bad(object):
+            def __str__(self):
+                raise ValueError
+        f = Writes()
+        writer = _csv.writer(f)
+        raises(ValueError, writer.writerows, [['a'], ['b', Bad()], ['c']])
+        assert f.parts == ['a\r\n']
+        f = Writes()
+        writer = _csv.writer(f)
+        writer.writerows([['x' * 1000]] * 100)
+        assert len(f.parts) == 2
+        assert ''.join(f.parts) == ('x' * 1000 + '\r\n') * 100
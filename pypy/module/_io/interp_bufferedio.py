@@ -345,6 +345,29 @@ class BufferedMixin:
 
         self._writer_reset_buf()
 
+    def _writer_flush_with_data(self, space, data):
+        """Write the pending part of the buffer followed by 'data' with a
+           single raw write.  Returns how many bytes of 'data' were written;
+           the buffer is fully flushed if that number is not zero."""
+        if self.write_end == -1 or self.write_pos == self.write_end:
+            return 0
+        if self._raw_offset() + (self.pos - self.write_pos) != 0:
+            return 0     # needs a rewind, leave it to the general case
+        pending = self.write_end - self.write_pos
+        try:
+            n = self._write(space,
+                            self.buffer[self.write_pos:self.write_end] + data)
+        except BlockingIOError:
+            return 0     # the general case will report the error
+        if n < pending:
+            self.write_pos += n
+            self.raw_pos = self.write_pos
+            return 0
+        self._writer_reset_buf()
+        self.pos = 0
+        self.raw_pos = 0
+        return n - pending
+
     def _write(self, space, data):
         w_data = space.newbytes(data)
         while True:
@@ -483,6 +506,68 @@ class BufferedMixin:
             self.pos = endpos
             return space.newbytes(data)
 
+    def readinto_w(self, space, w_buffer):
+        self._check_init(space)
+        self._check_closed(space, "readinto of closed file")
+        rwbuffer = space.writebuf_w(w_buffer)
+        length = rwbuffer.getlength()
+
+        # Fast path: the data to read is fully buffered
+        have = self._readahead()
+        if length <= have:
+            endpos = self.pos + length
+            self.output_slice(space, rwbuffer, 0, self.buffer[self.pos:endpos])
+            self.pos = endpos
+            return space.newint(length)
+
+        with self.lock:
+            written = self._readinto_generic(space, rwbuffer, length)
+        if written < 0:
+            return space.w_None
+        return space.newint(written)
+
+    def _readinto_generic(self, space, rwbuffer, length):
+        """Read into the caller's buffer until it is full, or until an EOF
+           occurs or until read() would block.  Returns -1 if nothing could
+           be read because the raw stream would block."""
+        # Must run with the lock held!
+        written = self._readahead()
+        if written > 0:
+            self.output_slice(space, rwbuffer, 0,
+                              self.buffer[self.pos:self.pos + written])
+            self.pos += written
+
+        # We're going past the buffer's bounds, flush it
+        if self.writable:
+            self._flush_and_rewind_unlocked(space)
+        self._reader_reset_buf()
+        self.pos = 0
+
+        while written < length:
+            remaining = length - written
+            try:
+                if remaining >= self.buffer_size:
+                    # Large request: let the raw stream write directly
+                    # into the caller's buffer, without going through ours
+                    size = self._raw_read(space, rwbuffer, written, remaining)
+                else:
+                    size = self._fill_buffer(space)
+                    if size > remaining:
+                        size = remaining
+                    if size > 0:
+                        endpos = self.pos + size
+                        self.output_slice(space, rwbuffer, written,
+                                          self.buffer[self.pos:endpos])
+                        self.pos = endpos
+            except BlockingIOError:
+                if written == 0:
+                    return -1
+                break
+            if size == 0:
+                break
+            written += size
+        return written
+
     def _read_all(self, space):
         "Read all the file, don't update the cache"
         # Must run with the lock held!
@@ -726,7 +811,12 @@ class BufferedMixin:
                     self.write_end = self.pos
                 return space.newint(size)
 
-            # First write the current buffer
+            # First write the current buffer.  A plain writer tries to send
+            # it together with the beginning of the new data, in a single
+            # raw write() call.
+            written = 0
+            if not self.readable:
+                written = self._writer_flush_with_data(space, data)
             try:
                 self._writer_flush_unlocked(space)
             except OperationError as e:
@@ -775,8 +865,7 @@ class BufferedMixin:
                 self.raw_pos -= offset
 
             # Then write buf itself. At this point the buffer has been emptied
-            remaining = size
-            written = 0
+            remaining = size - written
             while remaining > self.buffer_size:
                 try:
                     n = self._write(space, data[written:])
@@ -850,6 +939,7 @@ W_BufferedReader.typedef = TypeDef(
     read = interp2app(W_BufferedReader.read_w),
     peek = interp2app(W_BufferedReader.peek_w),
     read1 = interp2app(W_BufferedReader.read1_w),
+    readinto = interp2app(W_BufferedReader.readinto_w),
     raw = interp_attrproperty_w("w_raw", cls=W_BufferedReader),
     readline = interp2app(W_BufferedReader.readline_w),
 
@@ -1047,6 +1137,7 @@ W_BufferedRandom.typedef = TypeDef(
     read = interp2app(W_BufferedRandom.read_w),
     peek = interp2app(W_BufferedRandom.peek_w),
     read1 = interp2app(W_BufferedRandom.read1_w),
+    readinto = interp2app(W_BufferedRandom.readinto_w),
     readline = interp2app(W_BufferedRandom.readline_w),
 
     write = interp2app(W_BufferedRandom.write_w),
@@ -13,7 +13,9 @@ from rpython.rlib.rbigint import rbigint
 from rpython.rlib.rstring import StringBuilder
 from rpython.rlib.rutf8 import (check_utf8, next_codepoint_pos,
                                 codepoints_in_utf8, codepoints_in_utf8,
-                                Utf8StringBuilder)
+                                Utf8StringBuilder, CheckError)
+from pypy.interpreter.unicodehelper import (
+    decode_error_handler, str_decode_ascii, str_decode_utf8)
 
 
 STATE_ZERO, STATE_OK, STATE_DETACHED = range(3)
@@ -81,12 +83,18 @@ class W_IncrementalNewlineDecoder(W_Root):
             raise oefmt(space.w_TypeError,
                         "decoder should return a string result")
 
-        output, output_len = space.utf8_len_w(w_output)
+        output, lgt = space.utf8_len_w(w_output)
+        return self.translate_utf8(space, output, lgt, bool(final))
+
+    def translate_utf8(self, space, output, lgt, final):
+        """Newline handling of decode(), for already-decoded utf-8 text
+        of 'lgt' codepoints."""
         output_len = len(output)
         if self.pendingcr and (final or output_len):
             output = '\r' + output
             self.pendingcr = False
             output_len += 1
+            lgt += 1
 
         # retain last \r even when not translating data:
         # then readline() is sure to get \r\n in one pass
@@ -97,6 +105,7 @@ class W_IncrementalNewlineDecoder(W_Root):
                 output = output[:last]
                 self.pendingcr = True
                 output_len -= 1
+                lgt -= 1
 
         if output_len == 0:
             return space.newutf8("", 0)
@@ -146,9 +155,9 @@ class W_IncrementalNewlineDecoder(W_Root):
                     continue
                 builder.append(c)
             output = builder.build()
+            lgt = check_utf8(output, True)
 
         self.seennl |= seennl
-        lgt = check_utf8(output, True)
         return space.newutf8(output, lgt)
 
     def reset_w(self, space):
@@ -376,6 +385,13 @@ class DecodeBuffer(object):
         # Universal newline search. Find any of \r, \r\n, \n
         # The decoder ensures that \r\n are not split in two pieces
         if limit < 0:
+            # skip quickly over the bytes that cannot end a line
+            pos = self.pos
+            text = self.text
+            while pos < len(text) and text[pos] != '\n' and text[pos] != '\r':
+                pos += 1
+            self.upos += codepoints_in_utf8(text, self.pos, pos)
+            self.pos = pos
             limit = sys.maxint
         scanned = 0
         while scanned < limit:
@@ -443,9 +459,20 @@ class DecodeBuffer(object):
                 return False
 
         if limit < 0:
-            limit = sys.maxint
-        # XXX it might be better to search for the marker quickly, then compute
-        # the new upos afterwards.
+            # an ascii marker is never part of a larger utf-8 char, search
+            # for it on the bytes and count the codepoints afterwards
+            pos = self.pos
+            assert pos >= 0
+            end = self.text.find(marker, pos)
+            found = end >= 0
+            if found:
+                end += 1
+            else:
+                end = len(self.text)
+            self.upos += codepoints_in_utf8(self.text, pos, end)
+            self.pos = end
+            return found
+
         scanned = 0
         while scanned < limit:
             # don't use next_char here, since that computes a slice etc
@@ -465,6 +492,8 @@ class DecodeBuffer(object):
         self.upos += 1
 
 
+FAST_CODECS = ['utf-8', 'ascii']
+
 def check_decoded(space, w_decoded):
     if not space.isinstance_w(w_decoded, space.w_unicode):
         msg = "decoder should return a string result, not '%T'"
@@ -480,6 +509,11 @@ class W_TextIOWrapper(W_TextIOBase):
         self.w_decoder = None
 
         self.decoded = DecodeBuffer()
+        self.fast_codec = None      # 'utf-8' or 'ascii' if we decode
+                                    # ourselves instead of calling the
+                                    # codec's incremental decoder
+        self.pending_input = ""     # incomplete utf-8 sequence at the end
+                                    # of the input given to _decode()
         self.pending_bytes = None   # list of bytes objects waiting to be
                                     # written, or NULL
         self.chunk_size = 8192
@@ -529,11 +563,19 @@ class W_TextIOWrapper(W_TextIOBase):
             self.writenl = None
 
         # build the decoder object
+        self.fast_codec = None
+        self.pending_input = ""
         if space.is_true(space.call_method(w_buffer, "readable")):
             w_codec = interp_codecs.lookup_codec(space,
                                                  space.text_w(self.w_encoding))
             self.w_decoder = space.call_method(w_codec,
                                                "incrementaldecoder", w_errors)
+            # for strict utf-8 and ascii, _decode() bypasses the decoder
+            codec_name = space.text_w(space.getattr(w_codec,
+                                                    space.newtext("name")))
+            if (codec_name in FAST_CODECS and
+                    space.eq_w(w_errors, space.newtext("strict"))):
+                self.fast_codec = codec_name
             if self.readuniversal:
                 self.w_decoder = space.call_function(
                     space.gettypeobject(W_IncrementalNewlineDecoder.typedef),
@@ -647,6 +689,40 @@ class W_TextIOWrapper(W_TextIOBase):
     # _____________________________________________________________
     # read methods
 
+    def _decode(self, space, w_input, final):
+        if self.fast_codec is None:
+            return space.call_method(self.w_decoder, "decode",
+                                     w_input, space.newbool(final))
+        return self._decode_fast(space, space.bytes_w(w_input), final)
+
+    def _decode_fast(self, space, input, final):
+        """Same result as self.w_decoder.decode(), for strict utf-8 and
+        ascii, without going through the codec's incremental decoder.
+        An incomplete utf-8 sequence at the end of 'input' is kept in
+        self.pending_input; the codec's own decoder is never fed, so
+        its buffer stays empty."""
+        if self.pending_input:
+            input = self.pending_input + input
+            self.pending_input = ""
+        errorhandler = decode_error_handler(space)
+        if self.fast_codec == 'ascii':
+            output, _, lgt = str_decode_ascii(input, 'strict', final,
+                                              errorhandler)
+        else:
+            try:
+                lgt = check_utf8(input, True)
+                output = input
+            except CheckError:
+                output, consumed, lgt = str_decode_utf8(input, 'strict',
+                                                        final, errorhandler)
+                if consumed < len(input):
+                    self.pending_input = input[consumed:]
+        if self.readuniversal:
+            w_decoder = self.w_decoder
+            assert isinstance(w_decoder, W_IncrementalNewlineDecoder)
+            return w_decoder.translate_utf8(space, output, lgt, final)
+        return space.newutf8(output, lgt)
+
     def _read_chunk(self, space):
         """Read and decode the next chunk of data from the BufferedReader.
         The return value is True unless EOF was reached.  The decoded string
@@ -667,7 +743,7 @@ class W_TextIOWrapper(W_TextIOBase):
             # Given this, we know there was a valid snapshot point
             # len(dec_buffer) bytes ago with decoder state (b'', dec_flags).
             w_dec_buffer, w_dec_flags = space.unpackiterable(w_state, 2)
-            dec_buffer = space.bytes_w(w_dec_buffer)
+            dec_buffer = self.pending_input + space.bytes_w(w_dec_buffer)
             dec_flags = space.int_w(w_dec_flags)
         else:
             dec_buffer = None
@@ -683,8 +759,7 @@ class W_TextIOWrapper(W_TextIOBase):
             raise oefmt(space.w_TypeError, msg, w_input)
 
         eof = space.len_w(w_input) == 0
-        w_decoded = space.call_method(self.w_decoder, "decode",
-                                      w_input, space.newbool(eof))
+        w_decoded = self._decode(space, w_input, eof)
         self.decoded.set(space, w_decoded)
         if space.len_w(w_decoded) > 0:
             eof = False
@@ -732,7 +807,7 @@ class W_TextIOWrapper(W_TextIOBase):
         if size < 0:
             # Read everything
             w_bytes = space.call_method(self.w_buffer, "read")
-            w_decoded = space.call_method(self.w_decoder, "decode", w_bytes, space.w_True)
+            w_decoded = self._decode(space, w_bytes, True)
             check_decoded(space, w_decoded)
             chars, lgt = self.decoded.get_chars(-1)
             w_result = space.newutf8(chars, lgt)
@@ -755,15 +830,14 @@ class W_TextIOWrapper(W_TextIOBase):
         return space.newutf8(builder.build(), builder.getlength())
 
     def _scan_line_ending(self, limit):
-        if self.readuniversal:
+        if self.readtranslate:
+            # Newlines are already translated, only search for \n
+            return self.decoded.find_char('\n', limit)
+        elif self.readuniversal:
             return self.decoded.find_newline_universal(limit)
         else:
-            if self.readtranslate:
-                # Newlines are already translated, only search for \n
-                newline = '\n'
-            else:
-                # Non-universal mode.
-                newline = self.readnl
+            # Non-universal mode.
+            newline = self.readnl
             if newline == '\r\n':
                 return self.decoded.find_crlf(limit)
             else:
@@ -976,6 +1050,7 @@ class W_TextIOWrapper(W_TextIOBase):
             space.call_method(self, "flush")
             self.decoded.reset()
             self.snapshot = None
+            self.pending_input = ""
             if self.w_decoder:
                 space.call_method(self.w_decoder, "reset")
             return space.call_method(self.w_buffer, "seek",
@@ -1001,6 +1076,7 @@ class W_TextIOWrapper(W_TextIOBase):
 
         self.decoded.reset()
         self.snapshot = None
+        self.pending_input = ""
 
         # Restore the decoder to its state from the safe start point.
         if self.w_decoder:
@@ -1018,8 +1094,7 @@ class W_TextIOWrapper(W_TextIOBase):
             self.snapshot = PositionSnapshot(cookie.dec_flags,
                                              space.bytes_w(w_chunk))
 
-            w_decoded = space.call_method(self.w_decoder, "decode",
-                                          w_chunk, space.newbool(bool(cookie.need_eof)))
+            w_decoded = self._decode(space, w_chunk, bool(cookie.need_eof))
             w_decoded = check_decoded(space, w_decoded)
 
             # Skip chars_to_skip of the decoded characters
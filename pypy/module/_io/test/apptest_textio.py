@@ -405,3 +405,43 @@ def test_newlines2():
     for ch in msg:
         decoded += decoder.decode(ch)
     assert set(decoder.newlines) == {"\r", "\n", "\r\n"}
+
+def test_utf8_lines_split_chunks():
+    data = u"\xe9t\xe9\r\n€\rz\U0001f600\n\nend".encode("utf-8")
+    for newline in [None, "", "\n", "\r", "\r\n"]:
+        expected = _io.TextIOWrapper(_io.BytesIO(data), encoding="latin-1",
+                                     newline=newline).readlines()
+        expected = [line.encode("latin-1").decode("utf-8")
+                    for line in expected]
+        for chunk_size in range(1, 8):
+            t = _io.TextIOWrapper(_io.BytesIO(data), encoding="utf-8",
+                                  newline=newline)
+            t._CHUNK_SIZE = chunk_size
+            assert list(t) == expected
+
+def test_utf8_tell_seek_incomplete_char():
+    data = u"ab€\ncd\xe9\n".encode("utf-8")
+    t = _io.TextIOWrapper(_io.BytesIO(data), encoding="utf-8")
+    t._CHUNK_SIZE = 3
+    assert t.read(3) == u"ab€"
+    pos = t.tell()
+    assert t.readline() == u"\n"
+    assert t.read() == u"cd\xe9\n"
+    t.seek(pos)
+    assert t.read() == u"\ncd\xe9\n"
+    t.seek(0)
+    assert t.read(2) == u"ab"
+    assert t.tell() == 2
+
+def test_utf8_ascii_strict_errors():
+    t = _io.TextIOWrapper(_io.BytesIO(b"abc\n\xff\n"), encoding="utf-8")
+    raises(UnicodeDecodeError, t.readline)
+    t = _io.TextIOWrapper(_io.BytesIO(b"abc\xe2\x82"), encoding="utf-8")
+    exc = raises(UnicodeDecodeError, t.read)
+    assert exc.value.encoding.replace("-", "") == "utf8"
+    t = _io.TextIOWrapper(_io.BytesIO(b"abc\n\xe9\n"), encoding="ascii")
+    exc = raises(UnicodeDecodeError, t.readline)
+    assert exc.value.encoding == "ascii"
+    t = _io.TextIOWrapper(_io.BytesIO(b"abc\n\xe9\n"), encoding="utf-8",
+                          errors="replace")
+    assert t.read() == u"abc\n�\n"
@@ -169,6 +169,41 @@ class AppTestBufferedReader:
         assert f.readinto(a) == 99
         assert a == '\nb\nc' + 'a\nb\nc' * 19 + 'x' * 100
 
+    def test_readinto_bypass(self):
+        import _io
+        class RecordingFileIO(_io.FileIO):
+            def readinto(self, b):
+                sizes.append(len(b))
+                return _io.FileIO.readinto(self, b)
+        sizes = []
+        raw = RecordingFileIO(self.bigtmpfile)
+        f = _io.BufferedReader(raw, 16)
+        assert f.read(2) == 'a\n'
+        a = bytearray(40)
+        assert f.readinto(a) == 40
+        assert a == ('a\nb\nc' * 9)[2:42]
+        # 14 bytes come from the buffer, the rest is read directly into 'a'
+        assert sizes == [16, 26]
+        a = bytearray(5)
+        assert f.readinto(a) == 5
+        assert a == ('a\nb\nc' * 20)[42:47]
+        assert sizes == [16, 26, 16]
+        assert f.tell() == 47
+        a = bytearray(100)
+        assert f.readinto(a) == 53
+        assert a[:53] == ('a\nb\nc' * 20)[47:]
+        assert f.readinto(a) == 0
+        f.close()
+
+    def test_readinto_memoryview(self):
+        import _io
+        raw = _io.FileIO(self.bigtmpfile)
+        f = _io.BufferedReader(raw, 8)
+        a = bytearray('x' * 30)
+        assert f.readinto(memoryview(a)[10:]) == 20
+        assert a == 'x' * 10 + ('a\nb\nc' * 4)
+        f.close()
+
     def test_seek(self):
         import _io
         raw = _io.FileIO(self.tmpfile)
@@ -329,6 +364,25 @@ class AppTestBufferedWriter:
         f.close()
         assert self.readfile() == "abcd" * 5000
 
+    def test_largewrite_single_raw_write(self):
+        import _io
+        class RecordingFileIO(_io.FileIO):
+            def write(self, b):
+                sizes.append(len(b))
+                return _io.FileIO.write(self, b)
+        sizes = []
+        raw = RecordingFileIO(self.tmpfile, 'w')
+        f = _io.BufferedWriter(raw, 16)
+        f.write("x" * 10)
+        f.write("y" * 40)
+        # the pending bytes go out together with the new data
+        assert sizes == [50]
+        f.write("z" * 10)
+        f.write("w" * 10)
+        assert sizes == [50, 20]
+        f.close()
+        assert self.readfile() == "x" * 10 + "y" * 40 + "z" * 10 + "w" * 10
+
     def test_incomplete(self):
         import _io
         raw = _io.FileIO(self.tmpfile)
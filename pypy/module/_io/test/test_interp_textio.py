@@ -57,6 +57,35 @@ def test_readline(space, data, mode):
             break
     assert txt.startswith(u''.join(lines))
 
+@given(data=st_readline(),
+       mode=st.sampled_from([None, '\r', '\n', '\r\n', '']),
+       chunk_size=st.integers(min_value=1, max_value=10))
+@settings(deadline=None, database=None)
+def test_readline_fast_codec(space, data, mode, chunk_size):
+    txt, limits = data
+    txt = txt.encode('utf-8', 'replace').decode('utf-8')   # no surrogates
+    w_stream = W_BytesIO(space)
+    w_stream.descr_init(space, space.newbytes(txt.encode('utf-8')))
+    w_textio = W_TextIOWrapper(space)
+    w_newline = space.w_None if mode is None else space.newtext(mode)
+    w_textio.descr_init(space, w_stream, encoding='utf-8',
+                        w_newline=w_newline)
+    assert w_textio.fast_codec == 'utf-8'
+    w_textio.chunk_size = chunk_size
+    lines = []
+    while True:
+        w_line = w_textio.readline_w(space, space.newint(-1))
+        line = space.utf8_w(w_line).decode('utf-8')
+        if not line:
+            break
+        lines.append(line)
+    if mode is None:
+        txt = txt.replace(u'\r\n', u'\n').replace(u'\r', u'\n')
+    assert u''.join(lines) == txt
+    if mode is None:
+        for line in lines[:-1]:
+            assert line.index(u'\n') == len(line) - 1
+
 @given(st.text())
 def test_read_buffer(text):
     buf = DecodeBuffer(text.encode('utf8'), len(text))
@@ -0,0 +1,20 @@
+def iterload(source, chunk_size=65536):
+    """Iterate over the JSON values in 'source', which can be a file-like
+    object, a str, or an iterable of str chunks (e.g. the lines of a
+    newline-delimited JSON file).  The values must be separated by
+    whitespace if they are not lists, dicts or strings.
+    """
+    from _pypyjson import StreamDecoder
+    decoder = StreamDecoder()
+    read = getattr(source, 'read', None)
+    if read is not None:
+        chunks = iter(lambda: read(chunk_size), '')
+    elif isinstance(source, basestring):
+        chunks = [source]
+    else:
+        chunks = source
+    for chunk in chunks:
+        for value in decoder.feed(chunk):
+            yield value
+    for value in decoder.finish():
+        yield value
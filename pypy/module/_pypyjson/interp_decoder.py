@@ -4,9 +4,11 @@ from rpython.rlib.objectmodel import specialize, always_inline
 from rpython.rlib import rfloat, runicode, jit, objectmodel, rutf8
 from rpython.rtyper.lltypesystem import lltype, rffi
 from rpython.rlib.rarithmetic import r_uint
-from pypy.interpreter.error import oefmt
+from pypy.interpreter.error import OperationError, oefmt
 from pypy.interpreter import unicodehelper
 from pypy.interpreter.baseobjspace import W_Root
+from pypy.interpreter.gateway import interp2app
+from pypy.interpreter.typedef import TypeDef
 from pypy.module._pypyjson import simd
 
 OVF_DIGITS = len(str(sys.maxint))
@@ -76,18 +78,12 @@ class JSONDecoder(W_Root):
     def __init__(self, space, s):
         self.space = space
         self.w_empty_string = space.newutf8("", 0)
-
-        self.s = s
-
-        # we put our string in a raw buffer so:
-        # 1) we automatically get the '\0' sentinel at the end of the string,
-        #    which means that we never have to check for the "end of string"
-        # 2) we can pass the buffer directly to strtod
-        self.ll_chars, self.llobj, self.flag = rffi.get_nonmovingbuffer_ll_final_null(self.s)
-        self.end_ptr = lltype.malloc(rffi.CCHARPP.TO, 1, flavor='raw')
-        self.pos = 0
         self.intcache = space.fromcache(IntCache)
 
+        # the total size of all the strings decoded so far, see
+        # MIN_SIZE_FOR_STRING_CACHE
+        self.total_size = 0
+
         # two caches, one for keys, one for general strings. they both have the
         # form {hash-as-int: StringCacheEntry} and they don't deal with
         # collisions at all. For every hash there is simply one string stored
@@ -112,6 +108,23 @@ class JSONDecoder(W_Root):
         # object, before they get copied into the eventual dict
         self.scratch = [[None] * self.DEFAULT_SIZE_SCRATCH]
 
+        self.set_buffer(s)
+
+    def set_buffer(self, s):
+        """ Start decoding the string s. Must be followed by a call to
+        close(), after which the same decoder can be given another string:
+        the caches are kept, which helps a lot when decoding a stream of
+        similar documents. """
+        self.s = s
+        self.total_size += len(s)
+
+        # we put our string in a raw buffer so:
+        # 1) we automatically get the '\0' sentinel at the end of the string,
+        #    which means that we never have to check for the "end of string"
+        # 2) we can pass the buffer directly to strtod
+        self.ll_chars, self.llobj, self.flag = rffi.get_nonmovingbuffer_ll_final_null(self.s)
+        self.end_ptr = lltype.malloc(rffi.CCHARPP.TO, 1, flavor='raw')
+        self.pos = 0
 
     def close(self):
         rffi.free_nonmovingbuffer_ll(self.ll_chars, self.llobj, self.flag)
@@ -121,6 +134,7 @@ class JSONDecoder(W_Root):
             jsonmap = self._get_jsonmap_from_dict(w_obj)
             if jsonmap.is_state_blocked():
                 self._devolve_jsonmap_dict(w_obj)
+        self.unclear_objects = []
 
     def getslice(self, start, end):
         assert start >= 0
@@ -569,7 +583,7 @@ class JSONDecoder(W_Root):
             contextmap.decoded_strings += 1
             if not contextmap.should_cache_strings():
                 cache = False
-        if len(self.s) < self.MIN_SIZE_FOR_STRING_CACHE:
+        if self.total_size < self.MIN_SIZE_FOR_STRING_CACHE:
             cache = False
 
         if not cache:
@@ -1195,3 +1209,169 @@ def loads(space, w_s):
     finally:
         decoder.close()
 
+
+
+# states of the scanner of W_StreamDecoder
+SCAN_OUTSIDE = 0          # between values, or inside a list or a dict
+SCAN_STRING = 1
+SCAN_STRING_ESCAPE = 2    # right after a backslash in a string
+SCAN_SCALAR = 3           # in a number or a constant at the top level
+
+class W_StreamDecoder(W_Root):
+    """ Decodes a stream of JSON values that arrives in arbitrary chunks,
+    e.g. newline-delimited JSON. The input is cut after the last complete
+    top-level value of what has been fed so far, and all the complete
+    values are then decoded by the same JSONDecoder, which keeps its caches
+    from one chunk to the next: objects with the same keys share their map
+    across the whole stream. """
+
+    def __init__(self, space):
+        self.space = space
+        self.decoder = None
+        # the chunks fed so far that are not decoded yet. They are only
+        # joined once they contain a complete value, so that a large value
+        # fed in many chunks is not copied again and again
+        self.chunks = []
+        self.pending_length = 0
+        # the scanner looks for the end of complete top-level values.
+        # self.ends are their ends, as positions in the pending data
+        self.ends = []
+        self.depth = 0
+        self.state = SCAN_OUTSIDE
+
+    def scan(self, s):
+        offset = self.pending_length
+        ends = self.ends
+        depth = self.depth
+        state = self.state
+        i = 0
+        while i < len(s):
+            ch = s[i]
+            if state == SCAN_STRING:
+                if ch == '\\':
+                    state = SCAN_STRING_ESCAPE
+                elif ch == '"':
+                    state = SCAN_OUTSIDE
+                    if depth == 0:
+                        ends.append(offset + i + 1)
+            elif state == SCAN_STRING_ESCAPE:
+                state = SCAN_STRING
+            elif state == SCAN_SCALAR:
+                if is_whitespace(ch) or ch == '"' or ch == '[' or ch == '{':
+                    state = SCAN_OUTSIDE
+                    ends.append(offset + i)
+                    continue
+            elif ch == '"':
+                state = SCAN_STRING
+            elif ch == '[' or ch == '{':
+                depth += 1
+            elif ch == ']' or ch == '}':
+                # unbalanced brackets are reported by the decoder
+                depth -= 1
+                if depth <= 0:
+                    depth = 0
+                    ends.append(offset + i + 1)
+            elif depth == 0 and not is_whitespace(ch):
+                state = SCAN_SCALAR
+            i += 1
+        self.depth = depth
+        self.state = state
+        if s:
+            self.chunks.append(s)
+            self.pending_length += len(s)
+
+    def consume(self, data, end):
+        """ Drop the first 'end' characters of the pending data, which
+        are 'data' joined. """
+        assert end >= 0
+        if end < len(data):
+            self.chunks = [data[end:]]
+        else:
+            self.chunks = []
+        self.pending_length -= end
+        self.ends = [pos - end for pos in self.ends if pos > end]
+
+    def decode_complete(self):
+        """ Decode the complete values. If one of them is invalid, the
+        values before it are returned, and the error is raised by the next
+        call, which then drops the invalid value. """
+        space = self.space
+        if not self.ends:
+            return space.newlist([])
+        if len(self.chunks) == 1:
+            data = self.chunks[0]
+        else:
+            data = "".join(self.chunks)
+        end = self.ends[-1]
+        assert end >= 0
+        s = data[:end]
+        if self.decoder is None:
+            self.decoder = JSONDecoder(space, s)
+        else:
+            self.decoder.set_buffer(s)
+        decoder = self.decoder
+        values_w = []
+        i = 0
+        try:
+            i = decoder.skip_whitespace(0)
+            while i < len(s):
+                values_w.append(decoder.decode_any(i))
+                i = decoder.skip_whitespace(decoder.pos)
+        except OperationError:
+            if values_w:
+                end = i     # keep the invalid value for the next call
+            else:
+                # drop the invalid value, up to the end found by the scanner
+                for pos in self.ends:
+                    if pos > i:
+                        end = pos
+                        break
+                self.consume(data, end)
+                raise
+        finally:
+            decoder.close()
+        self.consume(data, end)
+        return space.newlist(values_w)
+
+    @jit.dont_look_inside
+    def feed_w(self, w_data):
+        """ feed(data) -> list
+
+        Add a chunk of utf8-encoded JSON text and return the list of the
+        top-level values that it completes. """
+        space = self.space
+        if space.isinstance_w(w_data, space.w_unicode):
+            raise oefmt(space.w_TypeError,
+                        "Expected utf8-encoded str, got unicode")
+        self.scan(space.bytes_w(w_data))
+        return self.decode_complete()
+
+    @jit.dont_look_inside
+    def finish_w(self):
+        """ finish() -> list
+
+        Mark the end of the stream and return the list of the remaining
+        values. Raises ValueError if the stream ends in the middle of a
+        value. """
+        if self.pending_length > 0 and (not self.ends or
+                                        self.ends[-1] < self.pending_length):
+            self.ends.append(self.pending_length)
+        self.depth = 0
+        self.state = SCAN_OUTSIDE
+        return self.decode_complete()
+
+
+def W_StreamDecoder___new__(space, w_subtype):
+    w_res = space.allocate_instance(W_StreamDecoder, w_subtype)
+    W_StreamDecoder.__init__(space.interp_w(W_StreamDecoder, w_res), space)
+    return w_res
+
+W_StreamDecoder.typedef = TypeDef(
+    '_pypyjson.StreamDecoder',
+    __new__ = interp2app(W_StreamDecoder___new__),
+    feed = interp2app(W_StreamDecoder.feed_w),
+    finish = interp2app(W_StreamDecoder.finish_w),
+    __doc__ = """StreamDecoder() -> new decoder for a stream of JSON values
+
+Feed it chunks of the stream, in any size, with feed(), and call
+finish() at the end of the stream.""")
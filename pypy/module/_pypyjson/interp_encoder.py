@@ -1,6 +1,13 @@
+import math
+
 from rpython.rlib.rstring import StringBuilder
 from rpython.rlib import rutf8
 from pypy.interpreter import unicodehelper
+from pypy.interpreter.error import OperationError, oefmt
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.objspace.std.dictmultiobject import W_DictMultiObject
+from pypy.objspace.std.floatobject import float_repr
+from pypy.objspace.std.listobject import W_ListObject
 
 
 HEX = '0123456789abcdef'
@@ -16,34 +23,26 @@ ESCAPE_BEFORE_SPACE = [ESCAPE_DICT.get(chr(_i), '\\u%04x' % _i)
                        for _i in range(32)]
 
 
-def raw_encode_basestring_ascii(space, w_string):
-    if space.isinstance_w(w_string, space.w_bytes):
-        s = space.bytes_w(w_string)
-        for i in range(len(s)):
-            c = s[i]
-            if c >= ' ' and c <= '~' and c != '"' and c != '\\':
-                pass
-            else:
-                first = i
-                break
+def _find_unsafe_char(s):
+    for i in range(len(s)):
+        c = s[i]
+        if c >= ' ' and c <= '~' and c != '"' and c != '\\':
+            pass
         else:
-            # the input is a string with only non-special ascii chars
-            return w_string
+            return i
+    return len(s)
 
+def _encode_ascii_into(space, sb, s, is_bytes):
+    """Append 's' to 'sb' with the escapes of JSON, using only ascii
+    characters.  's' is either the content of a str (is_bytes=True), which
+    must be valid utf-8, or the utf-8 content of a unicode.
+    """
+    first = _find_unsafe_char(s)
+    sb.append_slice(s, 0, first)
+    if first == len(s):
+        return
+    if is_bytes:
         unicodehelper.check_utf8_or_raise(space, s)
-        sb = StringBuilder(len(s))
-        sb.append_slice(s, 0, first)
-    else:
-        # We used to check if 'u' contains only safe characters, and return
-        # 'w_string' directly.  But this requires an extra pass over all
-        # characters, and the expected use case of this function, from
-        # json.encoder, will anyway re-encode a unicode result back to
-        # a string (with the ascii encoding).  This requires two passes
-        # over the characters.  So we may as well directly turn it into a
-        # string here --- only one pass.
-        s = space.utf8_w(w_string)
-        sb = StringBuilder(len(s))
-        first = 0
 
     it = rutf8.Utf8StringIterator(s)
     for i in range(first):
@@ -77,5 +76,320 @@ def raw_encode_basestring_ascii(space, w_string):
                 sb.append(HEX[(s2 >> 4) & 0x0f])
                 sb.append(HEX[s2 & 0x0f])
 
+def _encode_into(sb, s):
+    """Append 's' to 'sb', only escaping '"', '\\' and the control
+    characters, like json.encoder.raw_encode_basestring().  Returns False
+    if 's' contains non-ascii bytes.
+    """
+    is_ascii = True
+    start = 0
+    for i in range(len(s)):
+        c = s[i]
+        if c == '"' or c == '\\' or c < ' ':
+            sb.append_slice(s, start, i)
+            if c < ' ':
+                sb.append(ESCAPE_BEFORE_SPACE[ord(c)])
+            else:
+                sb.append('\\')
+                sb.append(c)
+            start = i + 1
+        elif c >= '\x80':
+            is_ascii = False
+    sb.append_slice(s, start, len(s))
+    return is_ascii
+
+
+def raw_encode_basestring_ascii(space, w_string):
+    if space.isinstance_w(w_string, space.w_bytes):
+        s = space.bytes_w(w_string)
+        if _find_unsafe_char(s) == len(s):
+            # the input is a string with only non-special ascii chars
+            return w_string
+        is_bytes = True
+    else:
+        # We used to check if 'u' contains only safe characters, and return
+        # 'w_string' directly.  But this requires an extra pass over all
+        # characters, and the expected use case of this function, from
+        # json.encoder, will anyway re-encode a unicode result back to
+        # a string (with the ascii encoding).  This requires two passes
+        # over the characters.  So we may as well directly turn it into a
+        # string here --- only one pass.
+        s = space.utf8_w(w_string)
+        is_bytes = False
+    sb = StringBuilder(len(s))
+    _encode_ascii_into(space, sb, s, is_bytes)
     res = sb.build()
     return space.newtext(res)
+
+
+class JSONEncoder(object):
+    """Writes the JSON text of an object into a StringBuilder, like the
+    app-level json.encoder.JSONEncoder.encode() with the same options.
+    """
+
+    def __init__(self, space, w_default, ensure_ascii, check_circular,
+                 allow_nan, sort_keys, indent, item_separator,
+                 key_separator, skipkeys):
+        self.space = space
+        self.w_default = w_default
+        self.ensure_ascii = ensure_ascii
+        self.allow_nan = allow_nan
+        self.sort_keys = sort_keys
+        self.indent = indent          # -1 for None
+        self.item_separator = item_separator
+        self.key_separator = key_separator
+        self.skipkeys = skipkeys
+        if check_circular:
+            self.markers = {}
+        else:
+            self.markers = None
+        self.builder = StringBuilder()
+        # with ensure_ascii=False, the result is a unicode if any of the
+        # strings is a unicode, which fails if another one is a non-ascii str
+        self.is_unicode = False
+        self.w_nonascii_bytes = None
+
+    def build(self):
+        space = self.space
+        s = self.builder.build()
+        if not self.is_unicode:
+            return space.newbytes(s)
+        if self.w_nonascii_bytes is not None:
+            # raises UnicodeDecodeError, like the app-level version
+            space.call_method(self.w_nonascii_bytes, 'decode',
+                              space.newtext('ascii'))
+        return space.newutf8(s, rutf8.codepoints_in_utf8(s))
+
+    def mark(self, w_obj):
+        markers = self.markers
+        if markers is not None:
+            if w_obj in markers:
+                raise oefmt(self.space.w_ValueError,
+                            "Circular reference detected")
+            markers[w_obj] = None
+
+    def unmark(self, w_obj):
+        markers = self.markers
+        if markers is not None:
+            del markers[w_obj]
+
+    def encode(self, w_obj, level):
+        space = self.space
+        if space.isinstance_w(w_obj, space.w_basestring):
+            self.encode_string(w_obj)
+        elif space.is_w(w_obj, space.w_None):
+            self.builder.append('null')
+        elif space.is_w(w_obj, space.w_True):
+            self.builder.append('true')
+        elif space.is_w(w_obj, space.w_False):
+            self.builder.append('false')
+        elif (space.isinstance_w(w_obj, space.w_int) or
+                space.isinstance_w(w_obj, space.w_long)):
+            self.builder.append(self.int_repr(w_obj))
+        elif space.isinstance_w(w_obj, space.w_float):
+            self.builder.append(self.float_repr(w_obj))
+        elif (space.isinstance_w(w_obj, space.w_list) or
+                space.isinstance_w(w_obj, space.w_tuple)):
+            self.encode_list(w_obj, level)
+        elif space.isinstance_w(w_obj, space.w_dict):
+            self.encode_dict(w_obj, level)
+        else:
+            self.mark(w_obj)
+            w_res = space.call_function(self.w_default, w_obj)
+            self.encode(w_res, level)
+            self.unmark(w_obj)
+
+    def encode_string(self, w_string):
+        space = self.space
+        if space.isinstance_w(w_string, space.w_unicode):
+            if not self.ensure_ascii:
+                self.is_unicode = True
+            self.encode_raw_string(space.utf8_w(w_string), False)
+        elif not self.encode_raw_string(space.bytes_w(w_string), True):
+            if self.w_nonascii_bytes is None:
+                self.w_nonascii_bytes = w_string
+
+    def encode_raw_string(self, s, is_bytes):
+        """Returns False for a non-ascii str with ensure_ascii=False."""
+        sb = self.builder
+        sb.append('"')
+        is_ascii = True
+        if self.ensure_ascii:
+            _encode_ascii_into(self.space, sb, s, is_bytes)
+        else:
+            is_ascii = _encode_into(sb, s)
+        sb.append('"')
+        return is_ascii
+
+    def int_repr(self, w_int):
+        space = self.space
+        if space.is_w(space.type(w_int), space.w_int):
+            return str(space.int_w(w_int))
+        return space.text_w(space.str(w_int))
+
+    def float_repr(self, w_float):
+        x = self.space.float_w(w_float)
+        if math.isnan(x):
+            text = 'NaN'
+        elif math.isinf(x):
+            text = 'Infinity' if x > 0.0 else '-Infinity'
+        else:
+            return float_repr(x)
+        if not self.allow_nan:
+            raise oefmt(self.space.w_ValueError,
+                        "Out of range float values are not JSON compliant: "
+                        "%R", w_float)
+        return text
+
+    def emit_indent(self, level):
+        if self.indent < 0:
+            return self.item_separator, level
+        level += 1
+        newline_indent = '\n' + ' ' * (self.indent * level)
+        self.builder.append(newline_indent)
+        return self.item_separator + newline_indent, level
+
+    def emit_unindent(self, level):
+        if self.indent >= 0:
+            self.builder.append('\n')
+            self.builder.append(' ' * (self.indent * (level - 1)))
+
+    def encode_list(self, w_list, level):
+        space = self.space
+        sb = self.builder
+        if not space.is_true(w_list):
+            sb.append('[]')
+            return
+        self.mark(w_list)
+        sb.append('[')
+        separator, level = self.emit_indent(level)
+        w_type = space.type(w_list)
+        if space.is_w(w_type, space.w_list):
+            # a list can be changed by the 'default' function
+            assert isinstance(w_list, W_ListObject)
+            i = 0
+            while i < w_list.length():
+                if i > 0:
+                    sb.append(separator)
+                self.encode(w_list.getitem(i), level)
+                i += 1
+        elif space.is_w(w_type, space.w_tuple):
+            first = True
+            for w_item in space.fixedview(w_list):
+                if first:
+                    first = False
+                else:
+                    sb.append(separator)
+                self.encode(w_item, level)
+        else:
+            w_iter = space.iter(w_list)
+            first = True
+            while True:
+                try:
+                    w_item = space.next(w_iter)
+                except OperationError as e:
+                    if not e.match(space, space.w_StopIteration):
+                        raise
+                    break
+                if first:
+                    first = False
+                else:
+                    sb.append(separator)
+                self.encode(w_item, level)
+        self.emit_unindent(level)
+        sb.append(']')
+        self.unmark(w_list)
+
+    def encode_dict(self, w_dict, level):
+        space = self.space
+        sb = self.builder
+        if not space.is_true(w_dict):
+            sb.append('{}')
+            return
+        self.mark(w_dict)
+        sb.append('{')
+        separator, level = self.emit_indent(level)
+        first = True
+        if self.sort_keys:
+            w_keys = space.call_method(w_dict, 'keys')
+            space.call_method(w_keys, 'sort')
+            for w_key in space.listview(w_keys):
+                w_value = space.getitem(w_dict, w_key)
+                first = self.encode_item(w_key, w_value, first, separator,
+                                         level)
+        elif space.is_w(space.type(w_dict), space.w_dict):
+            # iteritems() is specialized for each dict strategy, including
+            # those of instance dicts and of dicts made by _pypyjson.loads()
+            assert isinstance(w_dict, W_DictMultiObject)
+            iterator = w_dict.iteritems()
+            while True:
+                w_key, w_value = iterator.next_item()
+                if w_key is None:
+                    break
+                first = self.encode_item(w_key, w_value, first, separator,
+                                         level)
+        else:
+            w_iter = space.iter(space.call_method(w_dict, 'iteritems'))
+            while True:
+                try:
+                    w_item = space.next(w_iter)
+                except OperationError as e:
+                    if not e.match(space, space.w_StopIteration):
+                        raise
+                    break
+                w_key, w_value = space.fixedview(w_item, 2)
+                first = self.encode_item(w_key, w_value, first, separator,
+                                         level)
+        self.emit_unindent(level)
+        sb.append('}')
+        self.unmark(w_dict)
+
+    def encode_item(self, w_key, w_value, first, separator, level):
+        space = self.space
+        sb = self.builder
+        # JavaScript is weakly typed for these, so it makes sense to
+        # also allow them.  Many encoders seem to do something like this.
+        if space.isinstance_w(w_key, space.w_basestring):
+            key = None
+        elif space.isinstance_w(w_key, space.w_float):
+            key = self.float_repr(w_key)
+        elif space.is_w(w_key, space.w_True):
+            key = 'true'
+        elif space.is_w(w_key, space.w_False):
+            key = 'false'
+        elif space.is_w(w_key, space.w_None):
+            key = 'null'
+        elif (space.isinstance_w(w_key, space.w_int) or
+                space.isinstance_w(w_key, space.w_long)):
+            key = self.int_repr(w_key)
+        elif self.skipkeys:
+            return first
+        else:
+            raise oefmt(space.w_TypeError, "key %R is not a string", w_key)
+        if not first:
+            sb.append(separator)
+        if key is None:
+            self.encode_string(w_key)
+        elif not self.encode_raw_string(key, True):
+            if self.w_nonascii_bytes is None:
+                self.w_nonascii_bytes = space.newbytes(key)
+        sb.append(self.key_separator)
+        self.encode(w_value, level)
+        return False
+
+
+@unwrap_spec(ensure_ascii=bool, check_circular=bool, allow_nan=bool,
+             sort_keys=bool, indent=int, item_separator='bytes',
+             key_separator='bytes', skipkeys=bool)
+def encode(space, w_obj, w_default, ensure_ascii, check_circular, allow_nan,
+           sort_keys, indent, item_separator, key_separator, skipkeys):
+    """Return the JSON representation of w_obj, as a str, or as a unicode
+    if ensure_ascii is False and w_obj contains unicodes.  'indent' is -1
+    for no indentation.  This is the implementation of
+    json.encoder.JSONEncoder.encode().
+    """
+    encoder = JSONEncoder(space, w_default, ensure_ascii, check_circular,
+                          allow_nan, sort_keys, indent, item_separator,
+                          key_separator, skipkeys)
+    encoder.encode(w_obj, 0)
+    return encoder.build()
@@ -272,9 +272,49 @@ class TestJson(object):
         assert m2.instantiation_count == 2
         dec.close()
 
+    def test_set_buffer_keeps_caches(self):
+        dec = JSONDecoder(self.space, '"abcd"')
+        dec.MIN_SIZE_FOR_STRING_CACHE = 0
+        w_x = dec.decode_key_string(0)
+        dec.close()
+        dec.set_buffer('   "abcd"')
+        assert dec.pos == 0
+        assert dec.total_size == 6 + 9
+        w_y = dec.decode_key_string(3)
+        assert w_y is w_x
+        assert dec.pos == 9
+        dec.close()
+
+    def test_stream_decoder_scan(self):
+        from pypy.module._pypyjson.interp_decoder import W_StreamDecoder
+        dec = W_StreamDecoder(self.space)
+        for chunk, ends in [('{"a": [1, "]', []),
+                            ('\\""]}\n12', [17]),
+                            ('3 ', [17, 21]),
+                            (' "x\\', [17, 21]),
+                            ('"" [', [17, 21, 28])]:
+            dec.scan(chunk)
+            assert dec.ends == ends
+        # the chunks are not joined by the scanner
+        assert len(dec.chunks) == 5
+        assert dec.pending_length == 30
+
+    def test_stream_decoder_large_value(self):
+        from pypy.module._pypyjson.interp_decoder import W_StreamDecoder
+        space = self.space
+        dec = W_StreamDecoder(space)
+        w_res = dec.feed_w(space.newbytes('["'))
+        for i in range(100):
+            w_res = dec.feed_w(space.newbytes('x' * 100))
+            assert space.len_w(w_res) == 0
+        assert len(dec.chunks) == 101
+        w_res = dec.feed_w(space.newbytes('"] 5'))
+        assert space.len_w(w_res) == 1
+        assert dec.chunks == [' 5']
+
 
 class AppTest(object):
-    spaceconfig = {"objspace.usemodules._pypyjson": True}
+    spaceconfig = {"usemodules": ["_pypyjson", "struct"]}
 
     def test_raise_on_unicode(self):
         import _pypyjson
@@ -513,6 +553,96 @@ class AppTest(object):
         assert check("\\\"\b\f\n\r\t") == '\\\\\\"\\b\\f\\n\\r\\t'
         assert check("\x07") == "\\u0007"
 
+    def test_encode(self):
+        import _pypyjson
+        def default(o):
+            raise TypeError(repr(o) + " is not JSON serializable")
+        def encode(o, default=default, ensure_ascii=True, allow_nan=True,
+                   sort_keys=False, indent=-1, item_separator=', ',
+                   key_separator=': ', skipkeys=False):
+            return _pypyjson.encode(o, default, ensure_ascii, True, allow_nan,
+                                    sort_keys, indent, item_separator,
+                                    key_separator, skipkeys)
+        assert encode(None) == 'null'
+        assert encode([True, False, 42, 10**20, 1.5, "a\n"]) == (
+            '[true, false, 42, 100000000000000000000, 1.5, "a\\n"]')
+        assert encode((1, (), [], {})) == '[1, [], [], {}]'
+        assert encode({"a": [1, 2]}) == '{"a": [1, 2]}'
+        assert encode({2: 1, 1.5: 2, None: 3, True: 4}, sort_keys=True) == (
+            '{"null": 3, "true": 4, "1.5": 2, "2": 1}')
+        assert encode({"b": 1, "a": {"c": [1]}}, sort_keys=True, indent=2,
+                      item_separator=',') == (
+            '{\n  "a": {\n    "c": [\n      1\n    ]\n  },\n  "b": 1\n}')
+        assert encode([1, 2], item_separator=',') == '[1,2]'
+        assert encode({"a": 1}, key_separator=':') == '{"a":1}'
+        assert encode(float("nan")) == 'NaN'
+        assert encode([float("-inf")]) == '[-Infinity]'
+        raises(ValueError, encode, float("inf"), allow_nan=False)
+        raises(TypeError, encode, object())
+        raises(TypeError, encode, {(1, 2): 3})
+        assert encode({(1, 2): 3, "a": 4}, skipkeys=True) == '{"a": 4}'
+
+    def test_encode_subclasses_and_default(self):
+        import _pypyjson
+        class MyInt(int):
+            def __str__(self):
+                return "7"
+        class MyList(list):
+            def __iter__(self):
+                return iter([1, 2])
+        class MyDict(dict):
+            def iteritems(self):
+                return iter([("x", 1)])
+        def default(o):
+            return [o.real]
+        def encode(o, default=default, check_circular=True):
+            return _pypyjson.encode(o, default, True, check_circular, True,
+                                    False, -1, ', ', ': ', False)
+        assert encode([MyInt(5), MyList([5]), MyDict(y=5)]) == (
+            '[7, [1, 2], {"x": 1}]')
+        assert encode(1j) == '[0.0]'
+        l = []
+        l.append(l)
+        raises(ValueError, encode, l)
+        d = {}
+        d["a"] = d
+        raises(ValueError, encode, d)
+        raises(ValueError, encode, 1j, lambda o: o)
+        # a repeated, non-circular reference is fine
+        x = [1]
+        assert encode([x, x]) == '[[1], [1]]'
+
+    def test_encode_unicode(self):
+        import _pypyjson
+        def encode(o, ensure_ascii):
+            return _pypyjson.encode(o, None, ensure_ascii, True, True,
+                                    False, -1, ', ', ': ', False)
+        res = encode([u"\xe9", "\xc3\xa9", u"\U00012345"], True)
+        assert type(res) is str
+        assert res == '["\\u00e9", "\\u00e9", "\\ud808\\udf45"]'
+        raises(UnicodeDecodeError, encode, "\xc0", True)
+        res = encode(["\xc3\xa9", "\"\t"], False)
+        assert type(res) is str
+        assert res == '["\xc3\xa9", "\\"\\t"]'
+        res = encode({u"\xe9": u"\u1234\n"}, False)
+        assert type(res) is unicode
+        assert res == u'{"\xe9": "\u1234\\n"}'
+        raises(UnicodeDecodeError, encode, [u"a", "\xc3\xa9"], False)
+
+    def test_json_dumps(self):
+        import json
+        class MyDict(dict):
+            pass
+        d = MyDict(z=[1, 2.5, None])
+        d["a"] = {"b": (True,)}
+        assert json.dumps(d) == '{"z": [1, 2.5, null], "a": {"b": [true]}}'
+        assert json.dumps(d, indent=1, separators=(',', ':'),
+                          sort_keys=True) == (
+            '{\n "a":{\n  "b":[\n   true\n  ]\n },\n "z":[\n  1,\n  2.5,\n'
+            '  null\n ]\n}')
+        assert json.dumps(u"\xe9", ensure_ascii=False) == u'"\xe9"'
+        assert json.dumps([1j], default=lambda o: str(o)) == '["1j"]'
+
     def test_error_position(self):
         import _pypyjson
         test_cases = [
@@ -533,6 +663,57 @@ class AppTest(object):
             exc = raises(ValueError, _pypyjson.loads, inputtext)
             assert str(exc.value) == errmsg
 
+    def test_stream_decoder(self):
+        import _pypyjson
+        dec = _pypyjson.StreamDecoder()
+        assert dec.feed('{"a": 1, "b": [1') == []
+        assert dec.feed('0]}\n{"a": 2, "b": "x}"}\n{"a"') == [
+            {u"a": 1, u"b": [10]}, {u"a": 2, u"b": u"x}"}]
+        assert dec.feed(': 3}\n1') == [{u"a": 3}]
+        assert dec.feed('2 null "\\"" 4') == [12, None, u'"']
+        assert dec.finish() == [4]
+        assert dec.finish() == []
+        assert dec.feed('[true,false]') == [[True, False]]
+        raises(TypeError, dec.feed, u"[]")
+        dec.feed('{"a": 1')
+        raises(ValueError, dec.finish)
+        raises(ValueError, dec.feed, '[1 2]')
+        assert dec.feed(' 5 ') == [5]
+
+    def test_stream_decoder_invalid_value_in_batch(self):
+        import _pypyjson
+        dec = _pypyjson.StreamDecoder()
+        # the values before the invalid one are returned, the next call
+        # reports it, and the values after it are not lost
+        assert dec.feed('1 {"a": 2} [1 2] 3 ') == [1, {u"a": 2}]
+        raises(ValueError, dec.feed, '4 ')
+        assert dec.feed('5 ') == [3, 4, 5]
+        assert dec.feed('6 [1 2]') == [6]
+        raises(ValueError, dec.finish)
+        assert dec.finish() == []
+
+    def test_stream_decoder_shares_maps(self):
+        import _pypyjson
+        from __pypy__ import strategy
+        dec = _pypyjson.StreamDecoder()
+        records = []
+        for i in range(10):
+            records += dec.feed('{"id": %d, "name": "n%d"}\n' % (i, i))
+        assert len(records) == 10
+        assert records[9] == {u"id": 9, u"name": u"n9"}
+        assert strategy(records[9]) == "JsonDictStrategy"
+
+    def test_iterload(self):
+        import _pypyjson
+        from StringIO import StringIO
+        text = '{"a": [1, 2]}\n"b"\n3\n[]\n'
+        expected = [{u"a": [1, 2]}, u"b", 3, []]
+        assert list(_pypyjson.iterload(text)) == expected
+        assert list(_pypyjson.iterload(StringIO(text), 3)) == expected
+        assert list(_pypyjson.iterload(text.splitlines(True))) == expected
+        assert list(_pypyjson.iterload(["1", "2"])) == [12]
+        raises(ValueError, list, _pypyjson.iterload(["[1, ", "2"]))
+
     def test_repeated_key(self):
         import _pypyjson
         a = '{"abc": "4", "k": 1, "k": 2}'
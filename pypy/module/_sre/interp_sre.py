@@ -101,6 +101,12 @@ def searchcontext(space, ctx, pattern):
     except rsre_core.Error as e:
         raise OperationError(space.w_RuntimeError, space.newtext(e.msg))
 
+def searchsetcontext(space, ctx, patternset):
+    try:
+        return rsre_core.search_set_context(ctx, patternset)
+    except rsre_core.Error as e:
+        raise OperationError(space.w_RuntimeError, space.newtext(e.msg))
+
 # ____________________________________________________________
 #
 # SRE_Pattern class
@@ -520,6 +526,58 @@ W_SRE_Pattern.typedef = TypeDef(
 )
 W_SRE_Pattern.typedef.acceptable_as_base_class = False
 
+# ____________________________________________________________
+#
+# SRE_RegexSet class
+# A PyPy extension: RegexSet([p1, p2, ...]).matches(string) returns the
+# indices of all the patterns that match somewhere in 'string', finding
+# them with a single pass over the string when possible.
+
+class W_SRE_RegexSet(W_Root):
+    _immutable_fields_ = ["patterns_w[*]", "code"]
+
+    def __init__(self, space, patterns_w):
+        self.space = space
+        self.patterns_w = patterns_w
+        self.code = rsre_core.CompiledPatternSet(
+            [srepat.code for srepat in patterns_w])
+
+    @unwrap_spec(pos=int, endpos=int)
+    def matches_w(self, w_string, pos=0, endpos=sys.maxint):
+        space = self.space
+        if not self.patterns_w:
+            return space.newlist([])
+        ctx = self.patterns_w[0].make_ctx(w_string, pos, endpos)
+        indices = searchsetcontext(space, ctx, self.code)
+        return space.newlist([space.newint(i) for i in indices])
+
+    def len_w(self):
+        return self.space.newint(len(self.patterns_w))
+
+    def fget_patterns(self, space):
+        return space.newtuple([srepat for srepat in self.patterns_w])
+
+def SRE_RegexSet__new__(space, w_subtype, w_patterns):
+    w_compile = None
+    patterns_w = []
+    for w_item in space.listview(w_patterns):
+        if not isinstance(w_item, W_SRE_Pattern):
+            if w_compile is None:
+                w_compile = space.getattr(import_re(space),
+                                          space.newtext("compile"))
+            w_item = space.call_function(w_compile, w_item)
+        patterns_w.append(space.interp_w(W_SRE_Pattern, w_item))
+    return W_SRE_RegexSet(space, patterns_w[:])
+
+W_SRE_RegexSet.typedef = TypeDef(
+    'SRE_RegexSet',
+    __new__      = interp2app(SRE_RegexSet__new__),
+    __len__      = interp2app(W_SRE_RegexSet.len_w),
+    matches      = interp2app(W_SRE_RegexSet.matches_w),
+    patterns     = GetSetProperty(W_SRE_RegexSet.fget_patterns),
+)
+W_SRE_RegexSet.typedef.acceptable_as_base_class = False
+
 # ____________________________________________________________
 #
 # SRE_Match class
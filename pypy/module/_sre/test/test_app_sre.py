@@ -1110,3 +1110,33 @@ class AppTestUnicodeExtra:
         import re
         match = re.search(u"\u1234", u"\u1233\u1234\u1235")
         assert match.start() == 1
+
+
+class AppTestRegexSet:
+    spaceconfig = dict(usemodules=('array', ))
+
+    def test_matches(self):
+        import re, _sre
+        patterns = [r"error", r"(\w+)=\1", r"^GET ", r"\d+ms$",
+                    re.compile(r"timeout", re.I)]
+        s = _sre.RegexSet(patterns)
+        assert len(s) == 5
+        assert s.patterns[4] is patterns[4]
+        assert s.patterns[0].pattern == "error"
+        assert s.matches("GET /x a=a 12ms") == [1, 2, 3]
+        assert s.matches("error: TIMEOUT\n") == [0, 4]
+        assert s.matches(u"GET \u1234 error") == [0, 2]
+        assert s.matches("") == []
+        assert s.matches("GET error", 1) == [0]
+        assert s.matches("GET error", 0, 4) == [2]
+
+    def test_empty(self):
+        import _sre
+        s = _sre.RegexSet([])
+        assert len(s) == 0
+        assert s.matches("abc") == []
+
+    def test_bad_pattern(self):
+        import _sre
+        raises(TypeError, _sre.RegexSet, [42])
+        raises(TypeError, _sre.RegexSet, 42)
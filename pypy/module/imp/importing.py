@@ -2,7 +2,7 @@
 Implementation of the interpreter-level default import logic.
 """
 
-import sys, os, stat
+import sys, os, stat, time
 
 from pypy.interpreter.module import Module
 from pypy.interpreter.gateway import interp2app, unwrap_spec
@@ -12,7 +12,7 @@ from pypy.interpreter.baseobjspace import W_Root, CannotHaveLock
 from pypy.interpreter.eval import Code
 from pypy.interpreter.pycode import PyCode
 from pypy.interpreter.streamutil import wrap_streamerror
-from rpython.rlib import streamio, jit
+from rpython.rlib import streamio, jit, rpath
 from rpython.rlib.streamio import StreamErrors
 from rpython.rlib.objectmodel import we_are_translated, specialize
 from pypy.module.sys.version import PYPY_VERSION
@@ -137,6 +137,79 @@ else:
         except OSError:
             return False
 
+class _DirectoryListing(object):
+    def __init__(self, mtime, names):
+        self.mtime = mtime
+        self.names = names
+
+class DirectoryListingCache(object):
+    """Cache of the file names in the directories of sys.path.  It lets
+    find_module() skip a directory with a single stat() when the module is
+    not there, instead of one stat() per candidate file name.  A listing
+    is valid as long as the mtime of the directory does not change.
+    Directories modified less than a second before they are listed are not
+    cached, so that changes within the granularity of the file system's
+    timestamps are never missed.
+    """
+    def __init__(self, space):
+        self.listings = {}           # absolute dirname -> _DirectoryListing
+        self.num_listings = 0
+        self.num_syscalls_saved = 0
+
+    def clear(self):
+        self.listings = {}
+
+    def get_names(self, dirname):
+        """Return a dict whose keys are the names in the directory, or
+        None if they are not known."""
+        try:
+            st = os.stat(dirname)
+        except OSError:
+            return _no_names
+        if not stat.S_ISDIR(st.st_mode):
+            return _no_names
+        mtime = st.st_mtime
+        listing = self.listings.get(dirname, None)
+        if listing is not None and listing.mtime == mtime:
+            return listing.names
+        if mtime > time.time() - 1.0:
+            return None
+        try:
+            names = os.listdir(dirname)
+        except OSError:
+            return None
+        d = {}
+        for name in names:
+            d[name] = True
+        self.listings[dirname] = _DirectoryListing(mtime, d)
+        self.num_listings += 1
+        return d
+
+_no_names = {}
+
+def may_contain_module(space, path, partname):
+    """Return False if the sys.path entry 'path' is known not to contain
+    the module or package 'partname'."""
+    if not rpath.risabs(path):
+        return True     # depends on the current directory
+    cache = space.fromcache(DirectoryListingCache)
+    names = cache.get_names(path)
+    if names is None:
+        return True
+    candidates = [partname, partname + ".py"]
+    if _WIN32:
+        candidates.append(partname + ".pyw")
+    if space.config.objspace.lonepycfiles:
+        candidates.append(partname + ".pyc")
+    if has_so_extension(space):
+        candidates.append(partname + get_so_extension(space))
+    for name in candidates:
+        if name in names:
+            return True
+    # each candidate would have cost a stat(), minus the one done above
+    cache.num_syscalls_saved += len(candidates) - 1
+    return False
+
 def try_getattr(space, w_obj, w_name):
     try:
         return space.getattr(w_obj, w_name)
@@ -578,6 +651,8 @@ def find_module(space, modulename, w_modulename, partname, w_path,
             path = space.fsencode_w(w_pathitem)
             filepart = os.path.join(path, partname)
             log_pyverbose(space, 2, "# trying %s\n" % (filepart,))
+            if not may_contain_module(space, path, partname):
+                continue
             if os.path.isdir(filepart) and case_ok(filepart):
                 if has_init_module(space, filepart):
                     return FindInfo(PKG_DIRECTORY, filepart, None)
@@ -1196,6 +1196,74 @@ class TestPycStuff:
                     stream.close()
 
 
+class TestDirectoryListingCache:
+    def _make_dir(self, name, *filenames):
+        p = udir.ensure('dircache', name, dir=1)
+        for filename in filenames:
+            p.join(filename).write('')
+        self._set_old_mtime(p)
+        return p
+
+    def _set_old_mtime(self, p):
+        old = os.stat(str(p)).st_mtime - 100
+        os.utime(str(p), (old, old))
+
+    def test_may_contain_module(self):
+        space = self.space
+        cache = space.fromcache(importing.DirectoryListingCache)
+        p = self._make_dir('test1', 'foo.py', 'pkg')
+        saved = cache.num_syscalls_saved
+        assert importing.may_contain_module(space, str(p), 'foo')
+        assert importing.may_contain_module(space, str(p), 'pkg')
+        assert not importing.may_contain_module(space, str(p), 'bar')
+        assert not importing.may_contain_module(space, str(p), 'Foo')
+        assert cache.num_syscalls_saved > saved
+        assert str(p) in cache.listings
+        # nonexistent directories never contain anything
+        assert not importing.may_contain_module(space, str(p.join('x')), 'foo')
+        # relative paths are not cached
+        assert importing.may_contain_module(space, '', 'bar')
+
+    def test_invalidation(self):
+        space = self.space
+        p = self._make_dir('test2', 'foo.py')
+        assert not importing.may_contain_module(space, str(p), 'bar')
+        p.join('bar.py').write('')
+        # the directory was just modified, so it is not trusted
+        cache = space.fromcache(importing.DirectoryListingCache)
+        assert cache.get_names(str(p)) is None
+        assert importing.may_contain_module(space, str(p), 'bar')
+        self._set_old_mtime(p)
+        assert 'bar.py' in cache.get_names(str(p))
+        p.join('bar.py').remove()
+        assert importing.may_contain_module(space, str(p), 'bar')
+
+    def test_import(self):
+        space = self.space
+        p = self._make_dir('test3', 'cachedmod1.py')
+        p.join('cachedmod1.py').write('x = 42\n')
+        self._set_old_mtime(p)
+        w_res = space.appexec([space.wrap(str(p))], """(path):
+            import sys
+            sys.path.insert(0, path)
+            try:
+                import cachedmod1
+                try:
+                    import cachedmod2
+                except ImportError:
+                    pass
+                else:
+                    raise AssertionError
+                with open(path + '/cachedmod2.py', 'w') as f:
+                    f.write('x = 43\\n')
+                import cachedmod2
+                return cachedmod1.x, cachedmod2.x
+            finally:
+                del sys.path[0]
+        """)
+        assert space.unwrap(w_res) == (42, 43)
+
+
 def test_PYTHONPATH_takes_precedence(space):
     if sys.platform == "win32":
         py.test.skip("unresolved issues with win32 shell quoting rules")
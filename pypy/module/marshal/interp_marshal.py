@@ -4,6 +4,8 @@ from rpython.rlib.rarithmetic import intmask
 from rpython.rlib import rstackovf
 from pypy.module._file.interp_file import W_File
 from pypy.objspace.std.marshal_impl import marshal, get_unmarshallers
+from pypy.objspace.std.marshal_impl import get_ref_unmarshallers
+from pypy.objspace.std.marshal_impl import FLAG_REF, TYPE_REF
 
 
 Py_MARSHAL_VERSION = 2
@@ -153,6 +155,11 @@ class Marshaller(_Base):
     put_pascal(s)               puts a short string
     put_w_obj(w_obj)            puts a wrapped object
     put_tuple_w(TYPE, tuple_w)  puts tuple_w, an unwrapped list of wrapped objects
+
+    references (version 3):
+
+    put_ref_w(w_obj)            puts a reference if w_obj was already written
+    put_ref_str(table, s)       same for a string, looked up by value
     """
 
     def __init__(self, space, writer, version):
@@ -161,6 +168,13 @@ class Marshaller(_Base):
         self.writer = writer
         self.version = version
         self.stringtable = {}
+        # version 3: the index of the objects written with FLAG_REF
+        self.nrefs = 0
+        self.flag_next = False     # set FLAG_REF on the next type code
+        self.refs = {}
+        self.interned_refs = {}
+        self.bytes_refs = {}
+        self.unicode_refs = {}
 
     ## currently we cannot use a put that is a bound method
     ## from outside. Same holds for get.
@@ -170,10 +184,16 @@ class Marshaller(_Base):
     def put1(self, c):
         self.writer.write(c)
 
+    def flagged(self, typecode):
+        if self.flag_next:
+            self.flag_next = False
+            return chr(ord(typecode) | FLAG_REF)
+        return typecode
+
     def atom(self, typecode):
         #assert type(typecode) is str and len(typecode) == 1
         # type(char) not supported
-        self.put1(typecode)
+        self.put1(self.flagged(typecode))
 
     def atom_int(self, typecode, x):
         a = chr(x & 0xff)
@@ -183,7 +203,7 @@ class Marshaller(_Base):
         c = chr(x & 0xff)
         x >>= 8
         d = chr(x & 0xff)
-        self.put(typecode + a + b + c + d)
+        self.put(self.flagged(typecode) + a + b + c + d)
 
     def atom_int64(self, typecode, x):
         self.atom_int(typecode, x)
@@ -195,7 +215,7 @@ class Marshaller(_Base):
 
     def start(self, typecode):
         # type(char) not supported
-        self.put(typecode)
+        self.put(self.flagged(typecode))
 
     def put_short(self, x):
         a = chr(x & 0xff)
@@ -223,6 +243,34 @@ class Marshaller(_Base):
     def put_w_obj(self, w_obj):
         marshal(self.space, w_obj, self)
 
+    def _new_ref(self):
+        idx = self.nrefs
+        self.nrefs = idx + 1
+        self.flag_next = True
+        return idx
+
+    def put_ref_w(self, w_obj):
+        """With version 3, if w_obj was already written, put a reference to
+        it and return True.  Otherwise return False: the object must be
+        written, and its type code gets FLAG_REF."""
+        if self.version < 3:
+            return False
+        idx = self.refs.get(w_obj, -1)
+        if idx < 0:
+            self.refs[w_obj] = self._new_ref()
+            return False
+        self.atom_int(TYPE_REF, idx)
+        return True
+
+    def put_ref_str(self, table, s):
+        """Like put_ref_w(), for strings: equal strings are shared."""
+        idx = table.get(s, -1)
+        if idx < 0:
+            table[s] = self._new_ref()
+            return False
+        self.atom_int(TYPE_REF, idx)
+        return True
+
     def dump_w_obj(self, w_obj):
         space = self.space
         try:
@@ -283,7 +331,7 @@ class StringMarshaller(Marshaller):
         newpos = pos + 5
         if len(self.buflis) < newpos:
             self.buflis *= 2
-        self.buflis[pos] = typecode
+        self.buflis[pos] = self.flagged(typecode)
         self.buflis[pos+1] = a
         self.buflis[pos+2] = b
         self.buflis[pos+3] = c
@@ -331,13 +379,21 @@ def invalid_typecode(space, u, tc):
 
 class Unmarshaller(_Base):
     _dispatch = [invalid_typecode] * 256
-    for tc, func in get_unmarshallers():
+    for tc, func in get_unmarshallers() + get_ref_unmarshallers():
         _dispatch[ord(tc)] = func
 
     def __init__(self, space, reader):
         self.space = space
         self.reader = reader
         self.stringtable_w = []
+        self.refs_w = []
+
+    def reserve_ref(self):
+        # the index is taken before the content of the object is read,
+        # like the marshaller does
+        idx = len(self.refs_w)
+        self.refs_w.append(None)
+        return idx
 
     def get(self, n):
         assert n >= 0
@@ -202,6 +202,43 @@ class AppTestMarshal:
         assert str(exc.value) == "bad marshal data (unknown type code)"
 
 
+    def test_version_3_refs(self):
+        import marshal
+        s = 'x y' * 10
+        t = (1.5, s, u'\xe9')
+        case = [s, t, t, s, u'\xe9', frozenset([t])]
+        data = marshal.dumps(case, 3)
+        assert len(data) < len(marshal.dumps(case, 2))
+        x = marshal.loads(data)
+        assert x == case
+        assert x[1] is x[2]
+        assert x[0] is x[1][1] is x[3]
+        assert x[4] is x[1][2]
+        # the format is the one of CPython 3.4
+        assert marshal.loads('(\x02\x00\x00\x00\xf3\x01\x00\x00\x00a'
+                             'r\x00\x00\x00\x00') == ('a', 'a')
+        assert marshal.dumps(('a b', 'a b'), 3) == (
+            '\xa8\x02\x00\x00\x00\xf3\x03\x00\x00\x00a b'
+            'r\x01\x00\x00\x00')
+        raises(ValueError, marshal.loads, 'r\x00\x00\x00\x00')
+        # a reference to an object that is not fully loaded yet
+        raises(ValueError, marshal.loads, '\xa8\x01\x00\x00\x00'
+                                          'r\x00\x00\x00\x00')
+
+    def test_version_3_code(self):
+        import marshal
+        co = compile("def f(a, b='a b'):\n    return (a, b, 'a b')\n"
+                     "g = f\n", "<test>", "exec")
+        data = marshal.dumps(co, 3)
+        assert len(data) < len(marshal.dumps(co, 2))
+        co2 = marshal.loads(data)
+        assert co2 == co
+        d = {}
+        exec co2 in d
+        assert d['g'](5) == (5, 'a b', 'a b')
+        # interned strings are still interned after loading
+        assert intern(co2.co_names[0]) is co2.co_names[0]
+
 class AppTestSmallLong(AppTestMarshal):
     spaceconfig = AppTestMarshal.spaceconfig.copy()
     spaceconfig["objspace.std.withsmalllong"] = True
@@ -1,5 +1,5 @@
 from rpython.rlib import jit
-from rpython.rlib.buffer import SubBuffer
+from rpython.rlib.buffer import SubBuffer, StringBuffer
 from rpython.rlib.mutbuffer import MutableStringBuffer
 from rpython.rlib.rstruct.error import StructError, StructOverflowError
 from rpython.rlib.rstruct.formatiterator import CalcSizeFormatIterator
@@ -84,7 +84,7 @@ Write the packed bytes into the writable buffer buf starting at offset
         raise OperationError(get_error(space), space.newtext(e.msg))
 
 
-def _unpack(space, format, buf):
+def _unpack_values(space, format, buf):
     fmtiter = UnpackFormatIterator(space, buf)
     try:
         fmtiter.interpret(format)
@@ -92,7 +92,11 @@ def _unpack(space, format, buf):
         raise OperationError(space.w_OverflowError, space.newtext(e.msg))
     except StructError as e:
         raise OperationError(get_error(space), space.newtext(e.msg))
-    return space.newtuple(fmtiter.result_w[:])
+    return fmtiter.result_w
+
+
+def _unpack(space, format, buf):
+    return space.newtuple(_unpack_values(space, format, buf)[:])
 
 
 @unwrap_spec(format='text')
@@ -119,6 +123,102 @@ fmt, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
     return _unpack(space, format, buf)
 
 
+def _get_iter_buffer(space, size, w_buffer):
+    if size == 0:
+        raise oefmt(get_error(space),
+                    "cannot iteratively unpack with a struct of length 0")
+    buf = space.getarg_w('s*', w_buffer)
+    if buf.getlength() % size != 0:
+        raise oefmt(get_error(space),
+                    "iterative unpacking requires a buffer of a multiple of "
+                    "%d bytes", size)
+    return buf
+
+
+@unwrap_spec(format='text')
+def iter_unpack(space, format, w_buffer):
+    """Return an iterator yielding tuples unpacked from the given bytes
+source according to the format string, like a repeated invocation of
+unpack_from().  Requires that the bytes length be a multiple of the format
+struct size."""
+    size = _calcsize(space, format)
+    buf = _get_iter_buffer(space, size, w_buffer)
+    return W_UnpackIter(format, size, buf)
+
+
+def _unpack_many(space, format, size, w_buffer, count, offset):
+    buf = space.getarg_w('s*', w_buffer)
+    length = buf.getlength()
+    if offset < 0:
+        offset += length
+    if offset < 0 or offset > length:
+        raise oefmt(get_error(space), "offset out of range")
+    if count < 0:
+        if size == 0:
+            raise oefmt(get_error(space),
+                        "cannot unpack_many with a struct of length 0 "
+                        "without a count")
+        count = (length - offset) // size
+    elif size > 0 and count > (length - offset) // size:
+        raise oefmt(get_error(space),
+                    "unpack_many requires a buffer of at least %d bytes",
+                    size * count)
+    # unpack a record of zeroes, to know the number of fields even if
+    # count is 0
+    nfields = len(_unpack_values(space, format, StringBuffer('\x00' * size)))
+    columns = [[None] * count for i in range(nfields)]
+    for i in range(count):
+        values_w = _unpack_values(space, format,
+                                  SubBuffer(buf, offset + i * size, size))
+        for j in range(nfields):
+            columns[j][i] = values_w[j]
+    # the lists get an int or float strategy when possible, i.e. the
+    # values are stored unboxed
+    return space.newtuple([space.newlist(column) for column in columns])
+
+
+@unwrap_spec(format='text', count=int, offset=int)
+def unpack_many(space, format, w_buffer, count=-1, offset=0):
+    """Unpack 'count' consecutive records (by default, as many as fit) from
+the buffer, starting at offset, and return a tuple with one list per field
+of the format: the columns of the records."""
+    size = _calcsize(space, format)
+    return _unpack_many(space, format, size, w_buffer, count, offset)
+
+
+class W_UnpackIter(W_Root):
+    _immutable_fields_ = ["format", "size", "buf"]
+
+    def __init__(self, format, size, buf):
+        self.format = format
+        self.size = size
+        self.buf = buf
+        self.index = 0
+
+    def descr_iter(self, space):
+        return self
+
+    def descr_next(self, space):
+        if self.index >= self.buf.getlength():
+            raise OperationError(space.w_StopIteration, space.w_None)
+        size = self.size
+        # no copy: the records are read from the buffer directly
+        buf = SubBuffer(self.buf, self.index, size)
+        w_res = _unpack(space, jit.promote_string(self.format), buf)
+        self.index += size
+        return w_res
+
+    def descr_length_hint(self, space):
+        return space.newint((self.buf.getlength() - self.index) // self.size)
+
+W_UnpackIter.typedef = TypeDef("unpack_iterator",
+    __iter__=interp2app(W_UnpackIter.descr_iter),
+    next=interp2app(W_UnpackIter.descr_next),
+    __length_hint__=interp2app(W_UnpackIter.descr_length_hint),
+)
+W_UnpackIter.typedef.acceptable_as_base_class = False
+
+
 class W_Struct(W_Root):
     _immutable_fields_ = ["format", "size"]
 
@@ -147,6 +247,15 @@ class W_Struct(W_Root):
     def descr_unpack_from(self, space, w_buffer, offset=0):
         return unpack_from(space, jit.promote_string(self.format), w_buffer, offset)
 
+    def descr_iter_unpack(self, space, w_buffer):
+        buf = _get_iter_buffer(space, self.size, w_buffer)
+        return W_UnpackIter(self.format, self.size, buf)
+
+    @unwrap_spec(count=int, offset=int)
+    def descr_unpack_many(self, space, w_buffer, count=-1, offset=0):
+        return _unpack_many(space, jit.promote_string(self.format),
+                            self.size, w_buffer, count, offset)
+
 W_Struct.typedef = TypeDef("Struct",
     __new__=interp2app(W_Struct.descr__new__.im_func),
     __init__=interp2app(W_Struct.descr__init__),
@@ -157,6 +266,8 @@ W_Struct.typedef = TypeDef("Struct",
     unpack=interp2app(W_Struct.descr_unpack),
     pack_into=interp2app(W_Struct.descr_pack_into),
     unpack_from=interp2app(W_Struct.descr_unpack_from),
+    iter_unpack=interp2app(W_Struct.descr_iter_unpack),
+    unpack_many=interp2app(W_Struct.descr_unpack_many),
     __weakref__=make_weakref_descr(W_Struct),
 )
 
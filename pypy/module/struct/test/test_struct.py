@@ -432,6 +432,43 @@ class AppTestStruct(object):
         assert s.unpack(s.pack(42)) == (42,)
         assert s.unpack_from(memoryview(s.pack(42))) == (42,)
 
+    def test_iter_unpack(self):
+        s = self.struct.Struct('<hb')
+        data = s.pack(1, 2) + s.pack(-3, 4) + s.pack(5, -6)
+        it = s.iter_unpack(data)
+        assert iter(it) is it
+        assert it.__length_hint__() == 3
+        assert next(it) == (1, 2)
+        assert it.__length_hint__() == 2
+        assert list(it) == [(-3, 4), (5, -6)]
+        raises(StopIteration, next, it)
+        assert list(self.struct.iter_unpack('<hb', buffer(data))) == [
+            (1, 2), (-3, 4), (5, -6)]
+        assert list(s.iter_unpack('')) == []
+        raises(self.struct.error, s.iter_unpack, data[:-1])
+        raises(self.struct.error, self.struct.iter_unpack, '0i', '')
+
+    def test_unpack_many(self):
+        s = self.struct.Struct('<idc')
+        data = s.pack(1, 1.5, 'a') + s.pack(2, -0.5, 'b') + s.pack(3, 8., 'c')
+        assert s.unpack_many(data) == ([1, 2, 3], [1.5, -0.5, 8.], ['a', 'b', 'c'])
+        assert s.unpack_many(data, 1) == ([1], [1.5], ['a'])
+        assert s.unpack_many(data, 0) == ([], [], [])
+        assert s.unpack_many(data, 2, s.size) == ([2, 3], [-0.5, 8.], ['b', 'c'])
+        assert s.unpack_many(data + 'xy', offset=-2 - s.size) == (
+            [3], [8.], ['c'])
+        assert self.struct.unpack_many('<idc', bytearray(data), 1, 2 * s.size) == (
+            [3], [8.], ['c'])
+        raises(self.struct.error, s.unpack_many, data, 4)
+        raises(self.struct.error, s.unpack_many, data, 1, 3 * s.size - 1)
+        raises(self.struct.error, s.unpack_many, data, 1, len(data) + 1)
+        # native alignment is relative to the start of each record
+        s = self.struct.Struct('@bi')
+        data = s.pack(1, 2) + s.pack(3, 4)
+        assert s.unpack_many(data) == ([1, 3], [2, 4])
+        ints, = self.struct.unpack_many('4s', 'abcdefgh')
+        assert ints == ['abcd', 'efgh']
+
     def test_struct_weakrefable(self):
         import weakref
         weakref.ref(self.struct.Struct('i'))
@@ -529,6 +566,11 @@ class AppTestFastPath(object):
         offset = self.struct.calcsize("i")
         assert self.struct.unpack_from("ii", buf, offset) == (42, 43)
 
+    def test_unpack_many_bytearray(self):
+        buf = bytearray(self.struct.pack("<iiii", 0, 42, 43, 44))
+        assert self.struct.unpack_many("<ii", buf) == ([0, 43], [42, 44])
+        assert list(self.struct.iter_unpack("<ii", buf)) == [(0, 42), (43, 44)]
+
     def test_unpack_bytearray(self):
         data = self.struct.pack("iii", 0, 42, 43)
         buf = bytearray(data)
@@ -115,6 +115,7 @@ def exc_info_with_tb(space):
 
 def exc_info_without_tb(space, frame):
     operror = frame.last_exception
+    operror.normalize_deferred(space)
     return space.newtuple([operror.w_type, operror.get_w_value(space),
                            space.w_None])
 
@@ -436,6 +436,15 @@ class W_AbstractBytesObject(W_Root):
         of the specified width. The string S is never truncated.
         """
 
+    def descr_getbuffer(self, space, w_flags):
+        ""
+
+    def descr_formatter_parser(self, space):
+        ""
+
+    def descr_formatter_field_name_split(self, space):
+        ""
+
 class W_BytesObject(W_AbstractBytesObject):
     import_from_mixin(StringMethods)
     _immutable_fields_ = ['_value']
@@ -502,7 +511,7 @@ class W_BytesObject(W_AbstractBytesObject):
     @staticmethod
     def _use_rstr_ops(space, w_other):
         from pypy.objspace.std.unicodeobject import W_UnicodeObject
-        return (isinstance(w_other, W_BytesObject) or
+        return (isinstance(w_other, W_AbstractBytesObject) or
                 isinstance(w_other, W_UnicodeObject))
 
     @staticmethod
@@ -615,34 +624,34 @@ class W_BytesObject(W_AbstractBytesObject):
         return mod_format(space, w_values, self, do_unicode=False)
 
     def descr_eq(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        if not isinstance(w_other, W_AbstractBytesObject):
             return space.w_NotImplemented
-        return space.newbool(self._value == w_other._value)
+        return space.newbool(self._value == space.bytes_w(w_other))
 
     def descr_ne(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        if not isinstance(w_other, W_AbstractBytesObject):
             return space.w_NotImplemented
-        return space.newbool(self._value != w_other._value)
+        return space.newbool(self._value != space.bytes_w(w_other))
 
     def descr_lt(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        if not isinstance(w_other, W_AbstractBytesObject):
             return space.w_NotImplemented
-        return space.newbool(self._value < w_other._value)
+        return space.newbool(self._value < space.bytes_w(w_other))
 
     def descr_le(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        if not isinstance(w_other, W_AbstractBytesObject):
             return space.w_NotImplemented
-        return space.newbool(self._value <= w_other._value)
+        return space.newbool(self._value <= space.bytes_w(w_other))
 
     def descr_gt(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        if not isinstance(w_other, W_AbstractBytesObject):
             return space.w_NotImplemented
-        return space.newbool(self._value > w_other._value)
+        return space.newbool(self._value > space.bytes_w(w_other))
 
     def descr_ge(self, space, w_other):
-        if not isinstance(w_other, W_BytesObject):
+        if not isinstance(w_other, W_AbstractBytesObject):
             return space.w_NotImplemented
-        return space.newbool(self._value >= w_other._value)
+        return space.newbool(self._value >= space.bytes_w(w_other))
 
     # auto-conversion fun
 
@@ -657,6 +666,14 @@ class W_BytesObject(W_AbstractBytesObject):
             from .bytearrayobject import W_BytearrayObject, _make_data
             self_as_bytearray = W_BytearrayObject(_make_data(self._value))
             return space.add(self_as_bytearray, w_other)
+        elif (space.config.objspace.std.withstrbuf and
+                  isinstance(w_other, W_AbstractBytesObject)):
+            from pypy.objspace.std.strbufobject import W_StringBufferObject
+            other = space.bytes_w(w_other)
+            builder = StringBuilder(len(self._value) + len(other))
+            builder.append(self._value)
+            builder.append(other)
+            return W_StringBufferObject(builder)
         return self._StringMethods_descr_add(space, w_other)
 
     _StringMethods__startswith = _startswith
@@ -923,17 +940,19 @@ W_BytesObject.typedef = TypeDef(
     translate = interpindirect2app(W_AbstractBytesObject.descr_translate),
     upper = interpindirect2app(W_AbstractBytesObject.descr_upper),
     zfill = interpindirect2app(W_AbstractBytesObject.descr_zfill),
-    __buffer__ = interp2app(W_BytesObject.descr_getbuffer),
+    __buffer__ = interpindirect2app(W_AbstractBytesObject.descr_getbuffer),
 
-    format = interpindirect2app(W_BytesObject.descr_format),
-    __format__ = interpindirect2app(W_BytesObject.descr__format__),
-    __mod__ = interpindirect2app(W_BytesObject.descr_mod),
-    __rmod__ = interpindirect2app(W_BytesObject.descr_rmod),
+    format = interpindirect2app(W_AbstractBytesObject.descr_format),
+    __format__ = interpindirect2app(W_AbstractBytesObject.descr__format__),
+    __mod__ = interpindirect2app(W_AbstractBytesObject.descr_mod),
+    __rmod__ = interpindirect2app(W_AbstractBytesObject.descr_rmod),
     __getnewargs__ = interpindirect2app(
         W_AbstractBytesObject.descr_getnewargs),
-    _formatter_parser = interp2app(W_BytesObject.descr_formatter_parser),
+    _formatter_parser = interpindirect2app(
+        W_AbstractBytesObject.descr_formatter_parser),
     _formatter_field_name_split =
-        interp2app(W_BytesObject.descr_formatter_field_name_split),
+        interpindirect2app(
+            W_AbstractBytesObject.descr_formatter_field_name_split),
 )
 W_BytesObject.typedef.flag_sequence_bug_compat = True
 
@@ -98,6 +98,14 @@ def CALL_METHOD(f, oparg, *ignored):
         finally:
             f.dropvalues(n_args + 2)
     else:
+        w_callable = f.peekvalue(n_args + (2 * n_kwargs) + 1)
+        if isinstance(w_callable, function.Function):
+            w_result = w_callable.funccall_valuestack_keywords(
+                    n, n_kwargs, f)
+            if w_result is not None:
+                f.dropvalues(n_args + (2 * n_kwargs) + 2)
+                f.pushvalue(w_result)
+                return
         keywords = [None] * n_kwargs
         keywords_w = [None] * n_kwargs
         while True:
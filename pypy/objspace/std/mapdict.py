@@ -12,7 +12,7 @@ from pypy.objspace.std.dictmultiobject import (
     BaseValueIterator, BaseItemIterator, _never_equal_to_string,
     W_DictObject, BytesDictStrategy, UnicodeDictStrategy
 )
-from pypy.objspace.std.typeobject import MutableCell
+from pypy.objspace.std.typeobject import MutableCell, MAX_CACHE_SIZE_EXP
 
 
 
@@ -23,6 +23,10 @@ erase_unboxed, unerase_unboxed = rerased.new_erasing_pair("mapdict unwrapped sto
 
 ALLOW_UNBOXING_INTS = LONG_BIT == 64
 
+# the number of boolean attributes that are packed as bits into one entry of
+# the unboxed storage list
+NUM_BOOLS_PER_WORD = LONG_BIT - 1
+
 # ____________________________________________________________
 # attribute shapes
 
@@ -76,7 +80,7 @@ class AbstractAttribute(object):
         # attr cache
         space = self.space
         cache = space.fromcache(MapAttrCache)
-        SHIFT2 = r_uint.BITS - space.config.objspace.std.methodcachesizeexp
+        SHIFT2 = r_uint.BITS - cache.size_exp
         SHIFT1 = SHIFT2 - 5
         attrs_as_int = objectmodel.current_object_addr_as_int(self)
         # ^^^Note: see comment in typeobject.py for
@@ -96,11 +100,16 @@ class AbstractAttribute(object):
             cached_index = cache.indexes[attr_hash]
             if cached_name == name and cached_index == attrkind:
                 attr = cache.cached_attrs[attr_hash]
+                if space._side_effects_ok():
+                    cache.num_hits += 1
                 if space.config.objspace.std.withmethodcachecounter:
                     cache.hits[name] = cache.hits.get(name, 0) + 1
                 return attr
         attr = self._find_map_attr(name, attrkind)
         if space._side_effects_ok():
+            cache.num_misses += 1
+            if cached_attr is not None:
+                cache.num_collisions += 1
             cache.attrs[attr_hash] = self
             cache.names[attr_hash] = name
             cache.indexes[attr_hash] = attrkind
@@ -209,6 +218,8 @@ class AbstractAttribute(object):
             if self.terminator.allow_unboxing:
                 if ALLOW_UNBOXING_INTS and type(w_value) is self.space.IntObjectCls:
                     unbox_type = self.space.IntObjectCls
+                elif ALLOW_UNBOXING_INTS and type(w_value) is self.space.BoolObjectCls:
+                    unbox_type = self.space.BoolObjectCls
                 elif type(w_value) is self.space.FloatObjectCls:
                     unbox_type = self.space.FloatObjectCls
             number_to_readd, holder = self._find_branch_to_move_into(name, attrkind, unbox_type)
@@ -467,7 +478,7 @@ class PlainAttribute(AbstractAttribute):
 
 
 class UnboxedPlainAttribute(PlainAttribute):
-    _immutable_fields_ = ["listindex", "firstunwrapped", "typ"]
+    _immutable_fields_ = ["listindex", "bitindex", "firstunwrapped", "typ"]
     def __init__(self, name, attrkind, back, order, typ):
         AbstractAttribute.__init__(self, back.space, back.terminator)
         # don't call PlainAttribute.__init__, that runs into weird problems
@@ -476,20 +487,32 @@ class UnboxedPlainAttribute(PlainAttribute):
         self.back = back
         self.ever_mutated = False
         self.order = order
+        self.typ = typ
         # here, storageindex is where the list of floats is stored
-        # and listindex is where in the list the actual value goes
+        # and listindex is where in the list the actual value goes.
+        # booleans are packed into a shared list entry, bitindex is the bit
+        # used for this attribute (or -1 for ints and floats)
         self.firstunwrapped = False
         self._compute_storageindex_listindex()
         self._num_attributes = back.num_attributes() + 1
-        self.typ = typ
+
+    def _is_bool(self):
+        return self.typ is self.space.BoolObjectCls
 
     def _compute_storageindex_listindex(self):
         attr = self.back
         storageindex = -1
+        bitindex = 0 if self._is_bool() else -1
         while isinstance(attr, PlainAttribute):
             if isinstance(attr, UnboxedPlainAttribute):
                 storageindex = attr.storageindex
-                listindex = attr.listindex + 1
+                if (bitindex >= 0 and attr.bitindex >= 0 and
+                        attr.bitindex < NUM_BOOLS_PER_WORD - 1):
+                    # share the list entry of the previous boolean
+                    listindex = attr.listindex
+                    bitindex = attr.bitindex + 1
+                else:
+                    listindex = attr.listindex + 1
                 break
             attr = attr.back
         else:
@@ -498,6 +521,7 @@ class UnboxedPlainAttribute(PlainAttribute):
             self.firstunwrapped = True
         self.storageindex = storageindex
         self.listindex = listindex
+        self.bitindex = bitindex
 
     def storage_needed(self):
         if self.firstunwrapped:
@@ -510,6 +534,8 @@ class UnboxedPlainAttribute(PlainAttribute):
         assert type(w_value) is self.typ
         if type(w_value) is space.IntObjectCls:
             return space.int_w(w_value)
+        elif type(w_value) is space.BoolObjectCls:
+            return space.int_w(w_value) << self.bitindex
         else:
             return float2longlong(space.float_w(w_value))
 
@@ -517,9 +543,18 @@ class UnboxedPlainAttribute(PlainAttribute):
         space = self.space
         if self.typ is space.IntObjectCls:
             return space.newint(val)
+        elif self.typ is space.BoolObjectCls:
+            return space.newbool(bool((val >> self.bitindex) & 1))
         else:
             return space.newfloat(longlong2float(val))
 
+    def _store(self, unboxed, val):
+        # 'val' is the result of _unbox
+        if self.bitindex >= 0:
+            mask = 1 << self.bitindex
+            val |= unboxed[self.listindex] & ~mask
+        unboxed[self.listindex] = val
+
     def _convert_to_boxed(self, obj):
         new_obj = obj._get_mapdict_map().copy(obj)
         map = new_obj.map
@@ -552,7 +587,7 @@ class UnboxedPlainAttribute(PlainAttribute):
         if type(w_value) is self.typ:
             val = self._unbox(w_value)
             unboxed = unerase_unboxed(obj._mapdict_read_storage(self.storageindex))
-            unboxed[self.listindex] = val
+            self._store(unboxed, val)
             return
         # type change not supposed to happen. according to the principle
         # of type freezing, we just give up, and will never unbox anything
@@ -585,12 +620,14 @@ class UnboxedPlainAttribute(PlainAttribute):
                 obj._mapdict_write_storage(self.storageindex, erase_unboxed(unboxed))
             else:
                 # the unboxed list is already large enough, due to reordering
-                unboxed[self.listindex] = val
+                # or because a previous boolean shares the entry
+                self._store(unboxed, val)
 
     def repr(self):
-        return "<UnboxedPlainAttribute %s %s %s %s%s %s>" % (
+        return "<UnboxedPlainAttribute %s %s %s %s%s%s %s>" % (
                 self.name, attrkind_name(self.attrkind), self.storageindex,
                 self.listindex,
+                ":%s" % (self.bitindex, ) if self.bitindex >= 0 else "",
                 " immutable" if not self.ever_mutated else "",
                 self.back.repr())
 
@@ -623,14 +660,32 @@ class CachedAttributeHolder(object):
 
 class MapAttrCache(object):
     def __init__(self, space):
-        SIZE = 1 << space.config.objspace.std.methodcachesizeexp
+        self.size_exp = space.config.objspace.std.methodcachesizeexp
+        self._allocate()
+        self.reset_stats()
+        if space.config.objspace.std.withmethodcachecounter:
+            self.hits = {}
+            self.misses = {}
+
+    def _allocate(self):
+        SIZE = 1 << self.size_exp
         self.attrs = [None] * SIZE
         self.names = [None] * SIZE
         self.indexes = [INVALID] * SIZE
         self.cached_attrs = [None] * SIZE
-        if space.config.objspace.std.withmethodcachecounter:
-            self.hits = {}
-            self.misses = {}
+
+    def resize(self, size_exp):
+        """Change the number of entries to 2 ** size_exp.  This empties
+        the cache."""
+        assert 0 < size_exp <= MAX_CACHE_SIZE_EXP
+        self.size_exp = size_exp
+        self._allocate()
+
+    def reset_stats(self):
+        self.num_hits = 0
+        self.num_misses = 0
+        # misses that replaced a different entry in the same slot
+        self.num_collisions = 0
 
     def clear(self):
         for i in range(len(self.attrs)):
@@ -9,7 +9,7 @@ from pypy.interpreter.pycode import PyCode
 from pypy.interpreter import unicodehelper
 from pypy.interpreter.buffer import BufferInterfaceNotFound
 from pypy.objspace.std.boolobject import W_BoolObject
-from pypy.objspace.std.bytesobject import W_BytesObject
+from pypy.objspace.std.bytesobject import W_AbstractBytesObject
 from pypy.objspace.std.complexobject import W_ComplexObject
 from pypy.objspace.std.dictmultiobject import W_DictMultiObject
 from pypy.objspace.std.intobject import W_IntObject
@@ -47,6 +47,11 @@ TYPE_UNICODE   = 'u'
 TYPE_UNKNOWN   = '?'
 TYPE_SET       = '<'
 TYPE_FROZENSET = '>'
+TYPE_REF       = 'r'    # version 3
+
+# version 3: set on the type code of an object that the following data
+# may refer to with TYPE_REF, by its index in the order of appearance
+FLAG_REF = 0x80
 
 
 _marshallers = []
@@ -85,6 +90,20 @@ def marshal(space, w_obj, m):
 def get_unmarshallers():
     return _unmarshallers
 
+def _make_ref_unmarshaller(tc, func):
+    def unmarshal_flagged(space, u, flagged_tc):
+        idx = u.reserve_ref()
+        w_obj = func(space, u, tc)
+        u.refs_w[idx] = w_obj
+        return w_obj
+    unmarshal_flagged.func_name = func.func_name + '_flagged'
+    return unmarshal_flagged
+
+def get_ref_unmarshallers():
+    """The unmarshallers for the type codes with FLAG_REF set."""
+    return [(chr(ord(tc) | FLAG_REF), _make_ref_unmarshaller(tc, func))
+            for tc, func in _unmarshallers]
+
 
 @marshaller(W_NoneObject)
 def marshal_none(space, w_none, m):
@@ -245,10 +264,16 @@ def unmarshal_complex_bin(space, u, tc):
     return space.newcomplex(real, imag)
 
 
-@marshaller(W_BytesObject)
+@marshaller(W_AbstractBytesObject)
 def marshal_bytes(space, w_str, m):
     s = space.bytes_w(w_str)
-    if m.version >= 1 and space.is_interned_str(s):
+    if m.version >= 3:
+        if space.is_interned_str(s):
+            if not m.put_ref_str(m.interned_refs, s):
+                m.atom_str(TYPE_INTERNED, s)
+        elif not m.put_ref_str(m.bytes_refs, s):
+            m.atom_str(TYPE_STRING, s)
+    elif m.version >= 1 and space.is_interned_str(s):
         # we use a native rtyper stringdict for speed
         try:
             idx = m.stringtable[s]
@@ -279,9 +304,18 @@ def unmarshal_stringref(space, u, tc):
     except IndexError:
         raise oefmt(space.w_ValueError, "bad marshal data")
 
+@unmarshaller(TYPE_REF)
+def unmarshal_ref(space, u, tc):
+    idx = u.get_int()
+    if idx < 0 or idx >= len(u.refs_w) or u.refs_w[idx] is None:
+        raise oefmt(space.w_ValueError, "bad marshal data (invalid reference)")
+    return u.refs_w[idx]
+
 
 @marshaller(W_AbstractTupleObject)
 def marshal_tuple(space, w_tuple, m):
+    if m.put_ref_w(w_tuple):
+        return
     items = w_tuple.tolist()
     m.put_tuple_w(TYPE_TUPLE, items)
 
@@ -338,6 +372,8 @@ def _put_interned_str_list(space, m, strlist):
 
 @marshaller(PyCode)
 def marshal_pycode(space, w_pycode, m):
+    if m.put_ref_w(w_pycode):
+        return
     m.start(TYPE_CODE)
     # see pypy.interpreter.pycode for the layout
     x = space.interp_w(PyCode, w_pycode)
@@ -398,6 +434,8 @@ def unmarshal_pycode(space, u, tc):
 @marshaller(W_UnicodeObject)
 def marshal_unicode(space, w_unicode, m):
     s = space.utf8_w(w_unicode)
+    if m.version >= 3 and m.put_ref_str(m.unicode_refs, s):
+        return
     m.atom_str(TYPE_UNICODE, s)
 
 @unmarshaller(TYPE_UNICODE)
@@ -418,6 +456,8 @@ def unmarshal_set(space, u, tc):
 
 @marshaller(W_FrozensetObject)
 def marshal_frozenset(space, w_frozenset, m):
+    if m.put_ref_w(w_frozenset):
+        return
     lis_w = space.fixedview(w_frozenset)
     m.put_tuple_w(TYPE_FROZENSET, lis_w)
 
@@ -53,6 +53,7 @@ class StdObjSpace(ObjSpace):
         self.UnicodeObjectCls = W_UnicodeObject
         self.IntObjectCls = W_IntObject
         self.FloatObjectCls = W_FloatObject
+        self.BoolObjectCls = W_BoolObject
 
         # singletons
         self.w_None = W_NoneObject.w_None
@@ -1,8 +1,10 @@
+import operator
+
 from pypy.interpreter.error import oefmt
 from pypy.objspace.std.tupleobject import W_AbstractTupleObject
 from pypy.objspace.std.util import negate
 from rpython.rlib import jit
-from rpython.rlib.objectmodel import specialize
+from rpython.rlib.objectmodel import specialize, instantiate
 from rpython.rlib.rarithmetic import intmask
 from rpython.rlib.unroll import unrolling_iterable
 from rpython.tool.sourcetools import func_with_new_name
@@ -10,6 +12,9 @@ from rpython.rlib.longlong2float import float2longlong
 
 UNROLL_CUTOFF = 10
 
+# tuples of length 2 to MAX_SPECIALISED_LENGTH are specialised
+MAX_SPECIALISED_LENGTH = 6
+
 class NotSpecialised(Exception):
     pass
 
@@ -17,13 +22,17 @@ class NotSpecialised(Exception):
 def make_specialised_class(typetuple):
     assert type(typetuple) == tuple
     wraps = []
+    unwraps = []
     for typ in typetuple:
         if typ == int:
             wraps.append(lambda space, x: space.newint(x))
+            unwraps.append(lambda space, w_x: space.int_w(w_x))
         elif typ == float:
             wraps.append(lambda space, x: space.newfloat(x))
+            unwraps.append(lambda space, w_x: space.float_w(w_x))
         elif typ == object:
             wraps.append(lambda space, w_x: w_x)
+            unwraps.append(lambda space, w_x: w_x)
         else:
             assert 0
 
@@ -51,6 +60,18 @@ def make_specialised_class(typetuple):
                     raise AssertionError
                 setattr(self, 'value%s' % i, obj)
 
+        @staticmethod
+        @jit.unroll_safe
+        def from_list_w(space, list_w):
+            """Build an instance from a list of wrapped objects, which
+            must have the right length and types."""
+            assert len(list_w) == typelen
+            w_res = instantiate(cls)
+            w_res.space = space
+            for i in iter_n:
+                setattr(w_res, 'value%s' % i, unwraps[i](space, list_w[i]))
+            return w_res
+
         def length(self):
             return typelen
 
@@ -124,6 +145,37 @@ def make_specialised_class(typetuple):
 
         descr_ne = negate(descr_eq)
 
+        def _make_comparison(name):
+            op = getattr(operator, name)
+            generic_compare = getattr(W_AbstractTupleObject, 'descr_' + name)
+
+            def compare(self, space, w_other):
+                if not isinstance(w_other, cls):
+                    return generic_compare(self, space, w_other)
+                # same layout: compare the unboxed values directly
+                for i in iter_n:
+                    myval = getattr(self, 'value%s' % i)
+                    otherval = getattr(w_other, 'value%s' % i)
+                    if typetuple[i] == object:
+                        if not space.eq_w(myval, otherval):
+                            return getattr(space, name)(myval, otherval)
+                    elif myval != otherval:
+                        if typetuple[i] == float:
+                            # NaNs are equal here, like in descr_eq
+                            if (float2longlong(myval) ==
+                                float2longlong(otherval)):
+                                continue
+                        return space.newbool(op(myval, otherval))
+                return space.newbool(op(typelen, typelen))
+
+            compare.__name__ = 'descr_' + name
+            return compare
+
+        descr_lt = _make_comparison('lt')
+        descr_le = _make_comparison('le')
+        descr_gt = _make_comparison('gt')
+        descr_ge = _make_comparison('ge')
+
         def getitem(self, space, index):
             if index < 0:
                 index += typelen
@@ -151,12 +203,40 @@ Cls_ii = make_specialised_class((int, int))
 Cls_oo = make_specialised_class((object, object))
 Cls_ff = make_specialised_class((float, float))
 
+# for longer tuples, only homogeneous ints or floats are unboxed; any other
+# mix uses the object variant.  Every extra class makes tuple-handling code
+# more polymorphic for the JIT, so we don't generate all combinations.
+_classes_by_length = []
+for _n in range(3, MAX_SPECIALISED_LENGTH + 1):
+    _classes_by_length.append((_n,
+                               make_specialised_class((int,) * _n),
+                               make_specialised_class((float,) * _n),
+                               make_specialised_class((object,) * _n)))
+_classes_by_length = unrolling_iterable(_classes_by_length)
+del _n
+
+@jit.unroll_safe
+def _all_of_type(list_w, typ):
+    for w_item in list_w:
+        if type(w_item) is not typ:
+            return False
+    return True
+
 def makespecialisedtuple(space, list_w):
-    if len(list_w) == 2:
+    from pypy.objspace.std.intobject import W_IntObject
+    from pypy.objspace.std.floatobject import W_FloatObject
+    length = len(list_w)
+    if length == 2:
         w_arg1, w_arg2 = list_w
         return makespecialisedtuple2(space, w_arg1, w_arg2)
-    else:
-        raise NotSpecialised
+    for n, Cls_i, Cls_f, Cls_o in _classes_by_length:
+        if length == n:
+            if _all_of_type(list_w, W_IntObject):
+                return Cls_i.from_list_w(space, list_w)
+            if _all_of_type(list_w, W_FloatObject):
+                return Cls_f.from_list_w(space, list_w)
+            return Cls_o.from_list_w(space, list_w)
+    raise NotSpecialised
 
 def makespecialisedtuple2(space, w_arg1, w_arg2):
     from pypy.objspace.std.intobject import W_IntObject
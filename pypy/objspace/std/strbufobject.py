@@ -0,0 +1,127 @@
+"""A str implementation that makes repeated concatenation linear.
+
+'a + b' where 'a' is a plain string returns a W_StringBufferObject that
+keeps a StringBuilder instead of a flat string.  Adding to the most
+recent W_StringBufferObject of a builder appends to the same builder,
+so loops doing 's += piece' are linear overall.  Any other operation
+flattens the object into a W_BytesObject first, which is then cached.
+"""
+
+import inspect
+
+import py
+
+from rpython.rlib.rstring import StringBuilder
+
+from pypy.interpreter.error import OperationError
+from pypy.objspace.std.bytesobject import (
+    W_AbstractBytesObject, W_BytesObject)
+
+
+class W_StringBufferObject(W_AbstractBytesObject):
+    w_str = None
+
+    def __init__(self, builder):
+        self.builder = builder             # StringBuilder
+        self.length = builder.getlength()
+
+    def force(self):
+        if self.w_str is None:
+            s = self.builder.build()
+            if self.length < len(s):
+                # someone else appended to the builder after us
+                s = s[:self.length]
+            self.w_str = W_BytesObject(s)
+            return s
+        else:
+            return self.w_str._value
+
+    def __repr__(self):
+        """representation for debugging purposes"""
+        return "%s(%r[:%d])" % (
+            self.__class__.__name__, self.builder, self.length)
+
+    def unwrap(self, space):
+        return self.force()
+
+    def str_w(self, space):
+        return self.force()
+
+    def utf8_w(self, space):
+        return self.force()
+
+    charbuf_w = str_w
+
+    def buffer_w(self, space, flags):
+        self.force()
+        return self.w_str.buffer_w(space, flags)
+
+    def readbuf_w(self, space):
+        self.force()
+        return self.w_str.readbuf_w(space)
+
+    def writebuf_w(self, space):
+        self.force()
+        return self.w_str.writebuf_w(space)
+
+    def listview_bytes(self):
+        self.force()
+        return self.w_str.listview_bytes()
+
+    def ord(self, space):
+        self.force()
+        return self.w_str.ord(space)
+
+    def descr_len(self, space):
+        return space.newint(self.length)
+
+    def descr_add(self, space, w_other):
+        if not isinstance(w_other, W_AbstractBytesObject):
+            self.force()
+            return self.w_str.descr_add(space, w_other)
+        try:
+            other = W_BytesObject._op_val(space, w_other)
+        except OperationError as e:
+            if e.match(space, space.w_TypeError):
+                return space.w_NotImplemented
+            raise
+        if self.builder.getlength() != self.length:
+            # the builder has already been extended by another object
+            builder = StringBuilder()
+            builder.append(self.force())
+        else:
+            builder = self.builder
+        builder.append(other)
+        return W_StringBufferObject(builder)
+
+    def descr_str(self, space):
+        # you cannot get subclasses of W_StringBufferObject here
+        assert type(self) is W_StringBufferObject
+        return self
+
+
+def _make_delegate(func):
+    args = inspect.getargs(func.func_code)
+    if args.varargs or args.keywords:
+        raise TypeError("Varargs and keywords not supported")
+    argspec = ', '.join([arg for arg in args.args[1:]])
+    func_code = py.code.Source("""
+    def f(self, %(args)s):
+        self.force()
+        return self.w_str.%(func_name)s(%(args)s)
+    """ % {'args': argspec, 'func_name': func.func_name})
+    d = {}
+    exec func_code.compile() in d
+    f = d['f']
+    f.func_defaults = func.func_defaults
+    f.__module__ = func.__module__
+    f.func_name = func.func_name
+    return f
+
+for _name, _func in W_AbstractBytesObject.__dict__.items():
+    if not _name.startswith('descr_') or _name in W_StringBufferObject.__dict__:
+        continue
+    setattr(W_StringBufferObject, _name, _make_delegate(_func))
+del _name, _func
+
+W_StringBufferObject.typedef = W_BytesObject.typedef
@@ -1284,6 +1284,7 @@ class FakeSpace:
     def wrap(self, obj):
         return obj
     newtext = newbytes = newint = newfloat = wrap
+    newbool = bool
 
     def isinstance_w(self, obj, klass):
         return isinstance(obj, klass)
@@ -1330,6 +1331,7 @@ class FakeSpace:
     UnicodeObjectCls = FakeUnicode
     IntObjectCls = int
     FloatObjectCls = float
+    BoolObjectCls = bool
     w_dict = W_DictObject
     iter = iter
     fixedview = list
@@ -646,6 +646,62 @@ def test_no_int_unboxing(monkeypatch):
     w_obj.setdictvalue(space, "b", 15.0)
     assert type(w_obj.map) is UnboxedPlainAttribute
 
+@skip_if_no_int_unboxing
+def test_unboxed_bools_packed():
+    cls = Class(allow_unboxing=True)
+    w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", True)
+    w_obj.setdictvalue(space, "b", False)
+    w_obj.setdictvalue(space, "c", True)
+    w_obj.setdictvalue(space, "d", 15)
+    w_obj.setdictvalue(space, "e", True)
+    assert type(w_obj.map) is UnboxedPlainAttribute
+    c = w_obj.map.back.back
+    assert c.name == "c"
+    assert (c.listindex, c.bitindex) == (0, 2)
+    assert (w_obj.map.back.listindex, w_obj.map.back.bitindex) == (1, -1)
+    assert (w_obj.map.listindex, w_obj.map.bitindex) == (2, 0)
+    assert unerase_unboxed(w_obj.storage[0]) == [0b101, 15, 1]
+    w_obj._check_unboxed_storage_consistency()
+
+    for name, value in [("a", True), ("b", False), ("c", True), ("d", 15),
+                        ("e", True)]:
+        w_res = w_obj.getdictvalue(space, name)
+        assert w_res == value
+        assert type(w_res) is type(value)
+
+    w_obj.setdictvalue(space, "b", True)
+    w_obj.setdictvalue(space, "a", False)
+    assert unerase_unboxed(w_obj.storage[0]) == [0b110, 15, 1]
+    assert w_obj.getdictvalue(space, "a") is False
+    assert w_obj.getdictvalue(space, "b") is True
+    assert w_obj.getdictvalue(space, "c") is True
+
+@skip_if_no_int_unboxing
+def test_unboxed_bools_many():
+    cls = Class(allow_unboxing=True)
+    w_obj = cls.instantiate(space)
+    n = NUM_BOOLS_PER_WORD + 5
+    for i in range(n):
+        w_obj.setdictvalue(space, "x%d" % i, i % 3 == 0)
+    assert w_obj.map.listindex == 1
+    assert w_obj.map.bitindex == 4
+    assert len(unerase_unboxed(w_obj.storage[0])) == 2
+    for i in range(n):
+        assert w_obj.getdictvalue(space, "x%d" % i) is (i % 3 == 0)
+
+@skip_if_no_int_unboxing
+def test_unboxed_bool_type_change():
+    cls = Class(allow_unboxing=True)
+    w_obj = cls.instantiate(space)
+    w_obj.setdictvalue(space, "a", True)
+    w_obj.setdictvalue(space, "b", False)
+    w_obj.setdictvalue(space, "b", 1)
+    assert type(w_obj.map) is PlainAttribute
+    assert w_obj.map.terminator.allow_unboxing == False
+    assert w_obj.getdictvalue(space, "a") is True
+    assert w_obj.getdictvalue(space, "b") == 1
+
 def test_unboxed_type_change():
     cls = Class(allow_unboxing=True)
     w_obj = cls.instantiate(space)
@@ -201,3 +201,39 @@ class AppTestMethodCaching(test_typeobject.AppTestTypeObject):
                 setattr(a, "a%s" % i, i)
             cache_counter = __pypy__.method_cache_counter("x")
             assert cache_counter[0] == 0 # 0 hits, because all the attributes are new
+
+    def test_method_cache_stats(self):
+        import __pypy__
+        class A(object):
+            def f(self):
+                return 42
+        a = A()
+        __pypy__.reset_method_cache_stats()
+        for i in range(10):
+            # use getattr to circumvent the mapdict cache
+            assert getattr(a, "f")() == 42
+        size, hits, misses, collisions = __pypy__.method_cache_stats()
+        assert size == 2 ** 11
+        assert hits >= 9
+        assert collisions <= misses
+        size, hits, misses, collisions = __pypy__.mapdict_cache_stats()
+        assert size == 2 ** 11
+        assert hits + misses > 0
+
+    def test_set_method_cache_size(self):
+        import __pypy__
+        class A(object):
+            def f(self):
+                return 42
+        a = A()
+        try:
+            __pypy__.set_method_cache_size(3)
+            assert __pypy__.method_cache_stats()[0] == 8
+            assert __pypy__.mapdict_cache_stats()[0] == 8
+            for i in range(10):
+                assert getattr(a, "f")() == 42
+            raises(ValueError, __pypy__.set_method_cache_size, 0)
+            raises(ValueError, __pypy__.set_method_cache_size, 100)
+        finally:
+            __pypy__.set_method_cache_size(11)
+        assert __pypy__.method_cache_stats()[0] == 2 ** 11
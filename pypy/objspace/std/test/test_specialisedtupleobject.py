@@ -48,7 +48,10 @@ class TestW_SpecialisedTupleObject():
         hash_test([1, (1, 2)])
         hash_test([1, ('a', 2)])
         hash_test([1, ()])
-        hash_test([1, 2, 3], must_be_specialized=False)
+        hash_test([1, 2, 3])
+        hash_test([1.5, -2.0, 3.25, 0.0])
+        hash_test([1, 'a', 2.5, None, (), -7])
+        hash_test([1, 2, 3, 4, 5, 6, 7], must_be_specialized=False)
         hash_test([1 << 62, 0])
 
     try:
@@ -100,9 +103,37 @@ class AppTestW_SpecialisedTupleObject:
         assert len(t) == 2
 
     def test_notspecialisedtuple(self):
-        assert not self.isspecialised((42, 43, 44, 45))
+        assert not self.isspecialised((42, 43, 44, 45, 46, 47, 48))
         assert not self.isspecialised((1.5,))
 
+    def test_longer_tuples(self):
+        assert self.isspecialised((1, 2, 3), '_iii')
+        assert self.isspecialised((1.5, 2.5, 3.5, 4.5), '_ffff')
+        assert self.isspecialised((1, 2.5, 'x', 4, 5), '_ooooo')
+        assert self.isspecialised((0, 1, 2, 3, 4, 5), '_iiiiii')
+        t = (0,) + (1, 2, 3, 4)
+        assert self.isspecialised(t, '_iiiii')
+        assert t == (0, 1, 2, 3, 4)
+        assert t[-1] == 4 and t[2] == 2
+        assert list(t) == [0, 1, 2, 3, 4]
+        assert hash(t) == hash((0L, 1, 2, 3, 4))
+
+    def test_ordering_longer(self):
+        for a, b in [((1, 2, 3), (1, 2, 4)),
+                     ((1.0, 2.0, -3.0), (1.0, 2.5, -4.0)),
+                     (('a', 1, 2.0), ('a', 1, 3.0)),
+                     ((1, 2, 3), (1.0, 2.0, 3.5)),
+                     ((1, 2, 3, 4, 5, 6), (1, 2, 3, 4, 6, 0))]:
+            assert a < b and a <= b and not a > b and not a >= b
+            assert b > a and b >= a and not b < a and not b <= a
+            assert a <= a and a >= a and not a < a and not a > a
+        assert sorted([(3, 1, 1), (1, 2, 2), (1, 1, 9)]) == [
+            (1, 1, 9), (1, 2, 2), (3, 1, 1)]
+        N = float('nan')
+        assert not (N, 1.0, 2.0) < (N, 1.0, 2.0)
+        assert (N, 1.0, 2.0) <= (N, 1.0, 2.0)
+        assert (0.0, -0.0, 1.0) <= (-0.0, 0.0, 1.0)
+
     def test_slicing_to_specialised(self):
         t = (1, 2, 3)
         assert self.isspecialised(t[0:2])
@@ -0,0 +1,82 @@
+from pypy.objspace.std.test import test_bytesobject
+
+
+class AppTestStringObject(test_bytesobject.AppTestBytesObject):
+    spaceconfig = {"objspace.std.withstrbuf": True}
+
+    def test_basic(self):
+        import __pypy__
+        # cannot do "Hello, " + "World!" because cpy2.5 optimises this
+        # away on AST level
+        s = "Hello, ".__add__("World!")
+        assert type(s) is str
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+
+    def test_add_twice(self):
+        x = "a".__add__("b")
+        y = x + "c"
+        c = x + "d"
+        assert y == "abc"
+        assert c == "abd"
+
+    def test_add(self):
+        import __pypy__
+        all = ""
+        for i in range(20):
+            all += str(i)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(all)
+        assert all == "012345678910111213141516171819"
+        assert len(all) == 30
+
+    def test_hash(self):
+        import __pypy__
+        def join(s): return s[:len(s) // 2] + s[len(s) // 2:]
+        t = 'a' * 101
+        s = join(t)
+        assert 'W_StringBufferObject' in __pypy__.internal_repr(s)
+        assert hash(s) == hash(t)
+
+    def test_len(self):
+        s = "a".__add__("b")
+        r = "c".__add__("d")
+        t = s + r
+        assert len(s) == 2
+        assert len(r) == 2
+        assert len(t) == 4
+
+    def test_methods_and_operators(self):
+        s = "ab".__add__("c") + "a, b"
+        assert s.split(", ") == ["abca", "b"]
+        assert s.upper() == "ABCA, B"
+        assert s[1:3] == "bc"
+        assert "ca" in s
+        assert s == "abca, b"
+        assert "abca, b" == s
+        assert "a" < s
+        assert s % () == "abca, b"
+        assert "%s!" % s == "abca, b!"
+        assert s.format() == "abca, b"
+        assert s + u"x" == u"abca, bx"
+        assert u"x" + s == u"xabca, b"
+        assert buffer(s)[:] == "abca, b"
+        assert {s: 1}["abca, b"] == 1
+
+    def test_add_strbuf(self):
+        # make three W_StringBufferObjects
+        s = 'a'.__add__('b')
+        t = s + 'c'
+        u = 'a'.__add__('d')
+        # add two W_StringBufferObjects
+        assert s + u == 'abad'
+        assert t + u == 'abcad'
+        assert s + t == 'ababc'
+
+    def test_add_invalid(self):
+        s = 'a'.__add__('b')
+        raises(TypeError, "s + 42")
+        raises(TypeError, "s + []")
+
+    def test_marshal(self):
+        import marshal
+        s = 'a'.__add__('b') + 'c'
+        assert marshal.loads(marshal.dumps(s)) == 'abc'
@@ -315,6 +315,10 @@ class AppTestUnicodeString:
         assert u'\na\nb\n'.splitlines(1) == [u'\n', u'a\n', u'b\n']
         assert ((u'a' + '\xc2\x85'.decode('utf8') + u'b\n').splitlines() ==
                 ['a', 'b'])
+        assert (u'\u1234\u2028x\r\n\u2029\xe9'.splitlines(True) ==
+                [u'\u1234\u2028', u'x\r\n', u'\u2029', u'\xe9'])
+        assert (u'\xe9\x1c\x1d\x1e\x0b\x0c'.splitlines() ==
+                [u'\xe9', u'', u'', u'', u''])
 
     def test_zfill(self):
         assert u'123'.zfill(2) == u'123'
@@ -967,6 +971,9 @@ class AppTestUnicodeString:
         assert u'abcdefghiabc'.rfind(u'abcd') == 0
         assert u'abcdefghiabc'.rfind(u'abcz') == -1
         assert u"\u1234\u5678".rfind(u'\u5678') == 1
+        assert u"\u1234a\u5678a\xe9".rfind(u'a') == 3
+        assert u"\u1234a\u5678a\xe9".rfind(u'a', 0, 3) == 1
+        assert u"\u1234a\u5678a\xe9".find(u'a', 2) == 3
 
     def test_rfind_corner_case(self):
         assert u'abc'.rfind('', 4) == -1
@@ -256,10 +256,10 @@ If the argument is a tuple, the return value is the same object.""",
 
     __eq__ = interpindirect2app(W_AbstractTupleObject.descr_eq),
     __ne__ = interpindirect2app(W_AbstractTupleObject.descr_ne),
-    __lt__ = interp2app(W_AbstractTupleObject.descr_lt),
-    __le__ = interp2app(W_AbstractTupleObject.descr_le),
-    __gt__ = interp2app(W_AbstractTupleObject.descr_gt),
-    __ge__ = interp2app(W_AbstractTupleObject.descr_ge),
+    __lt__ = interpindirect2app(W_AbstractTupleObject.descr_lt),
+    __le__ = interpindirect2app(W_AbstractTupleObject.descr_le),
+    __gt__ = interpindirect2app(W_AbstractTupleObject.descr_gt),
+    __ge__ = interpindirect2app(W_AbstractTupleObject.descr_ge),
 
     __len__ = interp2app(W_AbstractTupleObject.descr_len),
     __iter__ = interp2app(W_AbstractTupleObject.descr_iter),
@@ -68,21 +68,41 @@ def write_cell(space, w_cell, w_value):
 class VersionTag(object):
     pass
 
+# the largest size_exp that the method and attribute caches can be resized
+# to at runtime; the hash functions need 'r_uint.BITS - size_exp >= 5'
+MAX_CACHE_SIZE_EXP = 24
+
 class MethodCache(object):
 
     def __init__(self, space):
-        # Note: these attributes never change which object they contain,
-        # so reading 'cache.versions' for example is constant-folded.
-        # The actual list in 'cache.versions' is not a constant, of
-        # course.
-        SIZE = 1 << space.config.objspace.std.methodcachesizeexp
-        self.versions = [None] * SIZE
-        self.names = [None] * SIZE
-        self.lookup_where = [(None, None)] * SIZE
+        self.size_exp = space.config.objspace.std.methodcachesizeexp
+        self._allocate()
+        self.reset_stats()
         if space.config.objspace.std.withmethodcachecounter:
             self.hits = {}
             self.misses = {}
 
+    def _allocate(self):
+        # Note: these attributes only change which object they contain
+        # when the cache is resized, which is rare.
+        SIZE = 1 << self.size_exp
+        self.versions = [None] * SIZE
+        self.names = [None] * SIZE
+        self.lookup_where = [(None, None)] * SIZE
+
+    def resize(self, size_exp):
+        """Change the number of entries to 2 ** size_exp.  This empties
+        the cache."""
+        assert 0 < size_exp <= MAX_CACHE_SIZE_EXP
+        self.size_exp = size_exp
+        self._allocate()
+
+    def reset_stats(self):
+        self.num_hits = 0
+        self.num_misses = 0
+        # misses that replaced a different entry in the same slot
+        self.num_collisions = 0
+
     def clear(self):
         None_None = (None, None)
         for i in range(len(self.versions)):
@@ -473,7 +493,7 @@ class W_TypeObject(W_Root):
     def _pure_lookup_where_with_method_cache(self, name, version_tag):
         space = self.space
         cache = space.fromcache(MethodCache)
-        SHIFT2 = r_uint.BITS - space.config.objspace.std.methodcachesizeexp
+        SHIFT2 = r_uint.BITS - cache.size_exp
         SHIFT1 = SHIFT2 - 5
         version_tag_as_int = current_object_addr_as_int(version_tag)
         # ^^^Note: if the version_tag object is moved by a moving GC, the
@@ -494,12 +514,17 @@ class W_TypeObject(W_Root):
             cached_name = cache.names[method_hash]
             if cached_name is name:
                 tup = cache.lookup_where[method_hash]
+                if space._side_effects_ok():
+                    cache.num_hits += 1
                 if space.config.objspace.std.withmethodcachecounter:
                     cache.hits[name] = cache.hits.get(name, 0) + 1
 #                print "hit", self, name
                 return tup
         tup = self._lookup_where_all_typeobjects(name)
         if space._side_effects_ok():
+            cache.num_misses += 1
+            if cached_version_tag is not None:
+                cache.num_collisions += 1
             cache.versions[method_hash] = version_tag
             cache.names[method_hash] = name
             cache.lookup_where[method_hash] = tup
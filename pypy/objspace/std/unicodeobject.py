@@ -635,25 +635,20 @@ class W_UnicodeObject(W_Root):
         pos = 0
         while pos < length:
             sol = pos
-            lgt = 0
-            while pos < length and not self._islinebreak(rutf8.codepoint_at_pos(value, pos)):
-                pos = rutf8.next_codepoint_pos(value, pos)
-                lgt += 1
+            pos = rutf8.find_linebreak(value, pos, length)
             eol = pos
             if pos < length:
                 # read CRLF as one line break
                 if (value[pos] == '\r' and pos + 1 < length
                                        and value[pos + 1] == '\n'):
                     pos += 2
-                    line_end_chars = 2
                 else:
                     pos = rutf8.next_codepoint_pos(value, pos)
-                    line_end_chars = 1
                 if keepends:
                     eol = pos
-                    lgt += line_end_chars
             assert eol >= 0
             assert sol >= 0
+            lgt = self._codepoints_in_utf8(sol, eol)
             strs_w.append(W_UnicodeObject(value[sol:eol], lgt))
         return space.newlist(strs_w)
 
@@ -861,7 +856,7 @@ class W_UnicodeObject(W_Root):
         if pos < 0:
             return space.newtuple([self, self._empty(), self._empty()])
         else:
-            lgt = rutf8.check_utf8(value, True, stop=pos)
+            lgt = self._codepoints_in_utf8(0, pos)
             return space.newtuple(
                 [W_UnicodeObject(value[0:pos], lgt), w_sub,
                  W_UnicodeObject(value[pos + len(sub._utf8):len(value)],
@@ -879,7 +874,7 @@ class W_UnicodeObject(W_Root):
         if pos < 0:
             return space.newtuple([self._empty(), self._empty(), self])
         else:
-            lgt = rutf8.check_utf8(value, True, stop=pos)
+            lgt = self._codepoints_in_utf8(0, pos)
             return space.newtuple(
                 [W_UnicodeObject(value[0:pos], lgt), w_sub,
                  W_UnicodeObject(value[pos + len(sub._utf8):len(value)],
@@ -1027,18 +1022,21 @@ class W_UnicodeObject(W_Root):
         else:
             end_index = self._index_to_byte(end)
 
+        # convert the byte result back to a codepoint index by counting
+        # from the nearest known boundary, instead of going through the
+        # index storage: the search has already walked over these bytes
         if forward:
             res_index = self._utf8.find(w_sub._utf8, start_index, end_index)
             if res_index < 0:
                 return None
-            res = self._byte_to_index(res_index)
+            res = start + self._codepoints_in_utf8(start_index, res_index)
             assert res >= 0
             return space.newint(res)
         else:
             res_index = self._utf8.rfind(w_sub._utf8, start_index, end_index)
             if res_index < 0:
                 return None
-            res = self._byte_to_index(res_index)
+            res = end - self._codepoints_in_utf8(res_index, end_index)
             assert res >= 0
             return space.newint(res)
 
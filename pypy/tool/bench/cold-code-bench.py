@@ -0,0 +1,57 @@
+""" Benchmark for the speed of the interpreter on cold code: many different
+functions, each of which runs too few times to be compiled by the JIT.
+
+    pypy cold-code-bench.py [num_functions] [calls_per_function]
+"""
+
+import sys, time
+
+NUM_FUNCTIONS = 2000
+CALLS = 200
+
+TEMPLATE = '''
+def f_%(i)d(obj, items, limit):
+    total = 0
+    for x in items:
+        if x < limit:
+            total += x
+        elif x == %(i)d:
+            total -= 1
+        if obj.value is not None and obj.value > x:
+            total += obj.value
+    return total
+'''
+
+class Obj(object):
+    def __init__(self, value):
+        self.value = value
+
+def make_functions(n):
+    d = {}
+    for i in range(n):
+        exec TEMPLATE % {'i': i} in d
+    return [d['f_%d' % i] for i in range(n)]
+
+def compare_jump():
+    # dominated by COMPARE_OP + POP_JUMP_IF_FALSE
+    items = range(20)
+    obj = Obj(10)
+    for func in funcs:
+        for i in xrange(CALLS):
+            func(obj, items, 10)
+
+def main():
+    global funcs, NUM_FUNCTIONS, CALLS
+    if len(sys.argv) > 1:
+        NUM_FUNCTIONS = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        CALLS = int(sys.argv[2])
+    funcs = make_functions(NUM_FUNCTIONS)
+    for func in [compare_jump]:
+        t0 = time.time()
+        func()
+        t1 = time.time()
+        print "%s %.2f" % (func.__name__, t1 - t0)
+
+if __name__ == '__main__':
+    main()
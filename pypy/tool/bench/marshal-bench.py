@@ -0,0 +1,72 @@
+""" Benchmark for marshal: size and load time of the code objects of all
+the modules of the standard library, and of a big data structure with
+repeated strings, written with each marshal version.
+
+    pypy marshal-bench.py [lib-python directory] [repetitions]
+"""
+
+import os, sys, time
+import marshal
+
+LIBDIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      '..', '..', '..', 'lib-python', '2.7')
+REPETITIONS = 5
+VERSIONS = [2, 3]
+
+def compile_all(libdir):
+    codes = []
+    for dirpath, dirnames, filenames in os.walk(libdir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith('.py'):
+                filename = os.path.join(dirpath, name)
+                with open(filename) as f:
+                    source = f.read()
+                try:
+                    codes.append(compile(source, filename, 'exec'))
+                except (SyntaxError, TypeError, ValueError):
+                    continue      # test files with deliberate errors
+    return codes
+
+def make_data():
+    keys = ['key%d' % i for i in range(20)]
+    values = ['value %d' % (i % 100) for i in range(1000)]
+    return [dict([(key, (values[(i + j) % 1000], i * 0.5, i))
+                  for j, key in enumerate(keys)])
+            for i in range(5000)]
+
+def bench(name, dumped, repetitions):
+    for version in VERSIONS:
+        datas = dumped[version]
+        size = sum([len(data) for data in datas])
+        best = None
+        for i in range(repetitions):
+            t0 = time.time()
+            for data in datas:
+                marshal.loads(data)
+            t = time.time() - t0
+            if best is None or t < best:
+                best = t
+        print "%-6s version %d: %6.2f MB, load %.3f s" % (
+            name, version, size / 1e6, best)
+
+def main():
+    libdir = LIBDIR
+    repetitions = REPETITIONS
+    if len(sys.argv) > 1:
+        libdir = sys.argv[1]
+    if len(sys.argv) > 2:
+        repetitions = int(sys.argv[2])
+    codes = compile_all(libdir)
+    print "%d modules" % (len(codes),)
+    dumped = {}
+    for version in VERSIONS:
+        dumped[version] = [marshal.dumps(code, version) for code in codes]
+    bench("pyc", dumped, repetitions)
+    data = make_data()
+    for version in VERSIONS:
+        dumped[version] = [marshal.dumps(data, version)]
+    bench("data", dumped, repetitions)
+
+if __name__ == '__main__':
+    main()
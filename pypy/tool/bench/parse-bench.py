@@ -0,0 +1,52 @@
+""" Benchmark for the throughput of the tokenizer, parser and AST builder:
+parses all the modules of the standard library to ASTs.
+
+    pypy parse-bench.py [lib-python directory] [repetitions]
+"""
+
+import os, sys, time
+import _ast
+
+LIBDIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      '..', '..', '..', 'lib-python', '2.7')
+REPETITIONS = 5
+
+def read_sources(libdir):
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(libdir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith('.py'):
+                filename = os.path.join(dirpath, name)
+                with open(filename) as f:
+                    source = f.read()
+                try:
+                    compile(source, filename, 'exec', _ast.PyCF_ONLY_AST)
+                except (SyntaxError, TypeError, ValueError):
+                    continue      # test files with deliberate errors
+                sources.append((filename, source))
+    return sources
+
+def parse_all(sources):
+    for filename, source in sources:
+        compile(source, filename, 'exec', _ast.PyCF_ONLY_AST)
+
+def main():
+    libdir = LIBDIR
+    repetitions = REPETITIONS
+    if len(sys.argv) > 1:
+        libdir = sys.argv[1]
+    if len(sys.argv) > 2:
+        repetitions = int(sys.argv[2])
+    sources = read_sources(libdir)
+    size = sum([len(source) for filename, source in sources])
+    lines = sum([source.count('\n') for filename, source in sources])
+    print "%d files, %d lines, %.1f MB" % (len(sources), lines, size / 1e6)
+    for i in range(repetitions):
+        t0 = time.time()
+        parse_all(sources)
+        t1 = time.time()
+        print "parse %.2f s, %.0f lines/s" % (t1 - t0, lines / (t1 - t0))
+
+if __name__ == '__main__':
+    main()
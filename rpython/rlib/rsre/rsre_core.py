@@ -1,10 +1,11 @@
 import sys
 from rpython.rlib.debug import check_nonneg
 from rpython.rlib.unroll import unrolling_iterable
-from rpython.rlib.rsre import rsre_char, rsre_constants as consts
+from rpython.rlib.rsre import rsre_char, rsre_dfa, rsre_constants as consts
 from rpython.tool.sourcetools import func_with_new_name
 from rpython.rlib.objectmodel import we_are_translated, not_rpython
 from rpython.rlib import jit
+from rpython.rlib.rutf8 import Utf8StringBuilder
 from rpython.rlib.rsre.rsre_jit import install_jitdriver, install_jitdriver_spec
 
 _seen_specname = {}
@@ -51,12 +52,22 @@ class EndOfString(Exception):
     pass
 
 class CompiledPattern(object):
-    _immutable_fields_ = ['pattern[*]', 'flags']
+    _immutable_fields_ = ['pattern[*]', 'flags', 'required[*]',
+                          'required_bytes[*]', 'required_utf8[*]',
+                          'required_offset', 'first_char_tests[*]', 'nfa']
 
     def __init__(self, pattern, flags):
         self.pattern = pattern
         if not consts.V37:      # 'flags' is ignored in >=3.7 mode
             self.flags = flags
+        _analyze_pattern(self)
+        # the DFA is only used for patterns on which backtracking can
+        # take exponential time; it is slower than the regular search
+        # on the other ones
+        nfa = rsre_dfa.compile_nfa(self)
+        if nfa is not None and not nfa.nested_repeats:
+            nfa = None
+        self.nfa = nfa
         # check we don't get the old value of MAXREPEAT
         # during the untranslated tests. 
         # On python3, MAXCODE can appear in patterns. It will be 65535
@@ -98,6 +109,201 @@ class CompiledPattern(object):
         assert result >= 0
         return result
 
+
+class CompiledPatternSet(object):
+    """A list of CompiledPatterns, searched all at once by
+    search_set_context() with a single combined DFA."""
+    _immutable_fields_ = ['patterns[*]', 'nfa']
+
+    def __init__(self, patterns):
+        self.patterns = patterns[:]
+        self.nfa = rsre_dfa.compile_nfa_set(self.patterns)
+
+# ____________________________________________________________
+# Pattern analysis for search(): required literal strings and
+# first-character tests, computed once per CompiledPattern
+
+def _make_opcode_table():
+    table = {}
+    for op in [consts.OPCODE_ANY, consts.OPCODE_ANY_ALL]:
+        table[op] = 'c'             # one character, no argument
+    for op in [consts.OPCODE_LITERAL, consts.OPCODE_LITERAL_IGNORE,
+               consts.OPCODE_NOT_LITERAL, consts.OPCODE_NOT_LITERAL_IGNORE,
+               consts.OPCODE_CATEGORY,
+               consts.OPCODE37_LITERAL_UNI_IGNORE,
+               consts.OPCODE37_LITERAL_LOC_IGNORE,
+               consts.OPCODE37_NOT_LITERAL_UNI_IGNORE,
+               consts.OPCODE37_NOT_LITERAL_LOC_IGNORE]:
+        table[op] = 'C'             # one character, one argument
+    for op in [consts.OPCODE_AT, consts.OPCODE_MARK]:
+        table[op] = 'z'             # zero-width, one argument
+    for op in [consts.OPCODE_GROUPREF, consts.OPCODE_GROUPREF_IGNORE,
+               consts.OPCODE37_GROUPREF_UNI_IGNORE,
+               consts.OPCODE37_GROUPREF_LOC_IGNORE]:
+        table[op] = 'g'             # variable width, one argument
+    for op in [consts.OPCODE_IN, consts.OPCODE_IN_IGNORE,
+               consts.OPCODE37_IN_UNI_IGNORE, consts.OPCODE37_IN_LOC_IGNORE]:
+        table[op] = 'S'             # one character, <skip>
+    for op in [consts.OPCODE_ASSERT, consts.OPCODE_ASSERT_NOT]:
+        table[op] = 'Z'             # zero-width, <skip>
+    for op in [consts.OPCODE_REPEAT_ONE, consts.OPCODE_MIN_REPEAT_ONE]:
+        table[op] = 'R'             # variable width, <skip>
+    table.pop(None, None)
+    return table
+
+_opcode_kinds = _make_opcode_table()
+
+def _next_opcode(code, ppos):
+    """Return the position of the top-level opcode that follows the one
+    at 'ppos', or -1 if it is unknown or the code looks malformed."""
+    op = code[ppos]
+    kind = _opcode_kinds.get(op, '?')
+    if kind == 'c':
+        nextpos = ppos + 1
+    elif kind == 'C' or kind == 'z' or kind == 'g':
+        nextpos = ppos + 2
+    elif kind == 'S' or kind == 'Z' or kind == 'R':
+        if ppos + 1 >= len(code):
+            return -1
+        nextpos = ppos + 1 + code[ppos + 1]
+    elif op == consts.OPCODE_REPEAT:
+        # <REPEAT> <skip> <1=min> <2=max> item <UNTIL> tail
+        if ppos + 1 >= len(code):
+            return -1
+        nextpos = ppos + 1 + code[ppos + 1] + 1
+    elif op == consts.OPCODE_BRANCH:
+        # <BRANCH> <0=skip> code <JUMP> ... <NULL>
+        nextpos = ppos + 1
+        while nextpos < len(code) and code[nextpos] != 0:
+            skip = code[nextpos]
+            if skip <= 0:
+                return -1
+            nextpos += skip
+        nextpos += 1
+    else:
+        return -1
+    if nextpos <= ppos or nextpos >= len(code):
+        return -1
+    return nextpos
+
+def _skip_marks(code, ppos):
+    while (ppos + 1 < len(code) and code[ppos] == consts.OPCODE_MARK):
+        ppos += 2
+    return ppos
+
+def _literal_to_utf8(literal):
+    for c in literal:
+        if not 0 <= c <= 0x10ffff:
+            return None
+    builder = Utf8StringBuilder(len(literal))
+    for c in literal:
+        builder.append_code(c)
+    return builder.build()
+
+def _literal_to_bytes(literal):
+    for c in literal:
+        if not 0 <= c <= 0xff:
+            return None
+    return ''.join([chr(c) for c in literal])
+
+def _analyze_pattern(pattern):
+    """Fill the 'required*' and 'first_char_tests' attributes of the
+    CompiledPattern.  A run of LITERALs at the top level of the pattern
+    (i.e. not inside a repeat, branch or assertion) must appear, in order,
+    in every match; search() checks that all of them are present before
+    trying to match, and if the first run is at a fixed distance from the
+    start of the pattern, it only tries the start positions found with a
+    substring search."""
+    code = pattern.pattern
+    base = 0
+    if len(code) > 1 and code[0] == consts.OPCODE_INFO:
+        base = 1 + code[1]
+    required = []
+    required_offset = -1
+    run = []
+    run_offset = 0
+    offset = 0         # width of the pattern so far, or -1 if not fixed
+    ppos = base
+    while 0 <= ppos < len(code):
+        op = code[ppos]
+        if op == consts.OPCODE_LITERAL and ppos + 1 < len(code):
+            if not run:
+                run_offset = offset
+            run.append(code[ppos + 1])
+        elif op != consts.OPCODE_MARK:
+            if run:
+                if not required:
+                    required_offset = run_offset
+                required.append(run)
+                run = []
+            if op == consts.OPCODE_SUCCESS or op == consts.OPCODE_FAILURE:
+                break
+        kind = _opcode_kinds.get(op, '?')
+        if offset >= 0:
+            if kind == 'c' or kind == 'C' or kind == 'S':
+                offset += 1
+            elif kind != 'z' and kind != 'Z':
+                offset = -1
+        ppos = _next_opcode(code, ppos)
+    if run:
+        if not required:
+            required_offset = run_offset
+        required.append(run)
+    #
+    required_bytes = []
+    required_utf8 = []
+    for literal in required:
+        utf8 = _literal_to_utf8(literal)
+        if utf8 is None:
+            # out-of-range code, can only come from a hand-made pattern
+            required = []
+            required_bytes = []
+            required_utf8 = []
+            required_offset = -1
+            break
+        required_bytes.append(_literal_to_bytes(literal))
+        required_utf8.append(utf8)
+    # copies, because the lists in '_immutable_fields_' cannot be resized
+    pattern.required = required[:]
+    pattern.required_bytes = required_bytes[:]
+    pattern.required_utf8 = required_utf8[:]
+    pattern.required_offset = required_offset
+    pattern.first_char_tests = _first_char_tests(code, base)[:]
+
+def _first_char_tests(code, base):
+    """If the pattern starts with a BRANCH whose alternatives all start
+    with a LITERAL or an IN (possibly repeated at least once), return the
+    positions of these LITERAL and IN opcodes.  Otherwise return []."""
+    ppos = _skip_marks(code, base)
+    if ppos >= len(code) or code[ppos] != consts.OPCODE_BRANCH:
+        return []
+    tests = []
+    ppos += 1
+    while ppos < len(code) and code[ppos] != 0:
+        alt = _skip_marks(code, ppos + 1)
+        if alt + 4 < len(code) and (
+                code[alt] == consts.OPCODE_REPEAT_ONE or
+                code[alt] == consts.OPCODE_MIN_REPEAT_ONE):
+            # <REPEAT_ONE> <skip> <1=min> <2=max> item <SUCCESS> tail
+            if code[alt + 2] < 1:
+                return []
+            alt += 4
+        if alt + 1 >= len(code):
+            return []
+        if (code[alt] != consts.OPCODE_LITERAL and
+                code[alt] != consts.OPCODE_IN):
+            return []
+        tests.append(alt)
+        skip = code[ppos]
+        if skip <= 0:
+            return []
+        ppos += skip
+    if ppos >= len(code):
+        return []
+    return tests
+
+# ____________________________________________________________
+
 MODE_ANY = '\x00'         # an empty match is fine
 MODE_NONEMPTY = '\x01'    # must have a non-empty match
 MODE_FULL = '\x02'        # must match the whole string
@@ -229,6 +435,11 @@ class AbstractMatchContext(object):
     def fresh_copy(self, start):
         raise NotImplementedError
 
+    def find_required(self, pattern, index, start):
+        """Return the position of the first occurrence of the literal
+        pattern.required[index] between 'start' and self.end, or -1."""
+        raise NotImplementedError
+
 class FixedMatchContext(AbstractMatchContext):
     """Abstract subclass to introduce the default implementation for
     these position methods.  The Utf8MatchContext subclass doesn't
@@ -255,6 +466,10 @@ class FixedMatchContext(AbstractMatchContext):
     def maximum_distance(self, position_low, position_high):
         return position_high - position_low
 
+    @jit.dont_look_inside
+    def find_required(self, pattern, index, start):
+        return fixed_find_required(self, pattern, index, start)
+
 
 class BufMatchContext(FixedMatchContext):
     """Concrete subclass for matching in a buffer."""
@@ -297,6 +512,13 @@ class StrMatchContext(FixedMatchContext):
     def get_single_byte(self, base_position, index):
         return self.str(base_position + index)
 
+    def find_required(self, pattern, index, start):
+        literal = pattern.required_bytes[index]
+        if literal is None:
+            return -1    # contains a character that doesn't fit in a byte
+        assert start >= 0
+        return self._string.find(literal, start, self.end)
+
     def _real_pos(self, index):
         return index     # overridden by tests
 
@@ -1276,6 +1498,12 @@ def search(pattern, string, start=0, end=sys.maxint):
     else:
         return None
 
+def search_set(patternset, string, start=0, end=sys.maxint):
+    assert isinstance(patternset, CompiledPatternSet)
+    start, end = _adjust(start, end, len(string))
+    ctx = StrMatchContext(string, start, end)
+    return search_set_context(ctx, patternset)
+
 install_jitdriver('Match',
                   greens=['pattern'], reds=['ctx'],
                   debugprint=(0,))
@@ -1284,6 +1512,9 @@ def match_context(ctx, pattern):
     ctx.original_pos = ctx.match_start
     if ctx.end < ctx.match_start:
         return False
+    if pattern.nfa is not None and not dfa_match(ctx, pattern,
+                                                 ctx.match_start):
+        return False
     ctx.jitdriver_Match.jit_merge_point(ctx=ctx, pattern=pattern)
     return sre_match(ctx, pattern, 0, ctx.match_start, None) is not None
 
@@ -1291,6 +1522,8 @@ def search_context(ctx, pattern):
     ctx.original_pos = ctx.match_start
     if ctx.end < ctx.match_start:
         return False
+    if pattern.required and not required_literals_present(ctx, pattern):
+        return False
     base = 0
     charset = False
     if pattern.pat(base) == consts.OPCODE_INFO:
@@ -1305,8 +1538,30 @@ def search_context(ctx, pattern):
         return literal_search(ctx, pattern, base)
     if charset:
         return charset_search(ctx, pattern, base)
+    if pattern.required_offset >= 0:
+        return required_search(ctx, pattern, base)
+    if pattern.nfa is not None:
+        start = dfa_search(ctx, pattern)
+        if start < ctx.ZERO:
+            return False
+        if match_at(ctx, pattern, start):
+            return True
+        # should not occur, but use the regular search then
+    if pattern.first_char_tests:
+        return first_char_search(ctx, pattern, base)
     return regular_search(ctx, pattern, base)
 
+@jit.unroll_safe
+def required_literals_present(ctx, pattern):
+    # every match contains the required literals, in this order
+    position = ctx.match_start
+    for i in range(len(pattern.required)):
+        position = ctx.find_required(pattern, i, position)
+        if position < ctx.ZERO:
+            return False
+        position = ctx.next(position)
+    return True
+
 install_jitdriver('RegularSearch',
                   greens=['base', 'pattern'],
                   reds=['start', 'ctx'],
@@ -1365,6 +1620,78 @@ def charset_search(ctx, pattern, base):
         start = ctx.next(start)
     return False
 
+install_jitdriver_spec("RequiredSearch",
+                       greens=['base', 'offset', 'pattern'],
+                       reds=['position', 'ctx'],
+                       debugprint=(2, 0))
+@specializectx
+def required_search(ctx, pattern, base):
+    # the first required literal is at a fixed distance 'offset' from the
+    # start of any match: only try the start positions where it is found
+    offset = pattern.required_offset
+    assert offset >= 0
+    try:
+        position = ctx.next_n(ctx.match_start, offset, ctx.end)
+    except EndOfString:
+        return False
+    while True:
+        ctx.jitdriver_RequiredSearch.jit_merge_point(ctx=ctx,
+                position=position, base=base, offset=offset, pattern=pattern)
+        position = ctx.find_required(pattern, 0, position)
+        if position < ctx.ZERO:
+            return False
+        start = ctx.prev_n(position, offset, ctx.ZERO)
+        if sre_match(ctx, pattern, base, start, None) is not None:
+            ctx.match_start = start
+            return True
+        position = ctx.next(position)
+
+@specializectx
+def fixed_find_required(ctx, pattern, index, start):
+    # the generic FixedMatchContext.find_required(), comparing one
+    # character at a time
+    literal = pattern.required[index]
+    last = ctx.end - len(literal)
+    assert start >= 0
+    while start <= last:
+        i = 0
+        while i < len(literal) and ctx.str(start + i) == literal[i]:
+            i += 1
+        if i == len(literal):
+            return start
+        start += 1
+    return -1
+
+@jit.unroll_safe
+def check_first_char(ctx, pattern, char_ord):
+    for ppos in pattern.first_char_tests:
+        assert ppos >= 0
+        if pattern.pat(ppos) == consts.OPCODE_LITERAL:
+            if char_ord == pattern.pat(ppos + 1):
+                return True
+        elif rsre_char.check_charset(ctx, pattern, ppos + 2, char_ord):
+            return True
+    return False
+
+install_jitdriver_spec("FirstCharSearch",
+                       greens=['base', 'pattern'],
+                       reds=['start', 'ctx'],
+                       debugprint=(1, 0))
+@specializectx
+def first_char_search(ctx, pattern, base):
+    # pattern starts with a branch, and every alternative starts with a
+    # character from a known literal or set
+    start = ctx.match_start
+    while start < ctx.end:
+        ctx.jitdriver_FirstCharSearch.jit_merge_point(ctx=ctx, start=start,
+                                                      base=base, pattern=pattern)
+        if check_first_char(ctx, pattern, ctx.str(start)):
+            if sre_match(ctx, pattern, base, start, None) is not None:
+                ctx.match_start = start
+                return True
+        start = ctx.next(start)
+    return False
+
 install_jitdriver_spec('FastSearch',
                        greens=['i', 'prefix_len', 'pattern'],
                        reds=['string_position', 'ctx'],
@@ -1420,3 +1747,162 @@ def fast_search(ctx, pattern):
         string_position = ctx.next(string_position)
         if string_position >= ctx.end:
             return False
+
+# ____________________________________________________________
+# Matching with the DFA of rsre_dfa.  It only finds out whether there is a
+# match and at which position it starts; sre_match() is then called at that
+# position to get the span and the groups.
+
+@specializectx
+def dfa_position_flags(ctx, nfa, ptr):
+    flags = 0
+    if nfa.has_end_assertions:
+        if ptr == ctx.end:
+            flags = rsre_dfa.AT_FLAG_END
+        elif (ctx.next(ptr) == ctx.end and
+              rsre_char.is_linebreak(ctx.str(ptr))):
+            flags = rsre_dfa.AT_FLAG_BEFORE_NEWLINE
+        if flags and ptr == ctx.ZERO:
+            flags |= rsre_dfa.AT_FLAG_BEGINNING
+    return flags
+
+@specializectx
+def dfa_accepts(ctx, dfa, state, ptr):
+    mode = ctx.match_mode
+    if mode == MODE_FULL:
+        if ptr != ctx.end:
+            return False
+    elif mode == MODE_NONEMPTY:
+        if ptr == ctx.match_start:
+            return False
+    flags = dfa_position_flags(ctx, dfa.nfa, ptr)
+    if flags:
+        return len(dfa.matches_with_flags(state, flags)) > 0
+    return state.accepting
+
+@specializectx
+def dfa_step(ctx, dfa, state, ptr):
+    # the cached transitions are only valid at positions where none of
+    # the AT conditions hold
+    flags = dfa_position_flags(ctx, dfa.nfa, ptr)
+    if not flags:
+        next_state = state.next.get(ctx.str(ptr), None)
+        if next_state is not None:
+            return next_state
+    nfa = dfa.nfa
+    nodes = state.nodes
+    if flags:
+        nodes = dfa.closure(nodes, flags)
+    targets = dfa.restart[:]
+    for node in nodes:
+        if nfa.kinds[node] == rsre_dfa.NFA_CHAR:
+            pattern = nfa.patterns[nfa.owners[node]]
+            if dfa_check_char(ctx, pattern, nfa.args[node], ptr):
+                targets.append(nfa.out1[node])
+    next_state = dfa.get_state(dfa.closure(targets, 0))
+    if not flags:
+        state.next[ctx.str(ptr)] = next_state
+    return next_state
+
+@specializectx
+def dfa_check_char(ctx, pattern, ppos, ptr):
+    assert ppos >= 0
+    op = pattern.pat(ppos)
+    for op1, checkerfn in unroll_char_checker:
+        if op1 == op:
+            return checkerfn(ctx, pattern, ptr, ppos)
+    raise Error("rsre.dfa_check_char[%d]" % op)
+
+@specializectx
+@jit.dont_look_inside
+def dfa_match(ctx, pattern, start):
+    """Check with the DFA if the pattern can match at 'start'."""
+    dfa = pattern.nfa.get_dfa(False)
+    state = dfa.start_state(start == ctx.ZERO)
+    ptr = start
+    while not dfa_accepts(ctx, dfa, state, ptr):
+        if state.dead or ptr >= ctx.end:
+            return False
+        state = dfa_step(ctx, dfa, state, ptr)
+        ptr = ctx.next(ptr)
+    return True
+
+install_jitdriver('MatchAt',
+                  greens=['pattern'], reds=['start', 'ctx'],
+                  debugprint=(0,))
+
+def match_at(ctx, pattern, start):
+    # called with the start of the match found by dfa_search()
+    ctx.jitdriver_MatchAt.jit_merge_point(ctx=ctx, pattern=pattern,
+                                          start=start)
+    base = 0
+    if pattern.pat(base) == consts.OPCODE_INFO:
+        base += 1 + pattern.pat(1)
+    if sre_match(ctx, pattern, base, start, None) is not None:
+        ctx.match_start = start
+        return True
+    return False
+
+@specializectx
+@jit.dont_look_inside
+def dfa_search(ctx, pattern):
+    """Return the start of the leftmost match found by the DFA, or -1."""
+    # first find where the earliest match ends, in a single pass
+    dfa = pattern.nfa.get_dfa(True)
+    state = dfa.start_state(ctx.match_start == ctx.ZERO)
+    ptr = ctx.match_start
+    while not dfa_accepts(ctx, dfa, state, ptr):
+        if ptr >= ctx.end:
+            return -1
+        state = dfa_step(ctx, dfa, state, ptr)
+        ptr = ctx.next(ptr)
+    # the leftmost match starts at or before that position
+    start = ctx.match_start
+    while start < ptr and not dfa_match(ctx, pattern, start):
+        start = ctx.next(start)
+    return start
+
+def search_set_context(ctx, patternset):
+    """Return the sorted list of the indices of the patterns of the
+    CompiledPatternSet that match somewhere in ctx.match_start:ctx.end.
+    The patterns that the combined DFA supports are all checked in a
+    single pass over the string; the other ones are searched one by one.
+    """
+    nfa = patternset.nfa
+    start = ctx.match_start
+    found = [False] * len(nfa.patterns)
+    if nfa.start >= 0:
+        dfa_search_set(ctx, nfa, found)
+    for i in nfa.unsupported:
+        ctx.reset(start)
+        if search_context(ctx, nfa.patterns[i]):
+            found[i] = True
+    ctx.reset(start)
+    result = []
+    for i in range(len(found)):
+        if found[i]:
+            result.append(i)
+    return result
+
+@specializectx
+@jit.dont_look_inside
+def dfa_search_set(ctx, nfa, found):
+    """Set 'found[i]' for each pattern of the combined NFA that matches."""
+    remaining = len(nfa.patterns) - len(nfa.unsupported)
+    dfa = nfa.get_dfa(True)
+    ptr = ctx.match_start
+    state = dfa.start_state(ptr == ctx.ZERO)
+    while True:
+        flags = dfa_position_flags(ctx, nfa, ptr)
+        if flags:
+            matches = dfa.matches_with_flags(state, flags)
+        else:
+            matches = state.matches
+        for i in matches:
+            if not found[i]:
+                found[i] = True
+                remaining -= 1
+        if remaining == 0 or ptr >= ctx.end:
+            break
+        state = dfa_step(ctx, dfa, state, ptr)
+        ptr = ctx.next(ptr)
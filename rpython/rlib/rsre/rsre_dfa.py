@@ -0,0 +1,439 @@
+"""
+Lazily built DFA for the patterns that don't need backtracking.
+
+A pattern qualifies if it uses no group references, no lookahead or
+lookbehind assertions and, as AT codes, only the ones that depend on the
+position in the string (^, \\A, $, \\Z).  Such a pattern is compiled into
+a Thompson NFA when the CompiledPattern is created; the DFA states (sets
+of NFA nodes) and their transitions are then only computed the first
+time a given character is seen in a given state, and cached.
+
+The DFA only answers "is there a match, and where does it start?" in
+linear time.  The exact span and the groups of the match are then found
+by running the regular engine of rsre_core at that start position.
+Walking the DFA is slower than the JIT-compiled searches of rsre_core, so
+a single pattern only uses it if 'nfa.nested_repeats' is set, i.e. if
+backtracking can take exponential time, as in "(a|aa)*b".
+
+Several patterns can also be compiled into a single NFA, whose NFA_MATCH
+nodes record which pattern matched (see rsre_core.CompiledPatternSet).
+"""
+from rpython.rlib.listsort import TimSort
+from rpython.rlib.rsre import rsre_char, rsre_constants as consts
+
+
+MAX_NFA_NODES = 2000      # larger patterns use the regular engine only
+MAX_DFA_STATES = 1000     # the cache of states is flushed when it is full
+
+# kinds of NFA nodes
+NFA_CHAR = 0    # consumes one character; 'arg' is the ppos of the opcode
+NFA_SPLIT = 1   # goes to both 'out1' and 'out2' without consuming
+NFA_AT = 2      # goes to 'out1' if the AT code 'arg' holds
+NFA_MATCH = 3   # 'arg' is the index of the pattern that matched
+
+# conditions on the current position, checked by the NFA_AT nodes
+AT_FLAG_BEGINNING = 1         # at the start of the string
+AT_FLAG_END = 2               # at the end of the string
+AT_FLAG_BEFORE_NEWLINE = 4    # just before a newline that ends the string
+
+
+class Unsupported(Exception):
+    pass
+
+
+def _make_char_opcodes():
+    ops = {}
+    for op in [consts.OPCODE_ANY, consts.OPCODE_ANY_ALL]:
+        ops[op] = 1
+    for op in [consts.OPCODE_LITERAL, consts.OPCODE_LITERAL_IGNORE,
+               consts.OPCODE_NOT_LITERAL, consts.OPCODE_NOT_LITERAL_IGNORE,
+               consts.OPCODE37_LITERAL_UNI_IGNORE,
+               consts.OPCODE37_NOT_LITERAL_UNI_IGNORE]:
+        ops[op] = 2
+    for op in [consts.OPCODE_IN, consts.OPCODE_IN_IGNORE,
+               consts.OPCODE37_IN_UNI_IGNORE]:
+        ops[op] = 0         # <IN> <skip> set
+    ops.pop(None, None)
+    return ops
+
+# the single-character opcodes that the DFA supports, with their length.
+# The *_LOC_IGNORE ones are missing on purpose: the locale can change
+# after the transitions have been cached.
+_char_opcodes = _make_char_opcodes()
+
+
+class NFA(object):
+    """The nodes of the NFA, stored in parallel lists.  'owners' gives for
+    each node the index in 'patterns' of the pattern it comes from."""
+
+    def __init__(self, patterns):
+        self.patterns = patterns
+        self.kinds = []
+        self.args = []
+        self.out1 = []
+        self.out2 = []
+        self.owners = []
+        self.start = -1
+        self.unsupported = []
+        self.has_end_assertions = False
+        self.nested_repeats = False
+        self.anchored_dfa = None
+        self.unanchored_dfa = None
+        self._owner = 0
+        self._first_node = 0
+        self._repeat_depth = 0
+
+    def add(self, kind, arg, out1, out2):
+        if len(self.kinds) - self._first_node >= MAX_NFA_NODES:
+            raise Unsupported
+        return self.add_unlimited(kind, arg, out1, out2)
+
+    def add_unlimited(self, kind, arg, out1, out2):
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.args.append(arg)
+        self.out1.append(out1)
+        self.out2.append(out2)
+        self.owners.append(self._owner)
+        return index
+
+    def _truncate(self, length):
+        del self.kinds[length:]
+        del self.args[length:]
+        del self.out1[length:]
+        del self.out2[length:]
+        del self.owners[length:]
+
+    def get_dfa(self, unanchored):
+        """Return the DFA that finds a match starting at the position where
+        the scan starts, or (if 'unanchored') at any later position."""
+        if unanchored:
+            if self.unanchored_dfa is None:
+                self.unanchored_dfa = DFA(self, True)
+            return self.unanchored_dfa
+        else:
+            if self.anchored_dfa is None:
+                self.anchored_dfa = DFA(self, False)
+            return self.anchored_dfa
+
+
+def compile_nfa(pattern):
+    """Return the NFA for the CompiledPattern, or None if the pattern uses
+    features that need backtracking, or if it is too large."""
+    nfa = NFA([pattern])
+    nfa.start = _compile_pattern(nfa, 0)
+    if nfa.start < 0:
+        return None
+    return nfa
+
+def compile_nfa_set(patterns):
+    """Return a single NFA for a list of CompiledPatterns.  The indices of
+    the patterns that it cannot handle are listed in 'nfa.unsupported';
+    if there are only such patterns, 'nfa.start' is -1."""
+    nfa = NFA(patterns)
+    starts = []
+    for i in range(len(patterns)):
+        start = _compile_pattern(nfa, i)
+        if start < 0:
+            nfa.unsupported.append(i)
+        else:
+            starts.append(start)
+    if starts:
+        # the nodes that join the patterns don't count against the limit
+        # on the size of each pattern
+        result = starts[-1]
+        for i in range(len(starts) - 2, -1, -1):
+            result = nfa.add_unlimited(NFA_SPLIT, 0, starts[i], result)
+        nfa.start = result
+    return nfa
+
+def _compile_pattern(nfa, index):
+    # add the nodes for 'nfa.patterns[index]'; return its start node,
+    # or -1 if it is not supported
+    pattern = nfa.patterns[index]
+    code = pattern.pattern
+    if not consts.V37 and pattern.flags & consts.SRE_FLAG_LOCALE:
+        return -1
+    base = 0
+    if len(code) > 1 and code[0] == consts.OPCODE_INFO:
+        base = 1 + code[1]
+    end = base
+    while end < len(code) and code[end] != consts.OPCODE_SUCCESS:
+        end = _skip_opcode(code, end)
+    if end >= len(code):
+        return -1
+    first = len(nfa.kinds)
+    nfa._owner = index
+    nfa._first_node = first
+    nfa._repeat_depth = 0
+    try:
+        match = nfa.add(NFA_MATCH, index, -1, -1)
+        return _compile_sequence(nfa, code, base, end, match)
+    except Unsupported:
+        nfa._truncate(first)
+        return -1
+
+def _skip_opcode(code, ppos):
+    # return the position after the opcode at 'ppos', or len(code) if it
+    # is unknown.  Only needs to be correct for the supported opcodes.
+    op = code[ppos]
+    length = _char_opcodes.get(op, -1)
+    if length > 0:
+        return ppos + length
+    if (length == 0 or op == consts.OPCODE_REPEAT_ONE or
+            op == consts.OPCODE_MIN_REPEAT_ONE):
+        if ppos + 1 < len(code) and code[ppos + 1] > 0:
+            return ppos + 1 + code[ppos + 1]
+    elif op == consts.OPCODE_AT or op == consts.OPCODE_MARK:
+        return ppos + 2
+    elif op == consts.OPCODE_REPEAT:
+        # <REPEAT> <skip> <1=min> <2=max> item <UNTIL> tail
+        if ppos + 1 < len(code) and code[ppos + 1] > 0:
+            return ppos + 1 + code[ppos + 1] + 1
+    elif op == consts.OPCODE_BRANCH:
+        # <BRANCH> <0=skip> code <JUMP> ... <NULL>
+        ppos += 1
+        while ppos < len(code) and code[ppos] != 0:
+            if code[ppos] <= 0:
+                return len(code)
+            ppos += code[ppos]
+        return ppos + 1
+    return len(code)
+
+def _compile_sequence(nfa, code, ppos, end, out):
+    # compile the opcodes between 'ppos' and 'end' followed by the node
+    # 'out', building the NFA backwards
+    positions = []
+    while ppos < end:
+        positions.append(ppos)
+        ppos = _skip_opcode(code, ppos)
+    if ppos != end:
+        raise Unsupported
+    for i in range(len(positions) - 1, -1, -1):
+        out = _compile_opcode(nfa, code, positions[i], out)
+    return out
+
+def _compile_opcode(nfa, code, ppos, out):
+    op = code[ppos]
+    if op in _char_opcodes:
+        if _char_opcodes[op] == 0 and not _charset_is_static(code, ppos + 2):
+            raise Unsupported
+        return nfa.add(NFA_CHAR, ppos, out, -1)
+    elif op == consts.OPCODE_MARK:
+        return out
+    elif op == consts.OPCODE_AT:
+        atcode = code[ppos + 1]
+        if (atcode == consts.AT_END or atcode == consts.AT_END_STRING):
+            nfa.has_end_assertions = True
+        elif (atcode != consts.AT_BEGINNING and
+              atcode != consts.AT_BEGINNING_STRING):
+            raise Unsupported
+        return nfa.add(NFA_AT, atcode, out, -1)
+    elif op == consts.OPCODE_BRANCH:
+        # <BRANCH> <skip> alternative <JUMP> <skip> <skip> ... <NULL>
+        if nfa._repeat_depth > 0:
+            nfa.nested_repeats = True
+        alternatives = []
+        ppos += 1
+        while code[ppos] != 0:
+            jump = ppos + code[ppos] - 2
+            if code[jump] != consts.OPCODE_JUMP:
+                raise Unsupported
+            alternatives.append(_compile_sequence(nfa, code, ppos + 1,
+                                                  jump, out))
+            ppos += code[ppos]
+        if not alternatives:
+            raise Unsupported
+        result = alternatives[-1]
+        for i in range(len(alternatives) - 2, -1, -1):
+            result = nfa.add(NFA_SPLIT, 0, alternatives[i], result)
+        return result
+    elif (op == consts.OPCODE_REPEAT_ONE or
+          op == consts.OPCODE_MIN_REPEAT_ONE):
+        # <REPEAT_ONE> <skip> <1=min> <2=max> item <SUCCESS> tail
+        stop = ppos + code[ppos + 1]
+        if code[stop] != consts.OPCODE_SUCCESS:
+            raise Unsupported
+        return _compile_repeat(nfa, code, ppos + 4, stop,
+                               code[ppos + 2], code[ppos + 3], out)
+    elif op == consts.OPCODE_REPEAT:
+        # <REPEAT> <skip> <1=min> <2=max> item <UNTIL> tail
+        stop = ppos + 1 + code[ppos + 1]
+        if (code[stop] != consts.OPCODE_MAX_UNTIL and
+                code[stop] != consts.OPCODE_MIN_UNTIL):
+            raise Unsupported
+        return _compile_repeat(nfa, code, ppos + 4, stop,
+                               code[ppos + 2], code[ppos + 3], out)
+    else:
+        raise Unsupported
+
+def _compile_repeat(nfa, code, start, stop, min, max, out):
+    # greedy and non-greedy repeats accept the same strings
+    if min > MAX_NFA_NODES:
+        raise Unsupported
+    if nfa._repeat_depth > 0:
+        nfa.nested_repeats = True
+    nfa._repeat_depth += 1
+    result = _compile_repeat_body(nfa, code, start, stop, min, max, out)
+    nfa._repeat_depth -= 1
+    return result
+
+def _compile_repeat_body(nfa, code, start, stop, min, max, out):
+    if max == rsre_char.MAXREPEAT:
+        loop = nfa.add(NFA_SPLIT, 0, -1, out)
+        nfa.out1[loop] = _compile_sequence(nfa, code, start, stop, loop)
+        result = loop
+    else:
+        if max < min or max - min > MAX_NFA_NODES:
+            raise Unsupported
+        result = out
+        for i in range(max - min):
+            item = _compile_sequence(nfa, code, start, stop, result)
+            result = nfa.add(NFA_SPLIT, 0, item, out)
+    for i in range(min):
+        result = _compile_sequence(nfa, code, start, stop, result)
+    return result
+
+def _charset_is_static(code, ppos):
+    # a set that doesn't depend on the locale.  Mirrors the layout
+    # decoded by rsre_char.check_charset()
+    while ppos + 1 < len(code):
+        op = code[ppos]
+        if op == consts.OPCODE_FAILURE:
+            return True
+        elif op == consts.OPCODE_NEGATE:
+            ppos += 1
+        elif (op == consts.OPCODE_LITERAL or
+              op == consts.OPCODE_UNICODE_GENERAL_CATEGORY):
+            ppos += 2
+        elif op == consts.OPCODE_CATEGORY:
+            if (code[ppos + 1] == consts.CATEGORY_LOC_WORD or
+                    code[ppos + 1] == consts.CATEGORY_LOC_NOT_WORD):
+                return False
+            ppos += 2
+        elif (op == consts.OPCODE_RANGE or
+              consts.eq(op, consts.OPCODE27_RANGE_IGNORE) or
+              consts.eq(op, consts.OPCODE37_RANGE_UNI_IGNORE)):
+            ppos += 3
+        elif op == consts.OPCODE_CHARSET:
+            ppos += 1 + 256 / (8 * rsre_char.CODESIZE)
+        elif op == consts.OPCODE_BIGCHARSET:
+            count = code[ppos + 1]
+            ppos += (2 + 256 / rsre_char.CODESIZE +
+                     count * (32 / rsre_char.CODESIZE))
+        else:
+            return False
+    return False
+
+def _at_holds(atcode, flags):
+    if (atcode == consts.AT_BEGINNING or
+            atcode == consts.AT_BEGINNING_STRING):
+        return bool(flags & AT_FLAG_BEGINNING)
+    elif atcode == consts.AT_END:
+        return bool(flags & (AT_FLAG_END | AT_FLAG_BEFORE_NEWLINE))
+    else:
+        assert atcode == consts.AT_END_STRING
+        return bool(flags & AT_FLAG_END)
+
+# ____________________________________________________________
+
+class DFAState(object):
+    """A set of NFA nodes, with the transitions already computed from it.
+    The set only contains NFA_CHAR and NFA_MATCH nodes, and the NFA_AT
+    nodes at the end of the string that may still hold later.  'matches'
+    lists the patterns whose NFA_MATCH node is in the set."""
+
+    def __init__(self, nodes, matches):
+        self.nodes = nodes
+        self.matches = matches
+        self.accepting = len(matches) > 0
+        self.dead = len(nodes) == 0
+        self.next = {}        # {char_ord: DFAState}
+
+
+class DFA(object):
+    """The cache of DFAState objects of one NFA.  If 'unanchored', each
+    step also restarts the NFA at the new position, so that the DFA finds
+    matches starting anywhere after the position where the scan starts."""
+
+    def __init__(self, nfa, unanchored):
+        self.nfa = nfa
+        self.states = {}
+        self.marks = [0] * len(nfa.kinds)
+        self.generation = 0
+        self.start_at_beginning = None
+        self.start_elsewhere = None
+        if unanchored:
+            self.restart = self.closure([nfa.start], 0)
+        else:
+            self.restart = []
+
+    def closure(self, nodes, flags):
+        """Return the NFA nodes reachable from 'nodes' without consuming
+        a character, at a position where the AT_FLAG_* 'flags' hold."""
+        nfa = self.nfa
+        self.generation += 1
+        generation = self.generation
+        result = []
+        pending = nodes[:]
+        while pending:
+            node = pending.pop()
+            if self.marks[node] == generation:
+                continue
+            self.marks[node] = generation
+            kind = nfa.kinds[node]
+            if kind == NFA_SPLIT:
+                pending.append(nfa.out2[node])
+                pending.append(nfa.out1[node])
+            elif kind == NFA_AT:
+                atcode = nfa.args[node]
+                if _at_holds(atcode, flags):
+                    pending.append(nfa.out1[node])
+                elif (atcode == consts.AT_END or
+                      atcode == consts.AT_END_STRING):
+                    result.append(node)
+            else:
+                result.append(node)
+        return result
+
+    def get_state(self, nodes):
+        """Return the DFAState for the given closed set of NFA nodes."""
+        TimSort(nodes).sort()
+        key = ','.join([str(node) for node in nodes])
+        state = self.states.get(key, None)
+        if state is None:
+            if len(self.states) >= MAX_DFA_STATES:
+                self.flush()
+            state = DFAState(nodes, self._matches(nodes))
+            self.states[key] = state
+        return state
+
+    def flush(self):
+        for state in self.states.values():
+            state.next.clear()
+        self.states = {}
+        self.start_at_beginning = None
+        self.start_elsewhere = None
+
+    def start_state(self, at_beginning):
+        if at_beginning:
+            if self.start_at_beginning is None:
+                nodes = self.closure([self.nfa.start], AT_FLAG_BEGINNING)
+                self.start_at_beginning = self.get_state(nodes)
+            return self.start_at_beginning
+        else:
+            if self.start_elsewhere is None:
+                nodes = self.closure([self.nfa.start], 0)
+                self.start_elsewhere = self.get_state(nodes)
+            return self.start_elsewhere
+
+    def _matches(self, nodes):
+        matches = []
+        for node in nodes:
+            if self.nfa.kinds[node] == NFA_MATCH:
+                matches.append(self.nfa.args[node])
+        return matches
+
+    def matches_with_flags(self, state, flags):
+        """Like 'state.matches', at a position where 'flags' hold."""
+        return self._matches(self.closure(state.nodes, flags))
@@ -23,6 +23,12 @@ class Utf8MatchContext(AbstractMatchContext):
     def get_single_byte(self, base_position, index):
         return self._utf8[base_position + index]
 
+    def find_required(self, pattern, index, start):
+        # utf-8 is self-synchronizing: a match of the encoded literal
+        # always starts and ends on character boundaries
+        assert start >= 0
+        return self._utf8.find(pattern.required_utf8[index], start, self.end)
+
     def next(self, position):
         return rutf8.next_codepoint_pos(self._utf8, position)
     next_indirect = next
@@ -107,6 +107,16 @@ class MatchContextForTests(StrMatchContext):
         assert isinstance(index, int)
         return Position(base_position._p + index)
 
+    def find_required(self, pattern, index, start):
+        assert isinstance(start, Position)
+        literal = pattern.required_bytes[index]
+        if literal is None:
+            return -1
+        p = self._string.find(literal, start._p, self.end._p)
+        if p < 0:
+            return -1
+        return Position(p)
+
 
 def match(pattern, string, start=0, end=sys.maxint, fullmatch=False):
     start, end = _adjust(start, end, len(string))
@@ -0,0 +1,103 @@
+import re, time
+from rpython.rlib.rsre.test.test_match import get_code
+from rpython.rlib.rsre import rsre_core, rsre_dfa, rsre_re
+
+
+def test_compile_nfa():
+    for pattern in [r"a|bc|def", r"(ab)*c", r"^x+$", r"\d{2,4}",
+                    r"(?i)[a-z]+\Z", r"(?s)a.*?b", r"\Ax(y|z)?", r""]:
+        assert rsre_dfa.compile_nfa(get_code(pattern)) is not None, pattern
+    for pattern in [r"(a)\1", r"a(?=b)", r"(?<=a)b", r"\bfoo", r"(?m)^a",
+                    r"(a)?(?(1)b|c)", r"x{3000}", r"(?L)\w+"]:
+        assert rsre_dfa.compile_nfa(get_code(pattern)) is None, pattern
+
+def test_only_nested_repeats_use_the_dfa():
+    for pattern in [r"hello", r"(foo|hello) (\w+)", r"hel+o", r"(ab)*c",
+                    r"a+b*c{2,5}"]:
+        assert get_code(pattern).nfa is None, pattern
+    for pattern in [r"(a|aa)*b", r"(x+x+)+y", r"(\w+\s?)*$", r"(a{2})*"]:
+        assert get_code(pattern).nfa.nested_repeats, pattern
+
+def test_pathological():
+    # exponential time with backtracking only
+    for pattern, string in [(r"(x+x+)+y", "x" * 40),
+                            (r"(a|aa)*b", "a" * 60),
+                            (r"^(\w+\s?)*$", "hello world " * 5 + "!")]:
+        r = get_code(pattern)
+        assert r.nfa is not None
+        t0 = time.time()
+        assert rsre_core.search(r, string) is None
+        assert rsre_core.match(r, string) is None
+        assert time.time() - t0 < 10.0
+
+def test_same_results_as_re():
+    patterns = [r"a|ab", r"(a|ab)(c|bcd)(d*)", r"x*", r"(a+)(b+)?",
+                r"^(\d+)-(\d+)$", r"$", r"a$", r"a\Z", r"\n$", r"(?i)Ab+c",
+                r"[^a-c]+", r"(.)+?z", r"(ab|a)(bc|c)?", r"^$", r"(?s).+",
+                r"x{2,3}y?", r"\s*(\w+)\s*=\s*(\w+)"]
+    strings = ["", "a", "ab", "abcd", "xxxyx", "12-34", "12-34\n", "a\n",
+               "\n", "aBBbc ABC", "caab", "foo = bar, x=1", "abz\nz"]
+    for pattern in patterns:
+        r = rsre_re.compile(pattern)
+        # use the DFA even where the regular search would be faster
+        r._code.nfa = rsre_dfa.compile_nfa(r._code)
+        assert r._code.nfa is not None, pattern
+        expected = re.compile(pattern)
+        for string in strings:
+            got = [(m.span(), m.groups()) for m in r.finditer(string)]
+            exp = [(m.span(), m.groups()) for m in expected.finditer(string)]
+            assert got == exp, (pattern, string)
+            m = r.match(string)
+            m2 = expected.match(string)
+            assert (m is None) == (m2 is None), (pattern, string)
+            if m is not None:
+                assert m.span() == m2.span()
+            for start in range(len(string) + 1):
+                m = r.search(string, start)
+                m2 = expected.search(string, start)
+                assert (m and m.span()) == (m2 and m2.span()), (
+                    pattern, string, start)
+
+def test_state_cache_flush(monkeypatch):
+    monkeypatch.setattr(rsre_dfa, 'MAX_DFA_STATES', 3)
+    r = get_code(r"(a|b)*abb(a|b){3}c")
+    r.nfa = rsre_dfa.compile_nfa(r)
+    string = "ab" * 20 + "abbbabc"
+    for i in range(3):
+        res = rsre_core.search(r, string)
+        assert res is not None
+        assert (res.match_start, res.match_end) == (0, 47)
+        assert len(r.nfa.get_dfa(True).states) <= 3
+
+def test_search_set():
+    patterns = [r"error", r"\d+ms$", r"(a)\1", r"^GET ", r"x{3000}",
+                r"(?i)TIMEOUT", r"", r"z+"]
+    codes = [get_code(pattern) for pattern in patterns]
+    patternset = rsre_core.CompiledPatternSet(codes)
+    assert patternset.nfa.unsupported == [2, 4]
+    for string in ["", "GET /index 12ms", "aa error: timeout\n",
+                   "POST 5ms\n", "GET aa", "x" * 3000]:
+        for start in range(min(len(string) + 1, 8)):
+            got = rsre_core.search_set(patternset, string, start)
+            expected = [i for i in range(len(patterns))
+                        if re.compile(patterns[i]).search(string, start)]
+            assert got == expected, (string, start)
+
+def test_search_set_empty():
+    assert rsre_core.search_set(rsre_core.CompiledPatternSet([]), "abc") == []
+    patternset = rsre_core.CompiledPatternSet([get_code(r"(?=a)")])
+    assert patternset.nfa.start == -1
+    assert rsre_core.search_set(patternset, "abc") == [0]
+    assert rsre_core.search_set(patternset, "bcd") == []
+
+def test_search_set_many_patterns():
+    patterns = ["w%d;" % i for i in range(rsre_dfa.MAX_NFA_NODES + 100)]
+    patternset = rsre_core.CompiledPatternSet(
+        [get_code(pattern) for pattern in patterns])
+    assert patternset.nfa.start >= 0
+    assert patternset.nfa.unsupported == []
+    string = "w7; w2099; w20;"
+    expected = [i for i in range(len(patterns))
+                if re.search(patterns[i], string)]
+    assert expected == [7, 20, 2099]
+    assert rsre_core.search_set(patternset, string) == expected
@@ -230,6 +230,57 @@ class BaseTestSearch:
                     #assert match is None # this is only true on cpy2 (but not on pypy2/3 and cpy3)
                     assert res is None
 
+    def test_required_literals(self):
+        r_code, r = get_code_and_re(r'.*ERROR.*timeout')
+        assert r_code.required == [map(ord, 'ERROR'), map(ord, 'timeout')]
+        assert r_code.required_offset == -1
+        for s in ['xx ERROR: read timeout', 'timeout ERROR', 'ERROR',
+                  'xx ERROR\ntimeout', 'ERRORtimeout', '']:
+            match = r.search(s)
+            res = self.search(r_code, s)
+            if match is None:
+                assert res is None
+            else:
+                assert res is not None
+                assert res.span() == (self.P(match.start()),
+                                      self.P(match.end()))
+
+    def test_required_literal_at_fixed_offset(self):
+        r_code, r = get_code_and_re(r'\d\d(x)?-(y)-[a-z]+')
+        assert r_code.required == [map(ord, '-y-')]    # MARKs are skipped
+        assert r_code.required_offset == -1
+        r_code, r = get_code_and_re(r'\d(\d)[.:]abc\w')
+        assert r_code.required == [map(ord, 'abc')]
+        assert r_code.required_offset == 3
+        for s in ['12:abcd', 'x1:abc 12.abc_', '12:abc', 'abc12:abc',
+                  '1abc12.abcd', '12:ab 3:abcd45.abcz']:
+            for start in range(len(s) + 1):
+                match = r.search(s, start)
+                res = self.search(r_code, s, start)
+                if match is None:
+                    assert res is None
+                else:
+                    assert res is not None
+                    assert res.span() == (self.P(match.start()),
+                                          self.P(match.end()))
+                    assert res.span(1) == (self.P(match.start(1)),
+                                           self.P(match.end(1)))
+
+    def test_first_char_tests(self):
+        r_code, r = get_code_and_re(r'\d+y|xy|(z)')
+        assert len(r_code.first_char_tests) == 3
+        assert get_code(r'(?:a|\d*)y').first_char_tests == []
+        assert get_code(r'(?:a|b)+|c').first_char_tests == []
+        for s in ['abcxy', '12y', 'aaaz', 'xx', 'abc', '', '99']:
+            match = r.search(s)
+            res = self.search(r_code, s)
+            if match is None:
+                assert res is None
+            else:
+                assert res is not None
+                assert res.span() == (self.P(match.start()),
+                                      self.P(match.end()))
+
 
 class TestSearchCustom(BaseTestSearch):
     search = staticmethod(support.search)
@@ -273,6 +324,15 @@ class TestSearchUtf8(BaseTestSearch):
         assert not self.match(r, 'axc')
         assert not self.match(r, 'c')
 
+    def test_required_literal_non_ascii(self):
+        r = get_code(u"\\w+ü€x", re.UNICODE)
+        assert r.required_bytes == [None]
+        s = u"aaü€ bü€x".encode("utf-8")
+        res = self.search(r, s)
+        assert res is not None
+        assert res.span() == (len(u"aaü€ ".encode("utf-8")), len(s))
+        assert not self.search(r, u"aaü€ bü€".encode("utf-8"))
+
     def test_in_uni_ignore_repeat_one(self):
         r = get_code(u"(?i)[^ab]*$")
         assert self.match(r, u'zzstzc'.encode('utf-8'))
@@ -56,3 +56,15 @@ def test_translates():
         for x in rsre_re.split("a{2}", s):      print x
         return 0
     interpret(f, [3])  # assert does not crash
+
+def test_search_set():
+    patternset = rsre_core.CompiledPatternSet(
+        [compile(p)._code for p in ["a+b", "(a)\\1", "^c", "d$"]])
+    def f(i):
+        if i:
+            s = "xaabd"
+        else:
+            s = "caa"
+        return len(rsre_core.search_set(patternset, s))
+    assert interpret(f, [3]) == 3
+    assert interpret(f, [0]) == 2
@@ -269,6 +269,24 @@ def islinebreak(s, pos):
         return chr3 == 0xa8 or chr3 == 0xa9
     return False
 
+def find_linebreak(s, start, end):
+    """Return the byte position of the first line break character in the
+    UTF-8 string 's[start:end]', or 'end' if there is none.  Only the
+    bytes that can start a line break are looked at more closely, so
+    this is a single comparison per byte for most text.
+    """
+    pos = start
+    while pos < end:
+        chr1 = ord(s[pos])
+        if chr1 <= 0x1e:
+            if 0xa <= chr1 <= 0xd or chr1 >= 0x1c:
+                return pos
+        elif chr1 == 0xc2 or chr1 == 0xe2:
+            if islinebreak(s, pos):
+                return pos
+        pos += 1
+    return end
+
 def isspace(s, pos):
     chr1 = ord(s[pos])
     if (chr1 == ord(' ') or chr1 == ord('\n') or chr1 == ord('\t') or
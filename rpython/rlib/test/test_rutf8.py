@@ -90,6 +90,23 @@ def test_check_newline_utf8():
         else:
             assert not rutf8.islinebreak(unichr(i).encode('utf8'), 0)
 
+@given(strategies.text())
+def test_find_linebreak(u):
+    utf8 = u.encode('utf8')
+    expected = len(utf8)
+    for i in range(len(u)):
+        if runicode.unicodedb.islinebreak(ord(u[i])):
+            expected = len(u[:i].encode('utf8'))
+            break
+    assert rutf8.find_linebreak(utf8, 0, len(utf8)) == expected
+
+def test_find_linebreak_bounds():
+    utf8 = u'a\u2028b\nc'.encode('utf8')
+    assert rutf8.find_linebreak(utf8, 0, len(utf8)) == 1
+    assert rutf8.find_linebreak(utf8, 4, len(utf8)) == 5
+    assert rutf8.find_linebreak(utf8, 6, len(utf8)) == len(utf8)
+    assert rutf8.find_linebreak(utf8, 0, 1) == 1
+
 def test_isspace_utf8():
     for i in xrange(sys.maxunicode):
         if runicode.unicodedb.isspace(i):